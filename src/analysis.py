@@ -6,12 +6,15 @@ macro data for correlation analysis.
 """
 
 import logging
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
 import pandas as pd
 from ta.momentum import RSIIndicator, StochRSIIndicator
 from ta.trend import EMAIndicator, ADXIndicator, MACD
 from ta.volatility import AverageTrueRange, BollingerBands
-from typing import Dict
-from .utils import standardize_columns
+from typing import Dict, List, Optional, Tuple, Union
+from .utils import standardize_columns, setup_logging
 
 logger = logging.getLogger(__name__)
 
@@ -32,7 +35,8 @@ def calculate_indicators(df: pd.DataFrame) -> pd.DataFrame:
         with warning if insufficient data.
     """
     try:
-        df = df.copy()
+        # Shallow copy: indicators are added as new columns, the input arrays are never written
+        df = df.copy(deep=False)
         
         # Check if we have enough data for EMA200
         if len(df) < 200:
@@ -75,20 +79,6 @@ def calculate_indicators(df: pd.DataFrame) -> pd.DataFrame:
             # Detect MACD crossovers
             df['macd_bullish_cross'] = (df['macd_histogram'] > 0) & (df['macd_histogram'].shift(1) <= 0)
             df['macd_bearish_cross'] = (df['macd_histogram'] < 0) & (df['macd_histogram'].shift(1) >= 0)
-            
-            # Log crossover events
-            bullish_crosses = df[df['macd_bullish_cross'] == True]
-            bearish_crosses = df[df['macd_bearish_cross'] == True]
-            
-            for idx in bullish_crosses.index:
-                macd_val = df.loc[idx, 'macd']
-                signal_val = df.loc[idx, 'macd_signal']
-                logger.info(f"MACD bullish crossover detected (MACD: {macd_val:.4f}, Signal: {signal_val:.4f})")
-            
-            for idx in bearish_crosses.index:
-                macd_val = df.loc[idx, 'macd']
-                signal_val = df.loc[idx, 'macd_signal']
-                logger.info(f"MACD bearish crossover detected (MACD: {macd_val:.4f}, Signal: {signal_val:.4f})")
         
         # Stochastic RSI (14, 3, 3)
         if len(df) < 28:
@@ -107,20 +97,9 @@ def calculate_indicators(df: pd.DataFrame) -> pd.DataFrame:
             # Bearish: K crosses below D in overbought zone (>80)
             k_crosses_below_d = (df['stoch_rsi_k'] < df['stoch_rsi_d']) & (df['stoch_rsi_k'].shift(1) >= df['stoch_rsi_d'].shift(1))
             df['stoch_rsi_bearish'] = k_crosses_below_d & (df['stoch_rsi_k'] > 80)
-            
-            # Log crossover events
-            bullish_stoch = df[df['stoch_rsi_bullish'] == True]
-            bearish_stoch = df[df['stoch_rsi_bearish'] == True]
-            
-            for idx in bullish_stoch.index:
-                k_val = df.loc[idx, 'stoch_rsi_k']
-                d_val = df.loc[idx, 'stoch_rsi_d']
-                logger.info(f"Bullish StochRSI crossover in oversold (K: {k_val:.4f}, D: {d_val:.4f})")
-            
-            for idx in bearish_stoch.index:
-                k_val = df.loc[idx, 'stoch_rsi_k']
-                d_val = df.loc[idx, 'stoch_rsi_d']
-                logger.info(f"Bearish StochRSI crossover in overbought (K: {k_val:.4f}, D: {d_val:.4f})")
+        
+        # Log crossover counts (per-event detail only at DEBUG level)
+        _log_crossovers(df)
         
         # Standardize all column names again (in case pandas-ta added non-standard names)
         df = standardize_columns(df)
@@ -133,31 +112,98 @@ def calculate_indicators(df: pd.DataFrame) -> pd.DataFrame:
         return df
 
 
-def merge_macro_data(crypto_df: pd.DataFrame, macro_dfs: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+# Crossover flag column -> event_type (see specs/002-macd-stochrsi-indicators/contracts/crossover-event-schema.json)
+CROSSOVER_EVENTS = {
+    'macd_bullish_cross': 'MACD bullish crossover',
+    'macd_bearish_cross': 'MACD bearish crossover',
+    'stoch_rsi_bullish': 'Bullish StochRSI crossover in oversold',
+    'stoch_rsi_bearish': 'Bearish StochRSI crossover in overbought',
+}
+
+CROSSOVER_VALUE_COLUMNS = ['macd', 'macd_signal', 'macd_histogram', 'stoch_rsi_k', 'stoch_rsi_d']
+
+
+def extract_crossover_events(df: pd.DataFrame, symbol: Optional[str] = None) -> pd.DataFrame:
     """
-    Merge macro indicator data into crypto DataFrame with proper time alignment.
-    
-    Crypto trades 24/7, macro markets trade M-F. This function uses forward fill
-    to extend macro values through weekends.
+    Build a table of all MACD and StochRSI crossover events (vectorized).
     
     Args:
-        crypto_df: Main crypto DataFrame with datetime index
-        macro_dfs: Dictionary of {asset_name: DataFrame} for macro data
-                   e.g., {'gold': gold_df, 'dxy': dxy_df, 'sp500': sp500_df}
-    
+        df: DataFrame returned by calculate_indicators
+        symbol: Optional trading symbol added as a 'symbol' column
+        
     Returns:
-        DataFrame with added columns like 'gold_close', 'dxy_close', 'sp500_close'
+        DataFrame sorted by timestamp with columns: timestamp, event_type,
+        [symbol], macd, macd_signal, macd_histogram, stoch_rsi_k, stoch_rsi_d
+        (field names follow crossover-event-schema.json)
     """
-    try:
-        result = crypto_df.copy()
+    value_cols = [col for col in CROSSOVER_VALUE_COLUMNS if col in df.columns]
+    tables = []
+    
+    for flag_col, event_type in CROSSOVER_EVENTS.items():
+        if flag_col not in df.columns:
+            continue
+        
+        positions = np.flatnonzero(df[flag_col].to_numpy(dtype=bool))
+        if len(positions) == 0:
+            continue
         
+        table = {'timestamp': df.index[positions], 'event_type': event_type}
+        if symbol is not None:
+            table['symbol'] = symbol
+        for col in value_cols:
+            table[col] = df[col].to_numpy(dtype=np.float64)[positions]
+        tables.append(pd.DataFrame(table))
+    
+    if not tables:
+        columns = ['timestamp', 'event_type'] + (['symbol'] if symbol is not None else []) + value_cols
+        return pd.DataFrame(columns=columns)
+    
+    return pd.concat(tables, ignore_index=True).sort_values('timestamp', kind='stable', ignore_index=True)
+
+
+def _log_crossovers(df: pd.DataFrame) -> None:
+    """Log crossover counts; list every event only when DEBUG logging is enabled."""
+    counts = {
+        event_type: int(df[flag_col].sum())
+        for flag_col, event_type in CROSSOVER_EVENTS.items()
+        if flag_col in df.columns
+    }
+    if not counts:
+        return
+    
+    logger.info("Crossovers: " + ", ".join(f"{count} {event_type}" for event_type, count in counts.items()))
+    
+    if logger.isEnabledFor(logging.DEBUG):
+        for event in extract_crossover_events(df).itertuples(index=False):
+            if event.event_type.startswith('MACD'):
+                message = f"{event.event_type} (MACD: {event.macd:.4f}, Signal: {event.macd_signal:.4f})"
+            else:
+                message = f"{event.event_type} (K: {event.stoch_rsi_k:.4f}, D: {event.stoch_rsi_d:.4f})"
+            logger.debug(f"{event.timestamp} {message}")
+
+
+class MacroPanel:
+    """
+    All macro close series combined into one sorted, forward-filled panel.
+    
+    Built once per scan. Aligning it onto a crypto frame is a single as-of
+    lookup (one searchsorted over the crypto timestamps) whatever the number
+    of macro assets, and the positions are reused for every symbol sharing
+    the same index.
+    """
+    
+    def __init__(self, macro_dfs: Dict[str, pd.DataFrame]):
+        """
+        Args:
+            macro_dfs: Dictionary of {asset_name: DataFrame} for macro data
+                       e.g., {'gold': gold_df, 'dxy': dxy_df, 'sp500': sp500_df}
+        """
+        closes = {}
         for asset_name, macro_df in macro_dfs.items():
             if macro_df.empty:
                 logger.warning(f"Skipping empty macro data for {asset_name}")
                 continue
             
-            logger.info(f"Merging {asset_name} data...")
-            
             # Ensure macro_df has datetime index
             if not isinstance(macro_df.index, pd.DatetimeIndex):
                 logger.warning(f"{asset_name} does not have datetime index, skipping")
@@ -168,28 +214,298 @@ def merge_macro_data(crypto_df: pd.DataFrame, macro_dfs: Dict[str, pd.DataFrame]
                 logger.warning(f"{asset_name} does not have 'close' column, skipping")
                 continue
             
-            macro_close = macro_df[['close']].copy()
-            
-            # Rename column to include asset prefix
-            macro_close.columns = [f'{asset_name}_close']
-            
-            # Use merge_asof for time-based alignment (forward fill)
-            # This aligns crypto timestamps with the nearest prior macro timestamp
-            result = pd.merge_asof(
-                result.sort_index(),
-                macro_close.sort_index(),
-                left_index=True,
-                right_index=True,
-                direction='backward'  # Use the most recent macro value
-            )
-            
-            # Forward fill any remaining NaN values (weekends)
-            result[f'{asset_name}_close'] = result[f'{asset_name}_close'].ffill()
-            
-            logger.info(f"✓ Merged {asset_name} data (column: {asset_name}_close)")
+            close = pd.Series(macro_df['close'].to_numpy(dtype=np.float64), index=_utc_naive(macro_df.index))
+            closes[f'{asset_name}_close'] = close[~close.index.duplicated(keep='last')]
+        
+        # Outer join on the union of trading days; forward fill once here
+        # (weekends / holidays) instead of once per asset per crypto frame
+        panel = pd.concat(closes, axis=1).sort_index().ffill() if closes else pd.DataFrame()
+        
+        self.columns = list(panel.columns)
+        self._times = panel.index.values.astype('datetime64[ns]') if closes else np.array([], dtype='datetime64[ns]')
+        self._values = panel.to_numpy(dtype=np.float64)
+        self._positions: Dict[Tuple, Tuple[pd.DatetimeIndex, np.ndarray]] = {}
+    
+    def __getstate__(self):
+        # Aligned positions are per-process scratch, not worth pickling to workers
+        return {**self.__dict__, '_positions': {}}
+    
+    def align(self, index: pd.DatetimeIndex) -> pd.DataFrame:
+        """
+        As-of align the panel onto a crypto index.
+        
+        Args:
+            index: Crypto DatetimeIndex (naive UTC or tz-aware)
+        
+        Returns:
+            DataFrame indexed like `index` with one {asset}_close column per
+            asset: the most recent macro close at or before each timestamp
+            (NaN before an asset's first close)
+        """
+        return pd.DataFrame(self.align_values(index), index=index, columns=self.columns, copy=False)
+    
+    def align_values(self, index: pd.DatetimeIndex) -> np.ndarray:
+        """
+        As-of align the panel onto a crypto index, as a bare array.
+        
+        Args:
+            index: Crypto DatetimeIndex (naive UTC or tz-aware)
+        
+        Returns:
+            float64 array of shape (len(index), len(columns)), see align()
+        """
+        key = (len(index), index[0], index[-1]) if len(index) else (0,)
+        cached = self._positions.get(key)
+        if cached is not None and cached[0].equals(index):
+            positions = cached[1]
+        else:
+            times = _utc_naive(index).values.astype('datetime64[ns]')
+            positions = np.searchsorted(self._times, times, side='right') - 1
+            self._positions[key] = (index, positions)
+        
+        values = self._values[np.maximum(positions, 0)]
+        values[positions < 0] = np.nan
+        return values
+
+
+def merge_macro_data(
+    crypto_df: pd.DataFrame,
+    macro_dfs: Union[Dict[str, pd.DataFrame], MacroPanel]
+) -> pd.DataFrame:
+    """
+    Merge macro indicator data into crypto DataFrame with proper time alignment.
+    
+    Crypto trades 24/7, macro markets trade M-F. Each crypto bar takes the most
+    recent macro close at or before it, which extends macro values through
+    weekends. All assets are joined in one as-of pass (see MacroPanel); pass a
+    prebuilt MacroPanel to reuse it across symbols.
+    
+    Args:
+        crypto_df: Main crypto DataFrame with datetime index
+        macro_dfs: Dictionary of {asset_name: DataFrame} for macro data
+                   e.g., {'gold': gold_df, 'dxy': dxy_df, 'sp500': sp500_df},
+                   or a MacroPanel built from one
+    
+    Returns:
+        DataFrame with added columns like 'gold_close', 'dxy_close', 'sp500_close'
+    """
+    try:
+        panel = macro_dfs if isinstance(macro_dfs, MacroPanel) else MacroPanel(macro_dfs)
+        if not panel.columns:
+            return crypto_df
+        
+        if not crypto_df.index.is_monotonic_increasing:
+            crypto_df = crypto_df.sort_index()
         
+        # Shallow copy: only the macro columns are new, the crypto columns are not duplicated
+        values = panel.align_values(crypto_df.index)
+        result = crypto_df.copy(deep=False)
+        for j, col in enumerate(panel.columns):
+            result[col] = values[:, j]
+        
+        logger.info(f"✓ Merged macro data (columns: {', '.join(panel.columns)})")
         return result
         
     except Exception as e:
         logger.error(f"Error merging macro data: {e}")
         return crypto_df
+
+
+def _utc_naive(index: pd.DatetimeIndex) -> pd.DatetimeIndex:
+    """Express a DatetimeIndex as naive UTC (crypto candles are naive UTC, yfinance is tz-aware)."""
+    return index.tz_convert('UTC').tz_localize(None) if index.tz is not None else index
+
+
+def merge_sentiment_data(crypto_df: pd.DataFrame, sentiment_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Merge rolling news sentiment into crypto DataFrame with proper time alignment.
+    
+    sentiment_df is indexed by publish hour (see SentimentSeries.rolling), so
+    each bar receives the windows ending with the headlines published before
+    its close. Values are NOT forward filled: a window without headlines stays
+    NaN instead of repeating stale sentiment.
+    
+    Args:
+        crypto_df: Main crypto DataFrame with datetime index
+        sentiment_df: DataFrame of sentiment_{window} columns on an hourly index
+    
+    Returns:
+        DataFrame with added columns like 'sentiment_24h', 'sentiment_7d'
+    """
+    try:
+        if sentiment_df.empty:
+            logger.warning("Skipping empty sentiment series")
+            return crypto_df
+        
+        result = _merge_asof(crypto_df, sentiment_df, tolerance=pd.Timedelta('1h'))
+        logger.info(f"✓ Merged sentiment data (columns: {', '.join(sentiment_df.columns)})")
+        return result
+        
+    except Exception as e:
+        logger.error(f"Error merging sentiment data: {e}")
+        return crypto_df
+
+
+def _merge_asof(left: pd.DataFrame, right: pd.DataFrame, tolerance: Optional[pd.Timedelta] = None) -> pd.DataFrame:
+    """As-of join right onto left by index: each row takes the most recent right row at or before it."""
+    return pd.merge_asof(
+        left.sort_index(),
+        right.sort_index(),
+        left_index=True,
+        right_index=True,
+        direction='backward',  # Use the most recent value
+        tolerance=tolerance
+    )
+
+
+# OHLCV columns shipped to analysis workers through shared memory
+_SHARED_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+# The macro panel is sent once per worker process (see _init_worker)
+_worker_macro_panel: Optional[MacroPanel] = None
+
+
+def analyze_symbols(
+    crypto_data: Dict[str, pd.DataFrame],
+    macro_data: Optional[Dict[str, pd.DataFrame]] = None,
+    workers: int = 1
+) -> Dict[str, pd.DataFrame]:
+    """
+    Calculate indicators and merge macro data for many symbols.
+    
+    With workers > 1 the per-symbol work is spread across a process pool.
+    All OHLCV frames are packed into ONE shared-memory block (timestamps +
+    float64 OHLCV matrix); workers receive only the block name and row
+    offsets, and return plain NumPy column arrays instead of pickled
+    DataFrames. Each symbol is computed independently, so results are
+    identical for any worker count and are returned in input order.
+    
+    Args:
+        crypto_data: Dictionary of {symbol: OHLCV DataFrame}
+        macro_data: Optional dictionary of {asset_name: DataFrame} for merge_macro_data
+        workers: Number of worker processes (1 = run in this process)
+        
+    Returns:
+        Dictionary of {symbol: analyzed DataFrame} in input order. A symbol
+        whose analysis fails keeps its original DataFrame.
+    """
+    # One combined macro panel per scan, shared by every symbol
+    macro_panel = MacroPanel(macro_data) if macro_data else None
+    symbols = list(crypto_data.keys())
+    
+    if workers <= 1 or len(symbols) <= 1:
+        return {symbol: _analyze_frame(crypto_data[symbol], macro_panel, symbol) for symbol in symbols}
+    
+    block, layout = _pack_frames(crypto_data)
+    
+    try:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(symbols)),
+            initializer=_init_worker,
+            initargs=(macro_panel, logging.getLogger().getEffectiveLevel())
+        ) as pool:
+            futures = [
+                pool.submit(_analyze_shared, block.name, layout['total_rows'], symbol, *layout[symbol])
+                for symbol in symbols
+            ]
+            
+            results = {}
+            for symbol, future in zip(symbols, futures):
+                try:
+                    results[symbol] = _unpack_result(future.result())
+                except Exception as e:
+                    logger.error(f"✗ Error analyzing {symbol}: {e}")
+                    results[symbol] = crypto_data[symbol]
+            return results
+    finally:
+        block.close()
+        block.unlink()
+
+
+def _analyze_frame(df: pd.DataFrame, macro_panel: Optional[MacroPanel], symbol: str) -> pd.DataFrame:
+    """Run indicators + macro merge for one symbol (shared by serial and pool paths)."""
+    try:
+        logger.info(f"Analyzing {symbol}...")
+        df = calculate_indicators(df)
+        if macro_panel is not None:
+            df = merge_macro_data(df, macro_panel)
+        return df
+    except Exception as e:
+        logger.error(f"✗ Error analyzing {symbol}: {e}")
+        return df
+
+
+def _pack_frames(crypto_data: Dict[str, pd.DataFrame]) -> Tuple[shared_memory.SharedMemory, Dict]:
+    """
+    Copy every symbol's timestamps and OHLCV into one shared-memory block.
+    
+    Block layout: int64 timestamps for all rows, followed by a float64
+    (total_rows, 5) OHLCV matrix. Each symbol owns a contiguous row range.
+    """
+    layout = {}
+    offset = 0
+    for symbol, df in crypto_data.items():
+        layout[symbol] = (offset, len(df), str(df.index.dtype))
+        offset += len(df)
+    layout['total_rows'] = offset
+    
+    n_cols = len(_SHARED_COLUMNS)
+    block = shared_memory.SharedMemory(create=True, size=max(offset * 8 * (1 + n_cols), 1))
+    timestamps, values = _shared_views(block, offset)
+    
+    for symbol, df in crypto_data.items():
+        start, length, _ = layout[symbol]
+        timestamps[start:start + length] = df.index.values.view(np.int64)
+        values[start:start + length] = df[_SHARED_COLUMNS].to_numpy(dtype=np.float64)
+    
+    return block, layout
+
+
+def _shared_views(block: shared_memory.SharedMemory, total_rows: int) -> Tuple[np.ndarray, np.ndarray]:
+    """NumPy views of the timestamp vector and OHLCV matrix inside a shared block."""
+    n_cols = len(_SHARED_COLUMNS)
+    timestamps = np.ndarray((total_rows,), dtype=np.int64, buffer=block.buf)
+    values = np.ndarray((total_rows, n_cols), dtype=np.float64, buffer=block.buf, offset=total_rows * 8)
+    return timestamps, values
+
+
+def _init_worker(macro_panel: Optional[MacroPanel], log_level: int) -> None:
+    """Process pool initializer: receive the macro panel once and set up logging."""
+    global _worker_macro_panel
+    _worker_macro_panel = macro_panel
+    setup_logging(log_level)
+
+
+def _analyze_shared(
+    block_name: str,
+    total_rows: int,
+    symbol: str,
+    start: int,
+    length: int,
+    index_dtype: str
+) -> Tuple[np.ndarray, str, List[str], List[np.ndarray]]:
+    """Worker entry point: rebuild one frame from shared memory and analyze it."""
+    block = shared_memory.SharedMemory(name=block_name)
+    try:
+        timestamps, values = _shared_views(block, total_rows)
+        index = pd.DatetimeIndex(timestamps[start:start + length].copy().view(index_dtype), name='timestamp')
+        df = pd.DataFrame(values[start:start + length].copy(), index=index, columns=_SHARED_COLUMNS)
+    finally:
+        block.close()
+    
+    result = _analyze_frame(df, _worker_macro_panel, symbol)
+    
+    # Ship back plain arrays (pickled as raw buffers) rather than a DataFrame
+    return (
+        result.index.values.view(np.int64),
+        str(result.index.dtype),
+        list(result.columns),
+        [result[col].to_numpy() for col in result.columns]
+    )
+
+
+def _unpack_result(payload: Tuple[np.ndarray, str, List[str], List[np.ndarray]]) -> pd.DataFrame:
+    """Rebuild a DataFrame from the arrays returned by _analyze_shared."""
+    index_values, index_dtype, columns, arrays = payload
+    index = pd.DatetimeIndex(index_values.view(index_dtype), name='timestamp')
+    return pd.DataFrame(dict(zip(columns, arrays)), index=index)
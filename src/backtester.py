@@ -11,11 +11,41 @@ in the past by backtesting the last 3 times it occurred.
 import logging
 import argparse
 import json
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Sequence
+import numpy as np
 import pandas as pd
+from .exit_engine import (
+    find_first_touch, price_arrays, mirror_path, PathIndex, resolve_exits, resolve_trailing_exits,
+    RESULT_SL, RESULT_TP, RESULT_OPEN, DIRECTION_LONG, DIRECTION_SHORT
+)
+from .strategy_loader import compile_condition
 
 logger = logging.getLogger(__name__)
 
+# ATR-based stops (specs/003-atr-dynamic-stoploss)
+DEFAULT_ATR_MULTIPLIER = 1.5
+MIN_ATR_STOP_PCT = 0.01
+MAX_ATR_STOP_PCT = 0.05
+MIN_REWARD_RISK = 2.0
+
+
+def find_all_signal_indices(df: pd.DataFrame, condition_str: str) -> np.ndarray:
+    """
+    Find every bar position where a strategy condition was True.
+    
+    Args:
+        df: DataFrame with technical indicators
+        condition_str: Pandas query string (e.g., "rsi < 30 and close > ema_200")
+        
+    Returns:
+        Sorted integer array of bar positions (empty if no signals)
+        
+    Raises:
+        Exception: If the condition cannot be evaluated on this DataFrame
+    """
+    mask = compile_condition(condition_str).evaluate(df)
+    return np.flatnonzero(mask)
+
 
 def find_signal_dates(df: pd.DataFrame, condition_str: str) -> List[int]:
     """
@@ -30,18 +60,14 @@ def find_signal_dates(df: pd.DataFrame, condition_str: str) -> List[int]:
         Returns empty list if no signals found or invalid condition
     """
     try:
-        # Validate condition by attempting query
-        mask = df.query(condition_str).index
+        signal_indices = find_all_signal_indices(df, condition_str)
         
-        if len(mask) == 0:
+        if len(signal_indices) == 0:
             logger.warning(f"No signals found for condition: {condition_str}")
             return []
         
-        # Get the indices (positions) of True values
-        signal_indices = df.index.get_indexer(mask)
-        
         # Return last 3 signals
-        last_3 = signal_indices[-3:].tolist() if len(signal_indices) >= 3 else signal_indices.tolist()
+        last_3 = signal_indices[-3:].tolist()
         
         if len(last_3) < 3:
             logger.warning(f"Only found {len(last_3)} signals (expected 3)")
@@ -57,11 +83,15 @@ def simulate_trade(
     df: pd.DataFrame, 
     entry_idx: int, 
     stop_loss_pct: float = 0.02, 
-    take_profit_pct: float = 0.04
+    take_profit_pct: float = 0.04,
+    direction: str = DIRECTION_LONG
 ) -> Dict[str, Any]:
     """
     Simulate a single trade from entry to exit (TP or SL).
     
+    The exit is resolved with the NumPy first-touch search in exit_engine.py
+    rather than a per-bar DataFrame loop.
+    
     This implements the 1:2 Risk/Reward rule from specs/02_risk_rules.md
     
     Args:
@@ -69,6 +99,7 @@ def simulate_trade(
         entry_idx: Index position where trade entry occurs
         stop_loss_pct: Stop loss as percentage below entry (e.g., 0.02 = 2%)
         take_profit_pct: Take profit as percentage above entry (e.g., 0.04 = 4%)
+        direction: "long" or "short" (short: stop above, take profit below entry)
         
     Returns:
         Dictionary with keys:
@@ -82,40 +113,53 @@ def simulate_trade(
             logger.error(f"Invalid entry index: {entry_idx} >= {len(df)}")
             return {"result": "Open", "pnl_percent": 0.0, "duration_bars": 0}
         
+        # Extract price paths once as arrays (no per-bar Series materialization)
+        low, high, close = price_arrays(df)
+        
         # Get entry price
-        entry_price = df.iloc[entry_idx]['close']
+        entry_price = close[entry_idx]
         
         # Calculate stop loss and take profit levels
-        stop_loss_price = entry_price * (1 - stop_loss_pct)
-        take_profit_price = entry_price * (1 + take_profit_pct)
+        if direction == DIRECTION_SHORT:
+            stop_loss_price = entry_price * (1 + stop_loss_pct)
+            take_profit_price = entry_price * (1 - take_profit_pct)
+        else:
+            stop_loss_price = entry_price * (1 - stop_loss_pct)
+            take_profit_price = entry_price * (1 + take_profit_pct)
         
         logger.debug(f"Entry: ${entry_price:.2f}, SL: ${stop_loss_price:.2f}, TP: ${take_profit_price:.2f}")
         
-        # Scan forward bars to see which level is hit first
-        for i in range(entry_idx + 1, len(df)):
-            bar = df.iloc[i]
-            
-            # Check if stop loss hit (price went below SL)
-            if bar['low'] <= stop_loss_price:
-                duration = i - entry_idx
-                pnl = -stop_loss_pct  # Negative return
-                logger.debug(f"SL hit at bar {i}, duration: {duration}, PnL: {pnl:.2%}")
-                return {
-                    "result": "SL",
-                    "pnl_percent": pnl,
-                    "duration_bars": duration
-                }
-            
-            # Check if take profit hit (price went above TP)
-            if bar['high'] >= take_profit_price:
-                duration = i - entry_idx
-                pnl = take_profit_pct  # Positive return
-                logger.debug(f"TP hit at bar {i}, duration: {duration}, PnL: {pnl:.2%}")
-                return {
-                    "result": "TP",
-                    "pnl_percent": pnl,
-                    "duration_bars": duration
-                }
+        # Find the first forward bar where either level is hit
+        if direction == DIRECTION_SHORT:
+            # A short on the path is a long on the mirrored (negated) path
+            mirrored_low, mirrored_high = mirror_path(low, high)
+            result, exit_idx = find_first_touch(
+                mirrored_low, mirrored_high, entry_idx + 1, -stop_loss_price, -take_profit_price
+            )
+        else:
+            result, exit_idx = find_first_touch(
+                low, high, entry_idx + 1, stop_loss_price, take_profit_price
+            )
+        
+        if result == RESULT_SL:
+            duration = exit_idx - entry_idx
+            pnl = -stop_loss_pct  # Negative return
+            logger.debug(f"SL hit at bar {exit_idx}, duration: {duration}, PnL: {pnl:.2%}")
+            return {
+                "result": "SL",
+                "pnl_percent": pnl,
+                "duration_bars": duration
+            }
+        
+        if result == RESULT_TP:
+            duration = exit_idx - entry_idx
+            pnl = take_profit_pct  # Positive return
+            logger.debug(f"TP hit at bar {exit_idx}, duration: {duration}, PnL: {pnl:.2%}")
+            return {
+                "result": "TP",
+                "pnl_percent": pnl,
+                "duration_bars": duration
+            }
         
         # If we get here, neither SL nor TP was hit (insufficient future data)
         logger.warning(f"Trade still open at end of data (entry_idx: {entry_idx})")
@@ -130,22 +174,496 @@ def simulate_trade(
         return {"result": "Open", "pnl_percent": 0.0, "duration_bars": 0}
 
 
+def atr_exit_distances(
+    entry_prices: np.ndarray,
+    atr: np.ndarray,
+    stop_loss_pct: float = 0.02,
+    take_profit_pct: float = 0.04,
+    atr_stop: float = None,
+    atr_take: float = None,
+    min_reward_risk: float = MIN_REWARD_RISK
+) -> tuple:
+    """
+    Per-signal stop / take-profit distances from the entry bar's ATR.
+    
+    Implements specs/003-atr-dynamic-stoploss:
+    - Stop = entry - ATR x atr_stop, clamped to 1%-5% of entry
+    - Where ATR is not available (warm-up), the fixed stop_loss_pct is used
+    - Take profit = ATR x atr_take, or the fixed R:R (take_profit_pct /
+      stop_loss_pct) applied to the stop distance when atr_take is None
+    - Take profit is never closer than 2x the stop distance (1:2 R:R)
+    
+    Args:
+        entry_prices: Entry price per signal
+        atr: ATR value at each entry bar
+        stop_loss_pct: Fixed stop (fallback / used when atr_stop is None)
+        take_profit_pct: Fixed take profit (sets the R:R when atr_take is None)
+        atr_stop: ATR multiplier for the stop (None = fixed percentage)
+        atr_take: ATR multiplier for the take profit (None = R:R of the fixed levels)
+        min_reward_risk: Take-profit floor as a multiple of the stop distance
+            (0 disables it; sweep_exit_grid applies the floor per grid pair)
+        
+    Returns:
+        Tuple of (stop_distance, take_distance) arrays in price units
+        (multipliers may be arrays; the result broadcasts against them)
+    """
+    entry_prices = np.asarray(entry_prices, dtype=np.float64)
+    atr = np.asarray(atr, dtype=np.float64)
+    valid = np.isfinite(atr) & (atr > 0)
+    
+    if atr_stop is not None:
+        with np.errstate(invalid='ignore'):
+            stop_pct = np.where(valid, atr * atr_stop / entry_prices, stop_loss_pct)
+        stop_pct = np.clip(stop_pct, MIN_ATR_STOP_PCT, MAX_ATR_STOP_PCT)
+    else:
+        stop_pct = np.full(entry_prices.shape, stop_loss_pct)
+    stop_distance = stop_pct * entry_prices
+    
+    if atr_take is not None:
+        take_distance = np.where(valid, atr * atr_take, entry_prices * take_profit_pct)
+    else:
+        take_distance = stop_distance * (take_profit_pct / stop_loss_pct)
+    
+    take_distance = np.maximum(take_distance, min_reward_risk * stop_distance)
+    return stop_distance, take_distance
+
+
+def simulate_trades(
+    df: pd.DataFrame,
+    entry_indices: np.ndarray,
+    stop_loss_pct: float = 0.02,
+    take_profit_pct: float = 0.04,
+    path: PathIndex = None,
+    end: int = None,
+    atr_stop: float = None,
+    atr_take: float = None,
+    atr_trail: float = None,
+    max_bars: int = None,
+    direction: str = DIRECTION_LONG
+) -> pd.DataFrame:
+    """
+    Simulate many trades in one batched pass (same rules as simulate_trade).
+    
+    All entries are resolved together against precomputed forward range-min/max
+    tables of the low/high paths, so the cost grows with log(bars) per entry
+    instead of one forward scan per entry. ATR-multiple stops and take-profits
+    are per-signal level arrays resolved the same way; trailing stops
+    (path-dependent levels) are resolved by a batched window search over all
+    entries at once.
+    
+    Args:
+        df: DataFrame with OHLCV data ('atr' column required for ATR options)
+        entry_indices: Array of entry bar positions
+        stop_loss_pct: Stop loss as percentage below entry (e.g., 0.02 = 2%)
+        take_profit_pct: Take profit as percentage above entry (e.g., 0.04 = 4%)
+        path: Optional prebuilt PathIndex for df (reuse across calls)
+        end: Optional exclusive bar bound on exits; trades still running there are Open
+        atr_stop: Stop at entry - ATR x multiplier (see atr_exit_distances)
+        atr_take: Take profit at entry + ATR x multiplier
+        atr_trail: Trailing stop ATR x multiplier below the highest high since entry
+        max_bars: Optional holding limit; trades not closed within it are Open
+        direction: "long" or "short" (short: stop above, take profit below entry)
+        
+    Returns:
+        DataFrame with one row per entry and columns:
+        entry_idx, result, pnl_percent (decimal), duration_bars
+    """
+    if direction not in (DIRECTION_LONG, DIRECTION_SHORT):
+        raise ValueError(f"Unknown trade direction: {direction}")
+    side = -1.0 if direction == DIRECTION_SHORT else 1.0
+    
+    entry_indices = np.asarray(entry_indices, dtype=np.int64)
+    
+    close = df['close'].to_numpy(dtype=np.float64)
+    entry_prices = close[entry_indices]
+    
+    limit = len(close) if end is None else min(int(end), len(close))
+    if max_bars is not None:
+        limit = np.minimum(entry_indices + 1 + int(max_bars), limit)
+    
+    atr_mode = atr_stop is not None or atr_take is not None or atr_trail is not None
+    if atr_mode:
+        if 'atr' not in df.columns:
+            raise ValueError("ATR exits require an 'atr' column (run calculate_indicators first)")
+        atr = df['atr'].to_numpy(dtype=np.float64)[entry_indices]
+        stop_distance, take_distance = atr_exit_distances(
+            entry_prices, atr, stop_loss_pct, take_profit_pct, atr_stop, atr_take
+        )
+    else:
+        stop_distance = entry_prices * stop_loss_pct
+        take_distance = entry_prices * take_profit_pct
+    
+    stop_prices = entry_prices - side * stop_distance
+    take_prices = entry_prices + side * take_distance
+    
+    if atr_trail is not None:
+        low, high, _ = price_arrays(df)
+        # Without a valid ATR the trail keeps the initial stop distance
+        trail_distance = np.where(np.isfinite(atr) & (atr > 0), atr * atr_trail, stop_distance)
+        if direction == DIRECTION_SHORT:
+            # Search the mirrored path with negated levels, then flip exit prices back
+            low, high = mirror_path(low, high)
+        results, exit_idx, exit_prices = resolve_trailing_exits(
+            low, high, entry_indices, side * entry_prices, side * stop_prices,
+            side * take_prices, trail_distance, end=limit
+        )
+        exit_prices = side * exit_prices
+    else:
+        if path is None:
+            path = PathIndex.from_frame(df)
+        results, exit_idx = resolve_exits(path, entry_indices, stop_prices, take_prices, direction, end=limit)
+        exit_prices = np.where(results == RESULT_TP, take_prices, stop_prices)
+    
+    if atr_mode:
+        with np.errstate(invalid='ignore'):
+            pnl = np.where(results == RESULT_OPEN, 0.0, side * (exit_prices / entry_prices - 1))
+    else:
+        pnl = np.where(results == RESULT_TP, take_profit_pct,
+                       np.where(results == RESULT_SL, -stop_loss_pct, 0.0))
+    
+    return pd.DataFrame({
+        "entry_idx": entry_indices,
+        "result": results,
+        "pnl_percent": pnl,
+        "duration_bars": exit_idx - entry_indices
+    })
+
+
+def backtest_all_signals(
+    df: pd.DataFrame,
+    condition_str: str,
+    stop_loss_pct: float = 0.02,
+    take_profit_pct: float = 0.04,
+    path: PathIndex = None,
+    **exit_options
+) -> pd.DataFrame:
+    """
+    Backtest EVERY historical occurrence of a strategy condition in one pass.
+    
+    Args:
+        df: DataFrame with OHLCV and indicators
+        condition_str: Strategy condition (Pandas query string)
+        stop_loss_pct: Stop loss percentage (default: 2%)
+        take_profit_pct: Take profit percentage (default: 4%)
+        path: Optional prebuilt PathIndex for df (reuse across strategies)
+        **exit_options: Direction / ATR / holding options forwarded to simulate_trades
+            (direction, atr_stop, atr_take, atr_trail, max_bars)
+        
+    Returns:
+        DataFrame with columns: signal_date, entry_idx, result,
+        pnl_percent (decimal), duration_bars. Empty DataFrame if no signals.
+    """
+    signal_indices = find_all_signal_indices(df, condition_str)
+    
+    if len(signal_indices) == 0:
+        return pd.DataFrame(columns=["signal_date", "entry_idx", "result", "pnl_percent", "duration_bars"])
+    
+    trades = simulate_trades(df, signal_indices, stop_loss_pct, take_profit_pct, path=path, **exit_options)
+    trades.insert(0, "signal_date", df.index[signal_indices])
+    
+    open_count = int((trades["result"] == RESULT_OPEN).sum())
+    if open_count:
+        logger.debug(f"{open_count} trades still open at end of data")
+    
+    return trades
+
+
+def _grid_outcomes(
+    n: int,
+    stop_idx: np.ndarray,
+    take_idx: np.ndarray,
+    stop_returns: np.ndarray = None,
+    take_returns: np.ndarray = None,
+    floor_idx: np.ndarray = None,
+    floor_returns: np.ndarray = None,
+    block_size: int = 1 << 22
+) -> tuple:
+    """
+    Outcome counts of every (SL, TP) pair from first-breach positions.
+    
+    Pairs are compared with broadcasted (S, T, entries) arrays, in blocks of
+    entries so that a block holds about `block_size` elements.
+    
+    Args:
+        n: Number of bars (breach position n = never hit)
+        stop_idx: (S, E) first stop breach per stop level and entry
+        take_idx: (T, E) first take-profit breach
+        stop_returns: Optional (S, E) return of each stop exit
+        take_returns: Optional (T, E) return of each take-profit exit
+        floor_idx: Optional (S, E) breach of the per-stop take-profit floor
+            (minimum R:R); the pair's take profit is the farther of the two
+        floor_returns: (S, E) return at the floor (with floor_idx and returns)
+    
+    Returns:
+        Tuple of (S, T) arrays (wins, losses, exit_sum, pnl): exit_sum sums
+        the exit bar positions (n - 1 for open trades), pnl sums the exit
+        returns (None without returns)
+    """
+    n_stops, n_entries = stop_idx.shape
+    shape = (n_stops, take_idx.shape[0])
+    wins = np.zeros(shape, dtype=np.int64)
+    losses = np.zeros(shape, dtype=np.int64)
+    exit_sum = np.zeros(shape, dtype=np.int64)
+    pnl = None if stop_returns is None else np.zeros(shape)
+    
+    block = max(block_size // (shape[0] * shape[1]), 1)
+    for lo in range(0, n_entries, block):
+        cols = slice(lo, lo + block)
+        stop = stop_idx[:, None, cols]
+        take = take_idx[None, :, cols]
+        if floor_idx is not None:
+            # The farther level is the later breach
+            take = np.maximum(take, floor_idx[:, None, cols])
+        
+        # Same tie rule as _combine_exits: SL wins when both hit on one bar
+        take_first = take < stop
+        first = np.minimum(stop, take)
+        still_open = np.count_nonzero(first == n, axis=-1)
+        block_wins = np.count_nonzero(take_first, axis=-1)
+        
+        wins += block_wins
+        losses += first.shape[-1] - block_wins - still_open
+        # Open trades exit on the last bar (n - 1) instead of n
+        exit_sum += first.sum(axis=-1) - still_open
+        
+        if pnl is not None:
+            weights = take_first.astype(np.float64)
+            if floor_idx is None:
+                pnl += np.einsum('ste,te->st', weights, take_returns[:, cols])
+            else:
+                take_gain = np.maximum(take_returns[None, :, cols], floor_returns[:, None, cols])
+                pnl += np.einsum('ste,ste->st', weights, take_gain)
+            # Losses are the stopped trades that are not wins
+            stop_loss = np.where(stop_idx[:, cols] < n, stop_returns[:, cols], 0.0)
+            pnl += stop_loss.sum(axis=-1)[:, None] - np.matmul(weights, stop_loss[:, :, None])[..., 0]
+    
+    return wins, losses, exit_sum, pnl
+
+
+def sweep_exit_grid(
+    df: pd.DataFrame,
+    condition_str: str,
+    stop_losses: Sequence[float],
+    take_profits: Sequence[float],
+    use_atr: bool = False,
+    path: PathIndex = None,
+    direction: str = DIRECTION_LONG,
+    stop_loss_pct: float = 0.02,
+    take_profit_pct: float = 0.04
+) -> pd.DataFrame:
+    """
+    Backtest a whole grid of stop-loss / take-profit settings in one pass.
+    
+    The signal set is found once. The first breach of every stop level and
+    every take-profit level of every signal is located in one grid search
+    per side (PathIndex.first_below_grid / first_above_grid: each signal's
+    running min / max is walked once and all levels are binary-searched on
+    it), and all (SL, TP) pairs are then scored together by a broadcasted
+    comparison of those breach positions. A 20 x 20 grid costs a few single
+    backtests instead of 400.
+    
+    Each grid point gives the same trades as backtest_all_signals with that
+    point's levels (atr_stop / atr_take when use_atr): ATR levels come from
+    atr_exit_distances, so the stop is clamped to 1%-5%, the take profit is
+    at least 2x the stop, and signals without a valid ATR fall back to
+    stop_loss_pct / take_profit_pct.
+    
+    Args:
+        df: DataFrame with OHLCV and indicators
+        condition_str: Strategy condition (Pandas query string)
+        stop_losses: Stop loss values (decimal, or ATR multiples if use_atr)
+        take_profits: Take profit values (decimal, or ATR multiples if use_atr)
+        use_atr: Interpret the grid as multiples of the entry bar's 'atr' column
+        path: Optional prebuilt PathIndex for df
+        direction: "long" or "short" (short: stop above, take profit below entry)
+        stop_loss_pct: Fixed stop where ATR is not available (use_atr only)
+        take_profit_pct: Fixed take profit where ATR is not available (use_atr only)
+        
+    Returns:
+        DataFrame ranked by expectancy (then win rate) with columns:
+        stop_loss, take_profit, total, wins, losses, open, win_rate,
+        expectancy (decimal, mean of closed trades), avg_duration_bars
+    """
+    if direction not in (DIRECTION_LONG, DIRECTION_SHORT):
+        raise ValueError(f"Unknown trade direction: {direction}")
+    side = -1.0 if direction == DIRECTION_SHORT else 1.0
+    
+    stop_losses = np.asarray(stop_losses, dtype=np.float64)
+    take_profits = np.asarray(take_profits, dtype=np.float64)
+    columns = ["stop_loss", "take_profit", "total", "wins", "losses", "open",
+               "win_rate", "expectancy", "avg_duration_bars"]
+    
+    if use_atr and 'atr' not in df.columns:
+        raise ValueError("ATR sweep requires an 'atr' column (run calculate_indicators first)")
+    
+    entries = find_all_signal_indices(df, condition_str)
+    if len(entries) == 0:
+        return pd.DataFrame(columns=columns)
+    
+    close = df['close'].to_numpy(dtype=np.float64)
+    entry_prices = close[entries]
+    
+    if use_atr:
+        atr = df['atr'].to_numpy(dtype=np.float64)[entries]
+        stop_distance, _ = atr_exit_distances(
+            entry_prices, atr, stop_loss_pct, take_profit_pct, atr_stop=stop_losses[:, None]
+        )
+        # The 1:2 R:R floor depends on the stop, so it is searched as its own
+        # (S, E) level and combined per pair in _grid_outcomes
+        _, take_distance = atr_exit_distances(
+            entry_prices, atr, stop_loss_pct, take_profit_pct, atr_take=take_profits[:, None], min_reward_risk=0.0
+        )
+        floor_prices = entry_prices[None, :] + side * (MIN_REWARD_RISK * stop_distance)
+    else:
+        stop_distance = entry_prices[None, :] * stop_losses[:, None]
+        take_distance = entry_prices[None, :] * take_profits[:, None]
+    
+    if path is None:
+        path = PathIndex.from_frame(df)
+    
+    start = entries + 1
+    n_entries = len(entries)
+    
+    # First breach of every level of the grid: (S, E) stops and (T, E) take profits
+    if direction == DIRECTION_SHORT:
+        stop_search, take_search = path.first_above_grid, path.first_below_grid
+    else:
+        stop_search, take_search = path.first_below_grid, path.first_above_grid
+    stop_prices = entry_prices[None, :] - side * stop_distance
+    take_prices = entry_prices[None, :] + side * take_distance
+    stop_idx = stop_search(start, stop_prices)
+    # A take profit reached after a signal's latest stop can never win a pair
+    horizon = stop_idx.max(axis=0) + 1
+    take_idx = take_search(start, take_prices, end=horizon)
+    floor_idx = take_search(start, floor_prices, end=horizon) if use_atr else None
+    
+    if path.n < np.iinfo(np.int32).max:
+        stop_idx, take_idx = stop_idx.astype(np.int32), take_idx.astype(np.int32)
+        floor_idx = floor_idx.astype(np.int32) if use_atr else None
+    
+    if use_atr:
+        # Same returns as simulate_trades in ATR mode: side x (exit / entry - 1)
+        returns = {
+            "stop_returns": side * (stop_prices / entry_prices[None, :] - 1),
+            "take_returns": side * (take_prices / entry_prices[None, :] - 1),
+            "floor_idx": floor_idx,
+            "floor_returns": side * (floor_prices / entry_prices[None, :] - 1)
+        }
+    else:
+        returns = {}
+    
+    wins, losses, exit_sum, pnl = _grid_outcomes(path.n, stop_idx, take_idx, **returns)
+    if not use_atr:
+        # Fixed levels: every exit returns exactly +TP / -SL (as in simulate_trades)
+        pnl = wins * take_profits[None, :] - losses * stop_losses[:, None]
+    duration = (exit_sum - entries.sum()) / n_entries
+    
+    closed = wins + losses
+    grid = pd.DataFrame({
+        "stop_loss": np.repeat(stop_losses, len(take_profits)),
+        "take_profit": np.tile(take_profits, len(stop_losses)),
+        "total": n_entries,
+        "wins": wins.ravel(),
+        "losses": losses.ravel(),
+        "open": (n_entries - closed).ravel(),
+        "win_rate": (wins / n_entries * 100).ravel(),
+        "expectancy": np.divide(pnl, closed, out=np.zeros(pnl.shape), where=closed > 0).ravel(),
+        "avg_duration_bars": duration.ravel()
+    })
+    return grid.sort_values(["expectancy", "win_rate"], ascending=False, kind="stable").reset_index(drop=True)
+
+
+def parse_grid(spec: str) -> np.ndarray:
+    """
+    Parse a CLI grid specification.
+    
+    Args:
+        spec: Either "start:stop:num" (inclusive linspace) or a comma list "0.01,0.02"
+        
+    Returns:
+        Array of grid values
+    """
+    if ':' in spec:
+        start, stop, num = spec.split(':')
+        return np.linspace(float(start), float(stop), int(num))
+    return np.array([float(v) for v in spec.split(',') if v.strip()])
+
+
+def summarize_trades(trades: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Summarize a batch of simulated trades.
+    
+    Args:
+        trades: Output of simulate_trades / backtest_all_signals
+        
+    Returns:
+        Dictionary with total, wins / losses (closed trades with positive /
+        non-positive PnL), open, win_rate (% of all signals),
+        expectancy (mean pnl of closed trades, decimal) and avg_duration_bars
+    """
+    total = len(trades)
+    closed_mask = trades["result"] != RESULT_OPEN
+    # A trailing stop can close in profit, so wins are counted by PnL, not label
+    wins = int((closed_mask & (trades["pnl_percent"] > 0)).sum()) if total else 0
+    losses = int((closed_mask & (trades["pnl_percent"] <= 0)).sum()) if total else 0
+    closed = wins + losses
+    closed_pnl = trades.loc[trades["result"] != RESULT_OPEN, "pnl_percent"] if total else pd.Series(dtype=float)
+    
+    return {
+        "total": total,
+        "wins": wins,
+        "losses": losses,
+        "open": total - closed,
+        "win_rate": (wins / total * 100) if total else 0.0,
+        "expectancy": float(closed_pnl.mean()) if closed else 0.0,
+        "avg_duration_bars": float(trades["duration_bars"].mean()) if total else 0.0
+    }
+
+
+def format_proof(trades: pd.DataFrame, last_n: int = 3) -> List[Dict[str, Any]]:
+    """
+    Convert the last N batched trades into backtest-schema.json records.
+    
+    Args:
+        trades: Output of backtest_all_signals
+        last_n: Number of most recent signals to keep (default: 3)
+        
+    Returns:
+        List of dicts with signal_date, result, pnl_percent (in %), duration_bars
+    """
+    results = []
+    for trade in trades.tail(last_n).itertuples(index=False):
+        results.append({
+            "signal_date": trade.signal_date.strftime('%Y-%m-%d %H:%M:%S'),
+            "result": trade.result,
+            "pnl_percent": round(float(trade.pnl_percent) * 100, 2),  # Convert to percentage
+            "duration_bars": int(trade.duration_bars)
+        })
+    return results
+
+
 def backtest_strategy(
     df: pd.DataFrame, 
     condition_str: str, 
     stop_loss_pct: float = 0.02, 
-    take_profit_pct: float = 0.04
+    take_profit_pct: float = 0.04,
+    last_n: int = 3,
+    **exit_options
 ) -> List[Dict[str, Any]]:
     """
     Backtest a strategy by finding last 3 signals and simulating each trade.
     
-    This is the main "proof engine" function.
+    This is the main "proof engine" function. All historical signals are
+    simulated in one batched pass (see backtest_all_signals); the last N
+    rows are a cheap slice of that result.
     
     Args:
         df: DataFrame with OHLCV and indicators
         condition_str: Strategy condition (Pandas query string)
         stop_loss_pct: Stop loss percentage (default: 2%)
         take_profit_pct: Take profit percentage (default: 4%, giving 2:1 R:R)
+        last_n: Number of most recent signals to report (default: 3)
+        **exit_options: Direction / ATR / holding options forwarded to simulate_trades
         
     Returns:
         List of backtest results matching backtest-schema.json format
@@ -156,34 +674,21 @@ def backtest_strategy(
             logger.error("Cannot backtest on empty DataFrame")
             return []
         
-        # Find signal dates
-        signal_indices = find_signal_dates(df, condition_str)
+        # Simulate every historical signal in one batched pass, then keep the last N
+        trades = backtest_all_signals(df, condition_str, stop_loss_pct, take_profit_pct, **exit_options)
         
-        if not signal_indices:
+        if trades.empty:
             logger.info("No signals found to backtest")
             return []
         
-        logger.info(f"Found {len(signal_indices)} signals, simulating trades...")
-        
-        # Simulate each signal
-        results = []
-        for idx in signal_indices:
-            # Get signal date
-            signal_date = df.index[idx]
-            
-            # Simulate trade
-            trade_result = simulate_trade(df, idx, stop_loss_pct, take_profit_pct)
-            
-            # Build result dict
-            result = {
-                "signal_date": signal_date.strftime('%Y-%m-%d %H:%M:%S'),
-                "result": trade_result["result"],
-                "pnl_percent": round(trade_result["pnl_percent"] * 100, 2),  # Convert to percentage
-                "duration_bars": trade_result["duration_bars"]
-            }
-            
-            results.append(result)
-            
+        if len(trades) < last_n:
+            logger.warning(f"Only found {len(trades)} signals (expected {last_n})")
+        
+        logger.info(f"Found {len(trades)} signals, reporting last {min(last_n, len(trades))}...")
+        
+        results = format_proof(trades, last_n)
+        
+        for result in results:
             logger.info(f"  {result['signal_date']}: {result['result']} ({result['pnl_percent']:+.2f}%)")
         
         return results
@@ -206,6 +711,17 @@ def main():
     parser.add_argument('--days', type=int, default=90, help='Days of historical data')
     parser.add_argument('--stop-loss', type=float, default=0.02, help='Stop loss percentage (e.g., 0.02 = 2%)')
     parser.add_argument('--take-profit', type=float, default=0.04, help='Take profit percentage (e.g., 0.04 = 4%)')
+    parser.add_argument('--all-signals', action='store_true', help='Also summarize every historical signal (not just last 3)')
+    parser.add_argument('--atr-stop', type=float, help=f'ATR stop multiplier (e.g., {DEFAULT_ATR_MULTIPLIER}; clamped to 1-5%%)')
+    parser.add_argument('--atr-take', type=float, help='ATR take profit multiplier (default: keep the fixed R:R)')
+    parser.add_argument('--atr-trail', type=float, help='ATR trailing stop multiplier')
+    parser.add_argument('--max-bars', type=int, help='Close the simulation of a trade after N bars (reported as Open)')
+    parser.add_argument('--direction', type=str, default=DIRECTION_LONG, choices=[DIRECTION_LONG, DIRECTION_SHORT],
+                        help='Trade direction')
+    parser.add_argument('--sweep-stop-loss', type=str, help='Stop loss grid, "start:stop:num" or "0.01,0.02" (enables sweep mode)')
+    parser.add_argument('--sweep-take-profit', type=str, help='Take profit grid, same format (default: --take-profit)')
+    parser.add_argument('--sweep-atr', action='store_true', help='Interpret sweep grids as ATR multiples instead of percentages')
+    parser.add_argument('--top', type=int, default=10, help='Rows of the ranked sweep table to print')
     
     args = parser.parse_args()
     
@@ -235,7 +751,14 @@ def main():
     
     # Run backtest
     logger.info(f"Running backtest for condition: {args.condition}")
-    results = backtest_strategy(df, args.condition, args.stop_loss, args.take_profit)
+    exit_options = {
+        "atr_stop": args.atr_stop,
+        "atr_take": args.atr_take,
+        "atr_trail": args.atr_trail,
+        "max_bars": args.max_bars,
+        "direction": args.direction
+    }
+    results = backtest_strategy(df, args.condition, args.stop_loss, args.take_profit, **exit_options)
     
     # Print results as JSON
     print("\n" + "=" * 60)
@@ -245,8 +768,8 @@ def main():
     
     # Calculate summary stats
     if results:
-        wins = sum(1 for r in results if r['result'] == 'TP')
-        losses = sum(1 for r in results if r['result'] == 'SL')
+        wins = sum(1 for r in results if r['result'] != 'Open' and r['pnl_percent'] > 0)
+        losses = sum(1 for r in results if r['result'] != 'Open' and r['pnl_percent'] <= 0)
         win_rate = (wins / len(results) * 100) if results else 0
         
         print("\n" + "=" * 60)
@@ -256,6 +779,42 @@ def main():
         print(f"Wins: {wins} ({win_rate:.1f}%)")
         print(f"Losses: {losses}")
         print("=" * 60)
+    
+    if args.all_signals:
+        trades = backtest_all_signals(df, args.condition, args.stop_loss, args.take_profit, **exit_options)
+        stats = summarize_trades(trades)
+        
+        print("\n" + "=" * 60)
+        print("FULL HISTORY SUMMARY:")
+        print("=" * 60)
+        print(f"Total Signals: {stats['total']}")
+        print(f"Wins: {stats['wins']} ({stats['win_rate']:.1f}%)")
+        print(f"Losses: {stats['losses']} | Open: {stats['open']}")
+        print(f"Expectancy: {stats['expectancy']:+.2%} per closed trade")
+        print(f"Avg Duration: {stats['avg_duration_bars']:.1f} bars")
+        print("=" * 60)
+    
+    if args.sweep_stop_loss:
+        stop_grid = parse_grid(args.sweep_stop_loss)
+        take_grid = parse_grid(args.sweep_take_profit) if args.sweep_take_profit else np.array([args.take_profit])
+        grid = sweep_exit_grid(
+            df, args.condition, stop_grid, take_grid, use_atr=args.sweep_atr, direction=args.direction,
+            stop_loss_pct=args.stop_loss, take_profit_pct=args.take_profit
+        )
+        
+        print("\n" + "=" * 60)
+        print(f"SL/TP SWEEP ({len(stop_grid)} x {len(take_grid)} grid{', ATR multiples' if args.sweep_atr else ''}):")
+        print("=" * 60)
+        if grid.empty:
+            print("No signals found for this condition")
+        for row in grid.head(args.top).itertuples(index=False):
+            if args.sweep_atr:
+                levels = f"SL {row.stop_loss:4.2f}x ATR TP {row.take_profit:4.2f}x ATR"
+            else:
+                levels = f"SL {row.stop_loss:6.2%} TP {row.take_profit:6.2%}"
+            print(f"{levels} | Win {row.win_rate:5.1f}% | Exp {row.expectancy:+.2%} | "
+                  f"Dur {row.avg_duration_bars:6.1f} bars | Open {row.open}")
+        print("=" * 60)
 
 
 if __name__ == '__main__':
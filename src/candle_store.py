@@ -0,0 +1,182 @@
+"""
+Local OHLCV candle store for Market Scanner Core System.
+
+Candles are persisted per symbol and timeframe as append-only binary files of
+float64 rows (timestamp_ms, open, high, low, close, volume). Files are read
+through NumPy memory maps, so loading a cached history is a near-instant local
+read and topping it up only appends the newly closed candles.
+
+Layout:
+    <cache_dir>/ohlcv/BTC_USDT_1h.bin
+"""
+
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = "data/cache"
+
+# Columns stored per row (timestamp in ms since epoch, then OHLCV)
+ROW_WIDTH = 6
+ROW_DTYPE = np.dtype('<f8')
+
+
+class CandleStore:
+    """
+    Persistent per-symbol/per-timeframe candle store with hit/miss counters.
+
+    Only closed candles should be appended: the store is append-only and never
+    rewrites a row once it has been written (except via `write`).
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR):
+        """
+        Args:
+            cache_dir: Root cache directory (default: data/cache)
+        """
+        self.root = Path(cache_dir) / "ohlcv"
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "topups": 0, "misses": 0}
+
+    def path(self, symbol: str, timeframe: str) -> Path:
+        """Return the file path for a symbol/timeframe pair."""
+        safe_symbol = symbol.replace('/', '_').replace(':', '_')
+        return self.root / f"{safe_symbol}_{timeframe}.bin"
+
+    def load(self, symbol: str, timeframe: str) -> np.ndarray:
+        """
+        Memory-map all stored candles for a symbol/timeframe.
+
+        Args:
+            symbol: Trading pair (e.g., 'BTC/USDT')
+            timeframe: Candle timeframe (e.g., '1h')
+
+        Returns:
+            Read-only (n, 6) float64 array; empty (0, 6) array if nothing stored
+        """
+        path = self.path(symbol, timeframe)
+        if not path.exists():
+            return np.empty((0, ROW_WIDTH), dtype=ROW_DTYPE)
+
+        row_bytes = ROW_WIDTH * ROW_DTYPE.itemsize
+        n_rows = path.stat().st_size // row_bytes  # ignores a torn trailing write
+        if n_rows == 0:
+            return np.empty((0, ROW_WIDTH), dtype=ROW_DTYPE)
+
+        return np.memmap(path, dtype=ROW_DTYPE, mode='r', shape=(n_rows, ROW_WIDTH))
+
+    def time_range(self, symbol: str, timeframe: str) -> Optional[tuple]:
+        """
+        Return (first_timestamp_ms, last_timestamp_ms) of stored candles, or None.
+        """
+        rows = self.load(symbol, timeframe)
+        if len(rows) == 0:
+            return None
+        return int(rows[0, 0]), int(rows[-1, 0])
+
+    def append(self, symbol: str, timeframe: str, rows: np.ndarray) -> int:
+        """
+        Append candles newer than the last stored timestamp.
+
+        Args:
+            symbol: Trading pair
+            timeframe: Candle timeframe
+            rows: (n, 6) array of closed candles sorted by timestamp
+
+        Returns:
+            Number of rows actually appended
+        """
+        rows = np.asarray(rows, dtype=ROW_DTYPE).reshape(-1, ROW_WIDTH)
+        path = self.path(symbol, timeframe)
+
+        with self._lock:
+            existing = self.time_range(symbol, timeframe)
+            if existing is not None:
+                rows = rows[rows[:, 0] > existing[1]]
+            if len(rows) == 0:
+                return 0
+
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._truncate_torn_row(path)
+            with open(path, 'ab') as f:
+                rows.tofile(f)
+
+        return len(rows)
+
+    def write(self, symbol: str, timeframe: str, rows: np.ndarray) -> None:
+        """
+        Replace all stored candles for a symbol/timeframe (used for full reloads).
+
+        Args:
+            symbol: Trading pair
+            timeframe: Candle timeframe
+            rows: (n, 6) array of closed candles sorted by timestamp
+        """
+        rows = np.asarray(rows, dtype=ROW_DTYPE).reshape(-1, ROW_WIDTH)
+        path = self.path(symbol, timeframe)
+
+        with self._lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix('.tmp')
+            rows.tofile(tmp_path)
+            tmp_path.replace(path)
+
+    def record(self, outcome: str) -> None:
+        """Increment a cache counter ('hits', 'topups' or 'misses')."""
+        with self._lock:
+            self.stats[outcome] += 1
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        Return cache counters plus hit rate.
+
+        Returns:
+            Dictionary with hits, topups, misses, requests and hit_rate (0-1)
+        """
+        with self._lock:
+            stats = dict(self.stats)
+        requests = stats["hits"] + stats["topups"] + stats["misses"]
+        stats["requests"] = requests
+        stats["hit_rate"] = stats["hits"] / requests if requests else 0.0
+        return stats
+
+    @staticmethod
+    def _truncate_torn_row(path: Path) -> None:
+        """Drop a partially written trailing row left by an interrupted append."""
+        if not path.exists():
+            return
+        row_bytes = ROW_WIDTH * ROW_DTYPE.itemsize
+        size = path.stat().st_size
+        if size % row_bytes:
+            with open(path, 'r+b') as f:
+                f.truncate(size - size % row_bytes)
+
+
+_stores: Dict[str, CandleStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_candle_store(cache_dir: str = DEFAULT_CACHE_DIR) -> CandleStore:
+    """
+    Return the shared CandleStore for a cache directory (one per process).
+
+    Args:
+        cache_dir: Root cache directory (default: data/cache)
+
+    Returns:
+        CandleStore instance
+    """
+    key = str(Path(cache_dir).resolve())
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = CandleStore(cache_dir)
+        return _stores[key]
+
+
+def get_cache_stats(cache_dir: str = DEFAULT_CACHE_DIR) -> Dict[str, float]:
+    """Return hit/miss counters for the shared store of a cache directory."""
+    return get_candle_store(cache_dir).get_stats()
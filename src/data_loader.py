@@ -7,51 +7,293 @@ This module fetches market data from multiple sources:
 - Sentiment: RSS feeds via feedparser + TextBlob analysis
 """
 
+import calendar
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, Future, wait
+from pathlib import Path
+import numpy as np
 import pandas as pd
 import ccxt
-import yfinance as yf
 import feedparser
-from textblob import TextBlob
-from typing import List, Dict
+from typing import List, Dict, Optional, Callable, Tuple
 from .utils import standardize_columns
+from .candle_store import get_candle_store, DEFAULT_CACHE_DIR
+from .macro_store import get_macro_store, download_macro_data
+from .headline_store import HeadlineStore, get_headline_store
+from .sentiment_cache import get_sentiment_cache, headline_key, score_headlines
 
 logger = logging.getLogger(__name__)
 
+OHLCV_COLUMNS = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
 
-def fetch_crypto_data(symbol: str, days: int = 180) -> pd.DataFrame:
+# Binance returns at most 1000 candles per fetch_ohlcv call
+DEFAULT_PAGE_LIMIT = 1000
+
+# Retries per page for transient network errors before giving up
+MAX_PAGE_RETRIES = 3
+
+# Per-source limits for concurrent data collection (see collect_market_data)
+DEFAULT_CONCURRENCY = {'crypto': 16, 'macro': 3, 'rss': 4}
+DEFAULT_TIMEOUTS = {'crypto': 120.0, 'macro': 60.0, 'rss': 30.0}
+
+
+def rows_to_frame(rows: np.ndarray) -> pd.DataFrame:
+    """Convert (n, 6) rows (timestamp in ms, OHLCV) to a DataFrame indexed by timestamp."""
+    rows = np.asarray(rows, dtype=np.float64).reshape(-1, len(OHLCV_COLUMNS))
+    df = pd.DataFrame(rows[:, 1:], columns=OHLCV_COLUMNS[1:])
+    df.index = pd.to_datetime(rows[:, 0].astype(np.int64), unit='ms')
+    df.index.name = 'timestamp'
+    return df
+
+
+def timeframe_to_ms(timeframe: str) -> int:
+    """
+    Convert a ccxt timeframe string to milliseconds.
+    
+    Args:
+        timeframe: Timeframe such as '1m', '1h', '4h', '1d'
+        
+    Returns:
+        Candle duration in milliseconds
+    """
+    return int(ccxt.Exchange.parse_timeframe(timeframe) * 1000)
+
+
+def timeframe_to_timedelta(timeframe: str) -> pd.Timedelta:
+    """Convert a ccxt timeframe string ('1h', '4h', '1d', '7d') to a Timedelta."""
+    return pd.Timedelta(timeframe_to_ms(timeframe), unit='ms')
+
+
+def _checkpoint_header(symbol: str, timeframe: str, since: int) -> str:
+    """First line of a checkpoint file: what was pulled and from which candle."""
+    return f"# {symbol} {timeframe} {since}"
+
+
+def _read_checkpoint(checkpoint_path: Path, symbol: str, timeframe: str, since: int) -> Optional[np.ndarray]:
+    """
+    Load rows saved by an interrupted paginated pull.
+    
+    A checkpoint is reused when it holds the same symbol / timeframe and
+    started at or before `since` (a restart recomputes `since` from the
+    clock, so it may have moved forward); rows older than `since` are dropped.
+    
+    Returns None if there is no usable checkpoint.
+    """
+    if not checkpoint_path.exists():
+        return None
+    
+    with open(checkpoint_path, 'r', encoding='utf-8') as f:
+        parts = f.readline().split()
+    
+    if len(parts) != 4 or parts[1:3] != [symbol, timeframe] or not parts[3].isdigit() or int(parts[3]) > since:
+        logger.warning(f"Ignoring checkpoint for a different request: {checkpoint_path}")
+        return None
+    
+    rows = np.loadtxt(checkpoint_path, delimiter=',', comments='#', ndmin=2)
+    if rows.size == 0:
+        return None
+    
+    rows = rows.reshape(-1, len(OHLCV_COLUMNS))
+    rows = rows[rows[:, 0] >= since]
+    return rows if len(rows) else None
+
+
+def fetch_ohlcv_paginated(
+    exchange,
+    symbol: str,
+    timeframe: str = '1h',
+    since: Optional[int] = None,
+    until: Optional[int] = None,
+    page_limit: int = DEFAULT_PAGE_LIMIT,
+    checkpoint_path: Optional[str] = None,
+    sleep: Callable[[float], None] = time.sleep
+) -> pd.DataFrame:
+    """
+    Fetch a long OHLCV history by walking `since` cursors in fixed-size pages.
+    
+    Exchanges cap a single fetch_ohlcv call (Binance: ~1000 candles), so long
+    histories must be pulled page by page. Pages are kept as NumPy arrays and
+    concatenated once at the end (no quadratic DataFrame concatenation).
+    
+    See fetch_ohlcv_rows for the arguments; this wrapper returns a DataFrame
+    indexed by timestamp with columns: open, high, low, close, volume.
+    """
+    rows = fetch_ohlcv_rows(
+        exchange, symbol, timeframe, since, until, page_limit, checkpoint_path, sleep
+    )
+    return _ohlcv_to_frame(rows)
+
+
+def fetch_ohlcv_rows(
+    exchange,
+    symbol: str,
+    timeframe: str = '1h',
+    since: Optional[int] = None,
+    until: Optional[int] = None,
+    page_limit: int = DEFAULT_PAGE_LIMIT,
+    checkpoint_path: Optional[str] = None,
+    sleep: Callable[[float], None] = time.sleep
+) -> np.ndarray:
+    """
+    Paginated OHLCV pull returning raw (n, 6) rows: timestamp_ms, o, h, l, c, v.
+    
+    Args:
+        exchange: ccxt exchange instance (or any object with a compatible
+                  fetch_ohlcv(symbol, timeframe, since, limit) method)
+        symbol: Trading pair (e.g., 'BTC/USDT')
+        timeframe: Candle timeframe (default: '1h')
+        since: Start timestamp in ms (default: page_limit candles before until)
+        until: End timestamp in ms, inclusive (default: now)
+        page_limit: Candles requested per page (default: 1000)
+        checkpoint_path: Optional file where each page is appended as it
+                         arrives. An interrupted pull of the same symbol and
+                         timeframe resumes after the last saved page (also
+                         when restarted later with a clock-derived since).
+                         Deleted on success.
+        sleep: Sleep function used for rate limiting (injectable for tests)
+        
+    Returns:
+        (n, 6) float64 array sorted by timestamp
+        
+    Raises:
+        ccxt.NetworkError / ccxt.ExchangeError: If a page keeps failing.
+        Pages fetched so far stay in the checkpoint file.
+    """
+    tf_ms = timeframe_to_ms(timeframe)
+    
+    if until is None:
+        until = int(exchange.milliseconds()) if hasattr(exchange, 'milliseconds') else int(time.time() * 1000)
+    if since is None:
+        since = until - page_limit * tf_ms
+    # Start on a candle boundary (first candle opening at or after since), so
+    # repeated calls for the same history agree on where the pull begins
+    since = -(-since // tf_ms) * tf_ms
+    
+    # ccxt throttles internally when enableRateLimit is on; otherwise honor rateLimit ourselves
+    delay = 0.0 if getattr(exchange, 'enableRateLimit', False) else getattr(exchange, 'rateLimit', 0) / 1000
+    
+    pages: List[np.ndarray] = []
+    cursor = since
+    
+    checkpoint_file = None
+    if checkpoint_path is not None:
+        checkpoint = Path(checkpoint_path)
+        saved = _read_checkpoint(checkpoint, symbol, timeframe, since)
+        
+        if saved is not None:
+            pages.append(saved)
+            cursor = int(saved[-1, 0]) + tf_ms
+            logger.info(f"Resuming {symbol} from checkpoint ({len(saved)} candles already fetched)")
+        else:
+            checkpoint.parent.mkdir(parents=True, exist_ok=True)
+            with open(checkpoint, 'w', encoding='utf-8') as f:
+                f.write(_checkpoint_header(symbol, timeframe, since) + '\n')
+        
+        checkpoint_file = open(checkpoint, 'a', encoding='utf-8')
+    
+    try:
+        page_count = 0
+        while cursor <= until:
+            if page_count > 0 and delay > 0:
+                sleep(delay)
+            
+            for attempt in range(1, MAX_PAGE_RETRIES + 1):
+                try:
+                    ohlcv = exchange.fetch_ohlcv(symbol, timeframe, since=cursor, limit=page_limit)
+                    break
+                except ccxt.NetworkError as e:
+                    if attempt == MAX_PAGE_RETRIES:
+                        raise
+                    logger.warning(f"Network error on {symbol} page (attempt {attempt}): {e}")
+                    sleep(max(delay, 1.0) * attempt)
+            
+            page_count += 1
+            
+            if not ohlcv:
+                break
+            
+            page = np.asarray(ohlcv, dtype=np.float64).reshape(-1, len(OHLCV_COLUMNS))
+            page = page[(page[:, 0] >= cursor) & (page[:, 0] <= until)]
+            
+            if len(page) == 0:
+                break
+            
+            pages.append(page)
+            
+            if checkpoint_file is not None:
+                np.savetxt(checkpoint_file, page, delimiter=',', fmt='%.17g')
+                checkpoint_file.flush()
+            
+            cursor = int(page[-1, 0]) + tf_ms
+            logger.debug(f"Fetched page {page_count} for {symbol} ({len(page)} candles)")
+    finally:
+        if checkpoint_file is not None:
+            checkpoint_file.close()
+    
+    if checkpoint_path is not None:
+        Path(checkpoint_path).unlink(missing_ok=True)
+    
+    return np.concatenate(pages) if pages else np.empty((0, len(OHLCV_COLUMNS)))
+
+
+def _ohlcv_to_frame(rows: np.ndarray) -> pd.DataFrame:
+    """Convert an (n, 6) OHLCV array to a sorted, de-duplicated DataFrame."""
+    _, unique_idx = np.unique(rows[:, 0].astype(np.int64), return_index=True)
+    return rows_to_frame(rows[unique_idx])
+
+
+def fetch_crypto_data(
+    symbol: str,
+    days: int = 180,
+    exchange=None,
+    checkpoint_dir: Optional[str] = None,
+    use_cache: bool = True,
+    cache_dir: str = DEFAULT_CACHE_DIR
+) -> pd.DataFrame:
     """
     Fetch cryptocurrency OHLCV data from Binance using ccxt.
     
+    Long histories are fetched page by page (see fetch_ohlcv_paginated), so
+    `days` is honored even beyond the ~1000 candle per-request limit.
+    
+    With use_cache=True (default) closed candles are kept in a local
+    CandleStore: each call only downloads candles newer than the last stored
+    one, and makes no network call at all when no new candle has closed.
+    The cached path returns CLOSED candles only (no still-forming last bar).
+    
     Args:
         symbol: Trading pair (e.g., 'BTC/USDT')
         days: Number of days to fetch (default: 180)
+        exchange: Optional ccxt exchange instance (default: ccxt.binance())
+        checkpoint_dir: Optional directory for resumable pull checkpoints
+        use_cache: Serve from / top up the local candle store (default: True)
+        cache_dir: Candle store directory (default: data/cache)
         
     Returns:
         DataFrame with columns: open, high, low, close, volume
         Returns empty DataFrame on error
     """
     try:
-        exchange = ccxt.binance()
         timeframe = '1h'
         
-        # Calculate how many candles to fetch
-        candles_needed = days * 24  # 1-hour candles
-        
         logger.info(f"Fetching {symbol} data for {days} days...")
         
-        # Fetch OHLCV data
-        ohlcv = exchange.fetch_ohlcv(symbol, timeframe, limit=candles_needed)
-        
-        # Convert to DataFrame
-        df = pd.DataFrame(
-            ohlcv,
-            columns=['timestamp', 'open', 'high', 'low', 'close', 'volume']
-        )
-        
-        # Convert timestamp to datetime
-        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-        df.set_index('timestamp', inplace=True)
+        if use_cache:
+            df = _fetch_crypto_cached(symbol, days, timeframe, exchange, checkpoint_dir, cache_dir)
+        else:
+            if exchange is None:
+                exchange = ccxt.binance()
+            
+            # Walk pages from `days` ago until now
+            until = int(exchange.milliseconds())
+            since = until - days * 24 * timeframe_to_ms(timeframe)
+            
+            df = fetch_ohlcv_paginated(
+                exchange, symbol, timeframe,
+                since=since, until=until,
+                checkpoint_path=_checkpoint_path(checkpoint_dir, symbol, timeframe)
+            )
         
         # Standardize column names
         df = standardize_columns(df)
@@ -70,81 +312,237 @@ def fetch_crypto_data(symbol: str, days: int = 180) -> pd.DataFrame:
         return pd.DataFrame()
 
 
-def fetch_macro_data(symbol: str, days: int = 180) -> pd.DataFrame:
+def _checkpoint_path(checkpoint_dir: Optional[str], symbol: str, timeframe: str) -> Optional[str]:
+    """Build the checkpoint file path for a symbol/timeframe pull (None if disabled)."""
+    if checkpoint_dir is None:
+        return None
+    return str(Path(checkpoint_dir) / f"{symbol.replace('/', '_')}_{timeframe}.partial")
+
+
+def _fetch_crypto_cached(
+    symbol: str,
+    days: int,
+    timeframe: str,
+    exchange,
+    checkpoint_dir: Optional[str],
+    cache_dir: str
+) -> pd.DataFrame:
+    """
+    Serve closed candles from the local store, downloading only what is missing.
+    
+    - hit: the store already holds the latest closed candle -> no network call
+    - topup: fetch candles newer than the last stored timestamp and append
+    - miss: nothing (or not enough history) stored -> full paginated pull
+    """
+    store = get_candle_store(cache_dir)
+    tf_ms = timeframe_to_ms(timeframe)
+    
+    now = int(exchange.milliseconds()) if exchange is not None else int(time.time() * 1000)
+    latest_closed = (now // tf_ms) * tf_ms - tf_ms  # open time of the newest closed candle
+    since = latest_closed - (days * 24 * 3600 * 1000 // tf_ms - 1) * tf_ms
+    
+    stored = store.time_range(symbol, timeframe)
+    
+    if stored is not None and stored[0] <= since and stored[1] >= latest_closed:
+        store.record("hits")
+        logger.debug(f"Cache hit for {symbol} {timeframe}")
+    else:
+        if exchange is None:
+            exchange = ccxt.binance()
+        
+        if stored is not None and stored[0] <= since:
+            store.record("topups")
+            rows = _fetch_closed_rows(exchange, symbol, timeframe, stored[1] + tf_ms, latest_closed, checkpoint_dir)
+            appended = store.append(symbol, timeframe, rows)
+            logger.info(f"Cache top-up for {symbol}: {appended} new candles")
+        else:
+            store.record("misses")
+            rows = _fetch_closed_rows(exchange, symbol, timeframe, since, latest_closed, checkpoint_dir)
+            store.write(symbol, timeframe, rows)
+            logger.info(f"Cache miss for {symbol}: stored {len(rows)} candles")
+    
+    rows = store.load(symbol, timeframe)
+    start = int(np.searchsorted(rows[:, 0], since, side='left')) if len(rows) else 0
+    return _ohlcv_to_frame(np.array(rows[start:]))
+
+
+def _fetch_closed_rows(
+    exchange,
+    symbol: str,
+    timeframe: str,
+    since: int,
+    until: int,
+    checkpoint_dir: Optional[str]
+) -> np.ndarray:
+    """Paginated pull of closed candles between since and until (inclusive) as an (n, 6) array."""
+    return fetch_ohlcv_rows(
+        exchange, symbol, timeframe,
+        since=since, until=until,
+        checkpoint_path=_checkpoint_path(checkpoint_dir, symbol, timeframe)
+    )
+
+
+def fetch_macro_data(
+    symbol: str,
+    days: int = 180,
+    use_cache: bool = True,
+    cache_dir: str = DEFAULT_CACHE_DIR
+) -> pd.DataFrame:
     """
     Fetch macro asset data from Yahoo Finance.
     
+    With use_cache=True (default) bars are served by the shared MacroStore,
+    which only goes to the network once a new session has closed.
+    
     Args:
         symbol: Yahoo Finance symbol (e.g., 'GC=F', 'DX-Y.NYB', '^GSPC')
         days: Number of days to fetch (default: 180)
+        use_cache: Serve from / refresh the local macro store (default: True)
+        cache_dir: Cache directory (default: data/cache)
         
     Returns:
-        DataFrame with columns: open, high, low, close, volume
-        Returns empty DataFrame on error
+        DataFrame with columns: open, high, low, close, volume, indexed by
+        session close (naive UTC). Returns empty DataFrame on error
     """
-    try:
-        logger.info(f"Fetching macro data for {symbol}...")
-        
-        # Calculate period string
-        period = f"{days}d"
-        
-        # Fetch data using yfinance
-        ticker = yf.Ticker(symbol)
-        df = ticker.history(period=period, interval='1d')
+    return fetch_macro_batch({symbol: symbol}, days, use_cache, cache_dir).get(symbol, pd.DataFrame())
+
+
+def fetch_macro_batch(
+    macro_symbols: Dict[str, str],
+    days: int = 180,
+    use_cache: bool = True,
+    cache_dir: str = DEFAULT_CACHE_DIR
+) -> Dict[str, pd.DataFrame]:
+    """
+    Fetch several macro assets with at most one (batched) Yahoo Finance download.
+    
+    Args:
+        macro_symbols: Mapping of {asset_name: yahoo_symbol}, e.g. {'gold': 'GC=F'}
+        days: Number of days to fetch (default: 180)
+        use_cache: Serve from / refresh the local macro store (default: True)
+        cache_dir: Cache directory (default: data/cache)
         
-        if df.empty:
-            logger.warning(f"No data returned for {symbol}")
-            return pd.DataFrame()
+    Returns:
+        Dictionary of {asset_name: DataFrame} in input order, non-empty frames only.
+        Returns empty dictionary on error
+    """
+    try:
+        logger.info(f"Fetching macro data for {', '.join(macro_symbols.values())}...")
         
-        # yfinance returns columns: Open, High, Low, Close, Volume
-        # Standardize column names to lowercase
-        df = standardize_columns(df)
+        tickers = list(macro_symbols.values())
+        if use_cache:
+            frames = get_macro_store(cache_dir).get(tickers, days)
+        else:
+            frames = download_macro_data(tickers, days)
         
-        logger.info(f"✓ Successfully fetched {len(df)} days for {symbol}")
-        return df
+        results = {}
+        for name, ticker in macro_symbols.items():
+            df = frames.get(ticker)
+            if df is None or df.empty:
+                logger.warning(f"No data returned for {ticker}")
+                continue
+            results[name] = standardize_columns(df)
+            logger.info(f"✓ Successfully fetched {len(df)} days for {ticker}")
+        return results
         
     except Exception as e:
-        logger.error(f"Error fetching macro data for {symbol}: {e}")
-        return pd.DataFrame()
+        logger.error(f"Error fetching macro data for {', '.join(macro_symbols.values())}: {e}")
+        return {}
 
 
-def fetch_rss_headlines(feed_urls: List[str]) -> List[str]:
+def fetch_rss_headlines(
+    feed_urls: List[str],
+    use_cache: bool = True,
+    cache_dir: str = DEFAULT_CACHE_DIR,
+    workers: int = DEFAULT_CONCURRENCY['rss']
+) -> List[str]:
     """
     Fetch news headlines from RSS feeds.
     
+    Feeds are fetched concurrently. With use_cache=True (default) each feed is
+    requested with the ETag / Last-Modified of its previous download: an
+    unchanged feed answers 304 and its stored headlines are reused, and new
+    headlines are added to the timestamped HeadlineStore log.
+    
     Args:
         feed_urls: List of RSS feed URLs
+        use_cache: Use conditional GETs and the local headline store (default: True)
+        cache_dir: Headline store directory (default: data/cache)
+        workers: Maximum number of feeds fetched at once
         
     Returns:
-        List of headline strings. Returns empty list on error.
+        List of headline strings (feed order). Returns empty list on error.
     """
-    headlines = []
+    store = get_headline_store(cache_dir) if use_cache else None
     
-    for url in feed_urls:
-        try:
-            logger.info(f"Fetching RSS feed: {url}")
-            feed = feedparser.parse(url)
-            
-            # Extract titles from entries
-            for entry in feed.entries[:10]:  # Limit to 10 headlines per feed
-                if hasattr(entry, 'title'):
-                    headlines.append(entry.title)
-            
-            logger.info(f"✓ Fetched {len(feed.entries[:10])} headlines from {url}")
-            
-        except Exception as e:
-            logger.error(f"Error fetching RSS feed {url}: {e}")
-            continue
+    if workers <= 1 or len(feed_urls) <= 1:
+        results = [_fetch_feed(url, store) for url in feed_urls]
+    else:
+        with ThreadPoolExecutor(max_workers=min(workers, len(feed_urls)), thread_name_prefix="fetch-rss") as pool:
+            results = list(pool.map(lambda url: _fetch_feed(url, store), feed_urls))
     
-    return headlines
+    return [headline for feed_headlines in results for headline in feed_headlines]
 
 
-def calculate_sentiment(headlines: List[str]) -> float:
+def _fetch_feed(url: str, store: Optional[HeadlineStore], limit: int = 10) -> List[str]:
+    """Fetch one feed (conditional GET when a store is given); [] on error."""
+    try:
+        logger.info(f"Fetching RSS feed: {url}")
+        validators = store.validators(url) if store is not None else {}
+        feed = feedparser.parse(url, etag=validators.get('etag'), modified=validators.get('modified'))
+        
+        status = feed.get('status')
+        if status == 304 and store is not None:
+            headlines = store.record_not_modified(url)
+            logger.info(f"✓ Not modified: {url} ({len(headlines)} stored headlines)")
+            return headlines
+        
+        if (status is not None and status >= 400) or (feed.get('bozo') and not feed.entries):
+            logger.error(f"Error fetching RSS feed {url}: {feed.get('bozo_exception', f'HTTP {status}')}")
+            return []
+        
+        # Extract titles from entries
+        entries = [entry for entry in feed.entries[:limit] if hasattr(entry, 'title')]
+        
+        if store is not None:
+            fetched_ms = int(time.time() * 1000)
+            store.record_download(
+                url,
+                [{'title': entry.title, 'published': _entry_time_ms(entry, fetched_ms)} for entry in entries],
+                etag=feed.get('etag'),
+                modified=feed.get('modified')
+            )
+        
+        logger.info(f"✓ Fetched {len(entries)} headlines from {url}")
+        return [entry.title for entry in entries]
+        
+    except Exception as e:
+        logger.error(f"Error fetching RSS feed {url}: {e}")
+        return []
+
+
+def _entry_time_ms(entry, default_ms: int) -> int:
+    """Publish (or update) time of a feed entry in ms since epoch, else default_ms."""
+    parsed = entry.get('published_parsed') or entry.get('updated_parsed')
+    return calendar.timegm(parsed) * 1000 if parsed else default_ms
+
+
+def calculate_sentiment(
+    headlines: List[str],
+    use_cache: bool = True,
+    cache_dir: str = DEFAULT_CACHE_DIR
+) -> float:
     """
     Calculate average sentiment score from news headlines using TextBlob.
     
+    Headlines repeated across feeds are counted once. With use_cache=True
+    (default) polarities are kept in a persistent SentimentCache, so only
+    headlines not seen in earlier runs are scored.
+    
     Args:
         headlines: List of headline strings
+        use_cache: Serve from / add to the local sentiment cache (default: True)
+        cache_dir: Cache directory (default: data/cache)
         
     Returns:
         Average polarity score from -1 (negative) to +1 (positive)
@@ -155,15 +553,13 @@ def calculate_sentiment(headlines: List[str]) -> float:
             logger.warning("No headlines provided for sentiment analysis")
             return 0.0
         
-        # Calculate polarity for each headline
-        polarities = []
-        for headline in headlines:
-            try:
-                blob = TextBlob(headline)
-                polarities.append(blob.sentiment.polarity)
-            except Exception as e:
-                logger.warning(f"Error analyzing headline '{headline[:50]}...': {e}")
-                continue
+        # Deduplicate on the normalized text (same story from several feeds)
+        unique = {headline_key(headline): headline for headline in headlines}
+        
+        if use_cache:
+            polarities = get_sentiment_cache(cache_dir).score(unique.values())
+        else:
+            polarities = list(score_headlines(unique).values())
         
         if not polarities:
             return 0.0
@@ -177,3 +573,102 @@ def calculate_sentiment(headlines: List[str]) -> float:
     except Exception as e:
         logger.error(f"Error calculating sentiment: {e}")
         return 0.0
+
+
+def collect_market_data(
+    symbols: List[str],
+    macro_symbols: Dict[str, str],
+    rss_feeds: List[str],
+    days: int = 180,
+    use_cache: bool = True,
+    concurrency: Optional[Dict[str, int]] = None,
+    timeouts: Optional[Dict[str, float]] = None
+) -> Tuple[Dict[str, pd.DataFrame], Dict[str, pd.DataFrame], List[str]]:
+    """
+    Fetch crypto OHLCV, macro series and RSS headlines concurrently.
+    
+    Each source ('crypto', 'macro', 'rss') gets its own bounded thread pool and
+    its own timeout, measured from the moment all requests are submitted. Total
+    wall time is therefore close to the slowest single fetch rather than the
+    sum of all fetches. A failing or timed-out fetch is logged and skipped
+    without affecting the others.
+    
+    Args:
+        symbols: Crypto trading pairs (e.g., ['BTC/USDT', 'ETH/USDT'])
+        macro_symbols: Mapping of {asset_name: yahoo_symbol}, e.g. {'gold': 'GC=F'}
+        rss_feeds: List of RSS feed URLs
+        days: Days of history for crypto and macro data (default: 180)
+        use_cache: Use the local candle cache for crypto data and conditional
+            GETs / the headline store for RSS feeds (default: True)
+        concurrency: Optional per-source worker limits (defaults: DEFAULT_CONCURRENCY)
+        timeouts: Optional per-source timeouts in seconds (defaults: DEFAULT_TIMEOUTS)
+        
+    Returns:
+        Tuple of (crypto_data, macro_data, headlines):
+        - crypto_data: {symbol: DataFrame} in input order, non-empty frames only
+        - macro_data: {asset_name: DataFrame} in input order, non-empty frames only
+        - headlines: Headlines from all feeds that answered in time (feed order)
+    """
+    limits = {**DEFAULT_CONCURRENCY, **(concurrency or {})}
+    deadlines = {**DEFAULT_TIMEOUTS, **(timeouts or {})}
+    
+    pools = {
+        source: ThreadPoolExecutor(max_workers=max(1, limits[source]), thread_name_prefix=f"fetch-{source}")
+        for source in ('crypto', 'macro', 'rss')
+    }
+    
+    try:
+        submitted = {
+            'crypto': {
+                symbol: pools['crypto'].submit(fetch_crypto_data, symbol, days, use_cache=use_cache)
+                for symbol in symbols
+            },
+            # One job: the macro store refreshes all stale tickers in a single download
+            'macro': {
+                'batch': pools['macro'].submit(fetch_macro_batch, macro_symbols, days, use_cache)
+            } if macro_symbols else {},
+            'rss': {
+                url: pools['rss'].submit(fetch_rss_headlines, [url], use_cache)
+                for url in rss_feeds
+            },
+        }
+        start = time.monotonic()
+        
+        results = {}
+        for source, futures in submitted.items():
+            remaining = max(0.0, deadlines[source] - (time.monotonic() - start))
+            wait(list(futures.values()), timeout=remaining)
+            results[source] = _collect_results(source, futures)
+    finally:
+        for pool in pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+    
+    crypto_data = {}
+    for symbol, df in results['crypto'].items():
+        if df is not None and not df.empty:
+            crypto_data[symbol] = df
+        else:
+            logger.warning(f"⚠ Skipping {symbol} (no data)")
+    
+    macro_data = results['macro'].get('batch') or {}
+    
+    headlines = []
+    for feed_headlines in results['rss'].values():
+        headlines.extend(feed_headlines or [])
+    
+    return crypto_data, macro_data, headlines
+
+
+def _collect_results(source: str, futures: Dict[str, Future]) -> Dict[str, object]:
+    """Gather finished futures in input order, logging failures and timeouts."""
+    results = {}
+    for key, future in futures.items():
+        if not future.done():
+            future.cancel()
+            logger.error(f"✗ Timed out fetching {source} data for {key}")
+            continue
+        try:
+            results[key] = future.result()
+        except Exception as e:
+            logger.error(f"✗ Error fetching {source} data for {key}: {e}")
+    return results
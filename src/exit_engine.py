@@ -0,0 +1,569 @@
+"""
+Exit engine for the backtest proof engine.
+
+This module resolves trade exits with NumPy array operations instead of
+walking the DataFrame bar by bar. The low/high price paths are extracted once
+as arrays and the first stop-loss or take-profit breach is located with
+vectorized comparisons.
+
+Conventions (matching the original bar-by-bar simulation):
+- Scanning starts on the bar AFTER the entry bar
+- Long: stop loss is hit when low <= stop price, take profit when high >= take price
+- Short: stop loss is hit when high >= stop price, take profit when low <= take price
+- If both levels are touched on the same bar, the stop loss wins (conservative)
+- A trailing stop for bar t trails the highest high of the bars BEFORE t
+  (starting from the entry price), so it never uses the bar's own range
+"""
+
+import logging
+from typing import Tuple
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Result labels shared with backtester.py and the report generator
+RESULT_TP = "TP"
+RESULT_SL = "SL"
+RESULT_OPEN = "Open"
+
+# Trade directions (strategy 'direction' field)
+DIRECTION_LONG = "long"
+DIRECTION_SHORT = "short"
+
+# First chunk size for the forward search. Chunks double in size, so trades that
+# close quickly only touch a few bars while long trades need O(log n) NumPy calls.
+DEFAULT_CHUNK_SIZE = 64
+
+
+def find_first_touch(
+    low: np.ndarray,
+    high: np.ndarray,
+    start: int,
+    stop_price: float,
+    take_price: float,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Tuple[str, int]:
+    """
+    Find the first bar at or after `start` where a long trade hits SL or TP.
+
+    Args:
+        low: Array of bar lows
+        high: Array of bar highs (same length as low)
+        start: First bar position to check (usually entry_idx + 1)
+        stop_price: Stop loss price (hit when low <= stop_price)
+        take_price: Take profit price (hit when high >= take_price)
+        chunk_size: Size of the first search chunk (doubles each iteration)
+
+    Returns:
+        Tuple of (result, exit_idx):
+        - result: "SL", "TP" or "Open" (neither level hit before end of data)
+        - exit_idx: Bar position of the exit, or len(low) - 1 if still open
+    """
+    n = len(low)
+    pos = max(int(start), 0)
+    size = max(int(chunk_size), 1)
+
+    while pos < n:
+        end = min(pos + size, n)
+
+        stop_hit = low[pos:end] <= stop_price
+        take_hit = high[pos:end] >= take_price
+        hit = stop_hit | take_hit
+
+        if hit.any():
+            offset = int(hit.argmax())
+            result = RESULT_SL if stop_hit[offset] else RESULT_TP
+            return result, pos + offset
+
+        pos = end
+        size *= 2
+
+    return RESULT_OPEN, n - 1
+
+
+def mirror_path(low: np.ndarray, high: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Negate a price path so a short trade can be searched as a long one.
+
+    On (-high, -low) a short's stop (high >= stop) becomes low' <= -stop and
+    its take profit (low <= take) becomes high' >= -take; levels and exit
+    prices are negated the same way.
+
+    Returns:
+        Tuple of (mirrored_low, mirrored_high)
+    """
+    return -np.asarray(high, dtype=np.float64), -np.asarray(low, dtype=np.float64)
+
+
+def price_arrays(df) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Extract low, high and close columns as float64 NumPy arrays.
+
+    For float64 columns this returns views of the DataFrame's storage, so it is
+    cheap enough to call once per backtest.
+
+    Args:
+        df: DataFrame with 'low', 'high' and 'close' columns
+
+    Returns:
+        Tuple of (low, high, close) arrays
+    """
+    low = df['low'].to_numpy(dtype=np.float64)
+    high = df['high'].to_numpy(dtype=np.float64)
+    close = df['close'].to_numpy(dtype=np.float64)
+    return low, high, close
+
+
+class PathIndex:
+    """
+    Precomputed forward range-min/max tables over a price path.
+
+    Level k of each table holds the min (or max) of the 2**k bars starting at
+    every position. Finding the first breach of a level from many entry points
+    then becomes a vectorized binary-lifting search: O(log n) NumPy operations
+    for ALL entries together instead of one forward scan per entry.
+
+    Build once per DataFrame and reuse it for every condition, SL/TP pair or
+    ATR multiplier evaluated on that frame.
+    """
+
+    def __init__(self, low: np.ndarray, high: np.ndarray):
+        """
+        Args:
+            low: Array of bar lows
+            high: Array of bar highs (same length as low)
+        """
+        self.low = np.asarray(low, dtype=np.float64)
+        self.high = np.asarray(high, dtype=np.float64)
+        self.n = len(self.low)
+
+        self._min_levels = [self.low]
+        self._max_levels = [self.high]
+
+        span = 1
+        while span * 2 <= self.n:
+            prev_min = self._min_levels[-1]
+            prev_max = self._max_levels[-1]
+            self._min_levels.append(np.minimum(prev_min[:-span], prev_min[span:]))
+            self._max_levels.append(np.maximum(prev_max[:-span], prev_max[span:]))
+            span *= 2
+
+        # Next strictly lower low / higher high per bar, built on first grid search
+        self._next_breaks = {}
+
+    @classmethod
+    def from_frame(cls, df) -> "PathIndex":
+        """Build a PathIndex from a DataFrame with 'low' and 'high' columns."""
+        low, high, _ = price_arrays(df)
+        return cls(low, high)
+
+    def _first_breach(
+        self,
+        levels_table: list,
+        start: np.ndarray,
+        level: np.ndarray,
+        below: bool,
+        end=None
+    ) -> np.ndarray:
+        """
+        Shared binary-lifting search for first_below / first_above.
+
+        Skips the longest run of bars (starting at `start`) that stays strictly
+        on the safe side of `level`. The bar right after that run is the breach.
+        """
+        start = np.asarray(start, dtype=np.int64)
+        end = self.n if end is None else np.minimum(np.asarray(end, dtype=np.int64), self.n)
+        level = np.broadcast_to(np.asarray(level, dtype=np.float64), start.shape)
+        pos = start.copy()
+
+        for k in range(len(levels_table) - 1, -1, -1):
+            span = 1 << k
+            table = levels_table[k]
+
+            # Block [pos, pos + span) must lie inside the searchable range
+            can_jump = pos + span <= end
+            if not can_jump.any():
+                continue
+
+            lookup = np.where(can_jump, pos, 0)
+            block = table[lookup]
+            safe = block > level if below else block < level
+            pos = np.where(can_jump & safe, pos + span, pos)
+
+        # pos is now the first bar that breaches, unless the path ran out
+        in_range = pos < end
+        lookup = np.where(in_range, pos, 0)
+        values = levels_table[0][lookup]
+        breached = values <= level if below else values >= level
+        return np.where(in_range & breached, pos, self.n)
+
+    def first_below(self, start, level, end=None) -> np.ndarray:
+        """
+        First bar index >= start where low <= level (vectorized over entries).
+
+        Args:
+            start: Array of start positions
+            level: Array (or scalar) of price levels
+            end: Optional exclusive bound on the search, scalar or per entry (default: end of data)
+
+        Returns:
+            Array of bar indices; len(path) where the level is never breached
+        """
+        return self._first_breach(self._min_levels, start, level, below=True, end=end)
+
+    def first_above(self, start, level, end=None) -> np.ndarray:
+        """
+        First bar index >= start where high >= level (vectorized over entries).
+
+        Args:
+            start: Array of start positions
+            level: Array (or scalar) of price levels
+            end: Optional exclusive bound on the search, scalar or per entry (default: end of data)
+
+        Returns:
+            Array of bar indices; len(path) where the level is never breached
+        """
+        return self._first_breach(self._max_levels, start, level, below=False, end=end)
+
+    def first_below_grid(self, start, levels, end=None) -> np.ndarray:
+        """
+        first_below for a grid of levels per entry (e.g. every stop of a sweep).
+
+        Args:
+            start: Array of E start positions
+            levels: (K, E) array of finite price levels, any order
+            end: Optional exclusive bound on the search, scalar or per entry (default: end of data)
+
+        Returns:
+            (K, E) array of bar indices; len(path) where the level is never breached
+        """
+        return self._first_breach_grid(self.low, self._next_break(below=True), start, levels, end)
+
+    def first_above_grid(self, start, levels, end=None) -> np.ndarray:
+        """
+        first_above for a grid of levels per entry (e.g. every take profit of a sweep).
+
+        Args:
+            start: Array of E start positions
+            levels: (K, E) array of finite price levels, any order
+            end: Optional exclusive bound on the search, scalar or per entry (default: end of data)
+
+        Returns:
+            (K, E) array of bar indices; len(path) where the level is never breached
+        """
+        levels = -np.asarray(levels, dtype=np.float64)
+        return self._first_breach_grid(-self.high, self._next_break(below=False), start, levels, end)
+
+    def _next_break(self, below: bool) -> np.ndarray:
+        """Position of the next strictly lower low (below) or higher high per bar; len(path) if none."""
+        if below not in self._next_breaks:
+            after = np.arange(1, self.n + 1)
+            if below:
+                self._next_breaks[below] = self.first_below(after, np.nextafter(self.low, -np.inf))
+            else:
+                self._next_breaks[below] = self.first_above(after, np.nextafter(self.high, np.inf))
+        return self._next_breaks[below]
+
+    def _first_breach_grid(
+        self,
+        values: np.ndarray,
+        next_break: np.ndarray,
+        start: np.ndarray,
+        levels: np.ndarray,
+        end=None
+    ) -> np.ndarray:
+        """
+        Shared search for first_below_grid / first_above_grid (above = negated path).
+
+        The running minimum of the path from an entry only changes on the
+        entry's chain of successive new lows (start, next_break[start], ...),
+        so the first breach of ANY level is the first chain bar at or below
+        it. Each entry's chain is walked once, down to its deepest level, and
+        every level is then placed on it by a vectorized binary search: the
+        K levels of an entry cost O(chain + K log chain) array work instead
+        of K binary-lifting searches over the whole path.
+        """
+        start = np.asarray(start, dtype=np.int64)
+        levels = np.asarray(levels, dtype=np.float64)
+        count = len(start)
+        end = np.broadcast_to(self.n if end is None else np.minimum(np.asarray(end, dtype=np.int64), self.n), (count,))
+
+        # Sentinel bar n breaches every level (end of the chain)
+        padded = np.append(values, -np.inf)
+        deepest = levels.min(axis=0) if len(levels) else np.full(count, np.inf)
+
+        node = np.where(start < end, start, self.n)
+        chain = [node]
+        active = np.flatnonzero(padded[node] > deepest)
+        while active.size:
+            node = np.full(count, self.n)
+            following = next_break[chain[-1][active]]
+            node[active] = np.where(following < end[active], following, self.n)
+            chain.append(node)
+            active = active[padded[node[active]] > deepest[active]]
+
+        # Pad every chain to a power of two with sentinels, then count the
+        # chain bars strictly above each level (branchless binary search)
+        width = 1 << (len(chain) - 1).bit_length()
+        chain.extend([np.full(count, self.n)] * (width - len(chain)))
+        chain = np.concatenate(chain)  # step j of entry e at j * count + e
+        chain_values = padded[chain]
+
+        pos = np.broadcast_to(np.arange(count), levels.shape).copy()
+        step = width // 2
+        while step:
+            pos += (step * count) * (chain_values[pos + (step - 1) * count] > levels)
+            step //= 2
+
+        return chain[pos]
+
+
+def resolve_long_exits(
+    path: PathIndex,
+    entry_idx: np.ndarray,
+    stop_prices: np.ndarray,
+    take_prices: np.ndarray,
+    end=None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Resolve SL/TP exits for many long entries at once.
+
+    Args:
+        path: PathIndex built over the DataFrame's low/high arrays
+        entry_idx: Array of entry bar positions
+        stop_prices: Stop loss price per entry (or scalar)
+        take_prices: Take profit price per entry (or scalar)
+        end: Optional exclusive bound on the exit search, scalar or per entry
+             (default: end of data)
+
+    Returns:
+        Tuple of (results, exit_idx):
+        - results: Object array of "SL", "TP" or "Open"
+        - exit_idx: Exit bar position per entry (last searchable bar if open)
+    """
+    entry_idx = np.asarray(entry_idx, dtype=np.int64)
+    start = entry_idx + 1
+    limit = path.n if end is None else np.minimum(np.asarray(end, dtype=np.int64), path.n)
+
+    stop_idx = path.first_below(start, stop_prices, end=limit)
+    take_idx = path.first_above(start, take_prices, end=limit)
+
+    return _combine_exits(stop_idx, take_idx, path.n, limit)
+
+
+def resolve_short_exits(
+    path: PathIndex,
+    entry_idx: np.ndarray,
+    stop_prices: np.ndarray,
+    take_prices: np.ndarray,
+    end=None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Resolve SL/TP exits for many short entries at once.
+
+    Same contract as resolve_long_exits, with the stop above the entry (hit
+    when high >= stop) and the take profit below it (hit when low <= take).
+    """
+    entry_idx = np.asarray(entry_idx, dtype=np.int64)
+    start = entry_idx + 1
+    limit = path.n if end is None else np.minimum(np.asarray(end, dtype=np.int64), path.n)
+
+    stop_idx = path.first_above(start, stop_prices, end=limit)
+    take_idx = path.first_below(start, take_prices, end=limit)
+
+    return _combine_exits(stop_idx, take_idx, path.n, limit)
+
+
+def resolve_exits(
+    path: PathIndex,
+    entry_idx: np.ndarray,
+    stop_prices: np.ndarray,
+    take_prices: np.ndarray,
+    direction: str = DIRECTION_LONG,
+    end=None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Dispatch to resolve_long_exits / resolve_short_exits by direction."""
+    if direction == DIRECTION_LONG:
+        return resolve_long_exits(path, entry_idx, stop_prices, take_prices, end=end)
+    if direction == DIRECTION_SHORT:
+        return resolve_short_exits(path, entry_idx, stop_prices, take_prices, end=end)
+    raise ValueError(f"Unknown trade direction: {direction}")
+
+
+def _combine_exits(
+    stop_idx: np.ndarray,
+    take_idx: np.ndarray,
+    n: int,
+    limit
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Pick whichever level was hit first (SL wins ties) and label the result."""
+    stop_first = (stop_idx <= take_idx) & (stop_idx < n)
+    take_first = (take_idx < stop_idx) & (take_idx < n)
+
+    results = np.full(stop_idx.shape, RESULT_OPEN, dtype=object)
+    results[stop_first] = RESULT_SL
+    results[take_first] = RESULT_TP
+
+    exit_idx = np.where(stop_first, stop_idx, np.where(take_first, take_idx, limit - 1))
+    return results, exit_idx
+
+
+def find_first_trailing_touch(
+    low: np.ndarray,
+    high: np.ndarray,
+    start: int,
+    entry_price: float,
+    stop_price: float,
+    take_price: float,
+    trail_distance: float,
+    end: int = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Tuple[str, int, float]:
+    """
+    Forward search for a long trade with a trailing stop.
+
+    The stop for each bar is max(stop_price, highest high before that bar -
+    trail_distance), with the entry price as the starting peak. Chunks grow
+    geometrically like find_first_touch; the running peak is carried between
+    chunks with np.maximum.accumulate.
+
+    Args:
+        low: Array of bar lows
+        high: Array of bar highs (same length as low)
+        start: First bar position to check (usually entry_idx + 1)
+        entry_price: Entry price (initial peak of the trail)
+        stop_price: Initial stop loss price (the trail never goes below it)
+        take_price: Take profit price (np.inf to disable)
+        trail_distance: Distance of the trailing stop below the peak
+        end: Optional exclusive bound on the search (default: end of data)
+        chunk_size: Size of the first search chunk (doubles each iteration)
+
+    Returns:
+        Tuple of (result, exit_idx, exit_price):
+        - result: "SL" (initial or trailing stop), "TP" or "Open"
+        - exit_idx: Bar position of the exit, or end - 1 if still open
+        - exit_price: Stop level or take price at the exit (NaN if open)
+    """
+    n = len(low) if end is None else min(int(end), len(low))
+    pos = max(int(start), 0)
+    size = max(int(chunk_size), 1)
+    peak = float(entry_price)
+
+    while pos < n:
+        chunk_end = min(pos + size, n)
+
+        chunk_high = high[pos:chunk_end]
+        prior_peak = np.maximum.accumulate(np.concatenate(([peak], chunk_high[:-1])))
+        stops = np.maximum(stop_price, prior_peak - trail_distance)
+
+        stop_hit = low[pos:chunk_end] <= stops
+        take_hit = chunk_high >= take_price
+        hit = stop_hit | take_hit
+
+        if hit.any():
+            offset = int(hit.argmax())
+            if stop_hit[offset]:
+                return RESULT_SL, pos + offset, float(stops[offset])
+            return RESULT_TP, pos + offset, float(take_price)
+
+        peak = max(peak, float(chunk_high.max()))
+        pos = chunk_end
+        size *= 2
+
+    return RESULT_OPEN, n - 1, float('nan')
+
+
+def resolve_trailing_exits(
+    low: np.ndarray,
+    high: np.ndarray,
+    entry_idx: np.ndarray,
+    entry_prices: np.ndarray,
+    stop_prices: np.ndarray,
+    take_prices: np.ndarray,
+    trail_distances: np.ndarray,
+    end=None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_window: int = 1 << 16
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Resolve trailing-stop exits for many long entries at once.
+
+    Same rules as find_first_trailing_touch, batched: every still-open entry
+    reads its next window of bars into one (entries x bars) array, the
+    running peak is carried along the window with np.maximum.accumulate and
+    compared with the lows as a per-bar trail level. Windows double in size
+    like the per-entry search (capped so one window holds about `max_window`
+    bars), so the cost is O(log duration) NumPy calls for ALL entries
+    together. Shorts are resolved by passing the mirror_path() arrays and
+    negated levels.
+
+    Args:
+        low: Array of bar lows
+        high: Array of bar highs
+        entry_idx: Array of entry bar positions
+        entry_prices: Entry price per entry
+        stop_prices: Initial stop price per entry
+        take_prices: Take profit price per entry (np.inf to disable)
+        trail_distances: Trailing distance per entry
+        end: Optional exclusive bound on the exit search, scalar or per entry
+        chunk_size: Size of the first window (doubles each iteration)
+        max_window: Approximate cap on entries x bars read per iteration
+
+    Returns:
+        Tuple of (results, exit_idx, exit_prices) arrays
+    """
+    low = np.asarray(low, dtype=np.float64)
+    high = np.asarray(high, dtype=np.float64)
+    entry_idx = np.asarray(entry_idx, dtype=np.int64)
+    count = len(entry_idx)
+    ends = np.broadcast_to(len(low) if end is None else np.asarray(end, dtype=np.int64), (count,))
+    ends = np.minimum(ends, len(low))
+    entry_prices, stop_prices, take_prices, trail_distances = [
+        np.broadcast_to(np.asarray(values, dtype=np.float64), (count,))
+        for values in (entry_prices, stop_prices, take_prices, trail_distances)
+    ]
+
+    results = np.full(count, RESULT_OPEN, dtype=object)
+    exit_idx = ends - 1
+    exit_prices = np.full(count, np.nan)
+
+    pos = np.maximum(entry_idx + 1, 0)
+    peak = entry_prices.copy()
+    active = np.flatnonzero(pos < ends)
+    size = max(int(chunk_size), 1)
+
+    while active.size:
+        size = min(size, max(max_window // active.size, 1))
+        bars = pos[active][:, None] + np.arange(size)
+        in_range = bars < ends[active][:, None]
+        bars = np.minimum(bars, len(low) - 1)
+        window_high = high[bars]
+
+        # Stop for each bar trails the highest high BEFORE it (entry price first)
+        prior_peak = np.maximum.accumulate(
+            np.concatenate((peak[active][:, None], window_high[:, :-1]), axis=1), axis=1
+        )
+        stops = np.maximum(stop_prices[active][:, None], prior_peak - trail_distances[active][:, None])
+
+        stop_hit = (low[bars] <= stops) & in_range
+        take_hit = (window_high >= take_prices[active][:, None]) & in_range
+        hit = stop_hit | take_hit
+
+        rows = np.flatnonzero(hit.any(axis=1))
+        offsets = hit[rows].argmax(axis=1)
+        done = active[rows]
+        is_stop = stop_hit[rows, offsets]
+        results[done] = np.where(is_stop, RESULT_SL, RESULT_TP)
+        exit_idx[done] = pos[done] + offsets
+        exit_prices[done] = np.where(is_stop, stops[rows, offsets], take_prices[done])
+
+        # Entries without a hit carry their peak into the next window
+        peak[active] = np.maximum(prior_peak[:, -1], window_high[:, -1])
+        pos[active] += size
+        open_rows = np.ones(len(active), dtype=bool)
+        open_rows[rows] = False
+        active = active[open_rows]
+        active = active[pos[active] < ends[active]]
+        size *= 2
+
+    return results, exit_idx, exit_prices
@@ -0,0 +1,137 @@
+"""
+Local exchange stand-in for Market Scanner Core System.
+
+FakeExchange answers the two ccxt calls the data layer uses (fetch_ohlcv and
+milliseconds) from in-memory candles instead of the network. What it serves is
+bounded by an injectable clock: only candles that have opened by clock time
+are returned, and the last one is still forming, exactly like a live
+exchange. Driving a SimulatedClock forward therefore replays history hour by
+hour, so the daemon and replay tools can be run and tested offline.
+"""
+
+import logging
+import time
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+import ccxt
+from .data_loader import OHLCV_COLUMNS, DEFAULT_PAGE_LIMIT, rows_to_frame
+
+logger = logging.getLogger(__name__)
+
+
+class SystemClock:
+    """Wall clock (milliseconds since epoch) with a blocking sleep."""
+
+    def now_ms(self) -> int:
+        return int(time.time() * 1000)
+
+    def sleep(self, seconds: float) -> None:
+        time.sleep(max(seconds, 0.0))
+
+
+class SimulatedClock:
+    """
+    Manually driven clock: sleep() advances time instantly.
+
+    Usage:
+        clock = SimulatedClock(pd.Timestamp('2025-01-01 00:00'))
+        clock.sleep(3600)  # one hour later, no real waiting
+    """
+
+    def __init__(self, start):
+        """
+        Args:
+            start: Start time as ms since epoch or a naive UTC Timestamp
+        """
+        if isinstance(start, (int, np.integer)):
+            self._now = int(start)
+        else:
+            self._now = int(pd.Timestamp(start).value // 10**6)
+
+    def now_ms(self) -> int:
+        return self._now
+
+    def sleep(self, seconds: float) -> None:
+        self._now += int(round(max(seconds, 0.0) * 1000))
+
+    def advance_to(self, timestamp_ms: int) -> None:
+        """Jump forward to a time (never backwards)."""
+        self._now = max(self._now, int(timestamp_ms))
+
+
+class FakeExchange:
+    """
+    ccxt-compatible candle source backed by local frames and a clock.
+
+    Attributes:
+        calls: Number of fetch_ohlcv calls served (to check REST load in tests)
+    """
+
+    rateLimit = 0
+    enableRateLimit = True
+
+    def __init__(self, frames: Dict[str, pd.DataFrame], clock=None, timeframe: str = '1h'):
+        """
+        Args:
+            frames: Dictionary of {symbol: OHLCV DataFrame indexed by candle open time}
+            clock: Object with now_ms() (default: SystemClock)
+            timeframe: Timeframe of the frames (other timeframes are rejected)
+        """
+        self.clock = clock or SystemClock()
+        self.timeframe = timeframe
+        self.calls = 0
+        self._rows = {symbol: frame_to_rows(df) for symbol, df in frames.items()}
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self._rows)
+
+    def milliseconds(self) -> int:
+        return self.clock.now_ms()
+
+    def fetch_ohlcv(
+        self,
+        symbol: str,
+        timeframe: str = '1h',
+        since: Optional[int] = None,
+        limit: Optional[int] = None,
+        params: Optional[dict] = None
+    ) -> List[List[float]]:
+        """
+        Return candles opened at or before clock time (the last one is forming).
+
+        Args:
+            symbol: Trading pair
+            timeframe: Must match the frames' timeframe
+            since: Optional first open time in ms (default: the latest `limit` candles)
+            limit: Maximum number of candles (default: 1000)
+            params: Ignored (ccxt signature)
+
+        Returns:
+            List of [timestamp_ms, open, high, low, close, volume]
+
+        Raises:
+            ccxt.BadSymbol: Unknown symbol
+            ccxt.BadRequest: Unsupported timeframe
+        """
+        self.calls += 1
+        if symbol not in self._rows:
+            raise ccxt.BadSymbol(f"fake exchange does not have market symbol {symbol}")
+        if timeframe != self.timeframe:
+            raise ccxt.BadRequest(f"fake exchange only serves {self.timeframe} candles, not {timeframe}")
+
+        rows = self._rows[symbol]
+        limit = DEFAULT_PAGE_LIMIT if limit is None else int(limit)
+        end = int(np.searchsorted(rows[:, 0], self.clock.now_ms(), side='right'))
+        if since is None:
+            start = max(end - limit, 0)
+        else:
+            start = int(np.searchsorted(rows[:, 0], since, side='left'))
+        return rows[start:min(end, start + limit)].tolist()
+
+
+def frame_to_rows(df: pd.DataFrame) -> np.ndarray:
+    """Convert an OHLCV DataFrame indexed by open time to (n, 6) float64 rows (timestamp in ms)."""
+    timestamps = df.index.values.astype('datetime64[ms]').astype(np.int64).astype(np.float64)
+    return np.column_stack([timestamps, df[OHLCV_COLUMNS[1:]].to_numpy(dtype=np.float64)])
@@ -0,0 +1,199 @@
+"""
+Local RSS headline store for Market Scanner Core System.
+
+Keeps, per feed, the HTTP validators (ETag / Last-Modified) of the last
+successful download and the headlines it returned, so the next fetch can be a
+conditional GET: an unchanged feed answers 304 Not Modified and its stored
+headlines are reused without downloading or parsing it again.
+
+Every headline ever seen is also appended (once, deduplicated on the
+normalized text) to a timestamped log, so sentiment can be computed as a time
+series instead of one scalar per run.
+
+Layout:
+    <cache_dir>/rss/feeds.json        # {url: {etag, modified, headlines}}
+    <cache_dir>/rss/headlines.jsonl   # one {published, feed, key, title} per line
+"""
+
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import pandas as pd
+from .candle_store import DEFAULT_CACHE_DIR
+from .sentiment_cache import headline_key
+
+logger = logging.getLogger(__name__)
+
+HEADLINE_COLUMNS = ['published', 'feed', 'key', 'title']
+
+
+class HeadlineStore:
+    """
+    Persistent per-feed validators plus an append-only, timestamped headline log.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR):
+        """
+        Args:
+            cache_dir: Root cache directory (default: data/cache)
+        """
+        self.root = Path(cache_dir) / "rss"
+        self.feeds_path = self.root / "feeds.json"
+        self.headlines_path = self.root / "headlines.jsonl"
+        self._lock = threading.Lock()
+        self._feeds: Dict[str, Dict[str, Any]] = self._read_feeds()
+        self._keys = set(self.read_log()[0]['key'])
+        self.stats = {"not_modified": 0, "downloaded": 0}
+
+    def validators(self, url: str) -> Dict[str, Optional[str]]:
+        """
+        Return the stored conditional-GET validators of a feed.
+
+        Returns:
+            Dictionary with etag and modified (None when unknown)
+        """
+        with self._lock:
+            feed = self._feeds.get(url, {})
+            return {"etag": feed.get("etag"), "modified": feed.get("modified")}
+
+    def cached_headlines(self, url: str) -> List[str]:
+        """Return the headlines of the last successful download of a feed."""
+        with self._lock:
+            return list(self._feeds.get(url, {}).get("headlines", []))
+
+    def record_not_modified(self, url: str) -> List[str]:
+        """Count a 304 answer and return the feed's stored headlines."""
+        with self._lock:
+            self.stats["not_modified"] += 1
+        return self.cached_headlines(url)
+
+    def record_download(
+        self,
+        url: str,
+        entries: List[Dict[str, Any]],
+        etag: Optional[str] = None,
+        modified: Optional[str] = None
+    ) -> int:
+        """
+        Store a downloaded feed: its validators, headlines and new log rows.
+
+        Args:
+            url: Feed URL
+            entries: List of {'title': str, 'published': int ms since epoch}
+            etag: ETag response header (if any)
+            modified: Last-Modified response header (if any)
+
+        Returns:
+            Number of headlines not seen before (appended to the log)
+        """
+        with self._lock:
+            self.stats["downloaded"] += 1
+            self._feeds[url] = {
+                "etag": etag,
+                "modified": modified,
+                "headlines": [entry['title'] for entry in entries],
+            }
+
+            rows = []
+            for entry in entries:
+                key = headline_key(entry['title'])
+                if key in self._keys:
+                    continue
+                self._keys.add(key)
+                rows.append({"published": int(entry['published']), "feed": url, "key": key, "title": entry['title']})
+
+            self.root.mkdir(parents=True, exist_ok=True)
+            if rows:
+                with open(self.headlines_path, 'a', encoding='utf-8') as f:
+                    f.writelines(json.dumps(row, ensure_ascii=False) + '\n' for row in rows)
+            self._write_feeds()
+            return len(rows)
+
+    def headlines(self, since: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        """
+        Load the timestamped headline log.
+
+        Args:
+            since: Optional lower bound on the publish time
+
+        Returns:
+            DataFrame with feed, key, title indexed by publish time (sorted);
+            empty DataFrame if nothing stored
+        """
+        with self._lock:
+            df, _ = self.read_log()
+        df.index = pd.to_datetime(df.pop('published'), unit='ms')
+        df.index.name = 'published'
+        df = df.sort_index(kind='stable')
+        return df[df.index >= since] if since is not None else df
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return download counters (not_modified, downloaded) plus stored headline count."""
+        with self._lock:
+            return {**self.stats, "headlines": len(self._keys)}
+
+    def _read_feeds(self) -> Dict[str, Dict[str, Any]]:
+        if not self.feeds_path.exists():
+            return {}
+        try:
+            with open(self.feeds_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable feed state {self.feeds_path}: {e}")
+            return {}
+
+    def _write_feeds(self) -> None:
+        tmp_path = self.feeds_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._feeds, f, ensure_ascii=False)
+        tmp_path.replace(self.feeds_path)
+
+    def read_log(self, offset: int = 0) -> Tuple[pd.DataFrame, int]:
+        """
+        Read log rows appended after a byte offset.
+
+        Only complete lines are consumed, so a torn trailing line from an
+        interrupted append is picked up by a later call once it is whole.
+
+        Args:
+            offset: Byte offset returned by a previous call (0 = whole log)
+
+        Returns:
+            Tuple of (DataFrame with HEADLINE_COLUMNS, offset after the last complete line)
+        """
+        rows = []
+        if self.headlines_path.exists():
+            with open(self.headlines_path, 'rb') as f:
+                f.seek(offset)
+                data = f.read()
+            complete = data[:data.rfind(b'\n') + 1]
+            offset += len(complete)
+            for line in complete.splitlines():
+                try:
+                    rows.append(json.loads(line))
+                except ValueError:
+                    continue
+        return pd.DataFrame(rows, columns=HEADLINE_COLUMNS), offset
+
+
+_stores: Dict[str, HeadlineStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_headline_store(cache_dir: str = DEFAULT_CACHE_DIR) -> HeadlineStore:
+    """
+    Return the shared HeadlineStore for a cache directory (one per process).
+
+    Args:
+        cache_dir: Root cache directory (default: data/cache)
+
+    Returns:
+        HeadlineStore instance
+    """
+    key = str(Path(cache_dir).resolve())
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = HeadlineStore(cache_dir)
+        return _stores[key]
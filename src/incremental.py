@@ -0,0 +1,358 @@
+"""
+Incremental (streaming) indicator engine for Market Scanner Core System.
+
+calculate_indicators() recomputes every indicator over the full history. This
+module keeps the recursive EMA / Wilder smoothing state and the short rolling
+windows instead, so each newly closed candle is folded in with O(1) work and
+the updated indicator row is emitted immediately.
+
+Values reproduce the `ta` library definitions used by analysis.py, including
+its warm-up conventions (ATR/ADX are 0.0 before they are defined, the rest are
+NaN), so a streamed row matches the full recomputation within floating-point
+tolerance when both start from the same first candle. (The boolean crossover
+flags can only differ on exact ties such as K == D, where rounding noise in
+pandas' rolling sums decides the comparison.)
+"""
+
+import logging
+import math
+from collections import deque
+from typing import Dict, Iterable, Optional
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+NAN = float('nan')
+
+# Output columns in the same order calculate_indicators() adds them
+INDICATOR_COLUMNS = [
+    'rsi', 'ema_200', 'atr', 'bb_lower', 'bb_mid', 'bb_upper', 'adx',
+    'macd', 'macd_signal', 'macd_histogram', 'macd_bullish_cross', 'macd_bearish_cross',
+    'stoch_rsi_k', 'stoch_rsi_d', 'stoch_rsi_bullish', 'stoch_rsi_bearish'
+]
+
+
+class _EWM:
+    """pandas ewm(adjust=False).mean() for one series, updated one value at a time."""
+
+    def __init__(self, alpha: float, min_periods: int):
+        self.alpha = alpha
+        self.min_periods = min_periods
+        self.value = NAN
+        self.count = 0
+
+    def update(self, x: float) -> float:
+        if math.isnan(x):
+            # Leading NaNs are skipped; pandas starts the average at the first valid value
+            return self.value if self.count >= self.min_periods else NAN
+        if self.count == 0:
+            self.value = x
+        else:
+            self.value = (1 - self.alpha) * self.value + self.alpha * x
+        self.count += 1
+        return self.value if self.count >= self.min_periods else NAN
+
+
+class _Window:
+    """Fixed-size rolling window that reports NaN until full or while it holds a NaN."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.values = deque(maxlen=size)
+        self.nan_count = 0
+
+    def push(self, x: float) -> None:
+        if len(self.values) == self.size and math.isnan(self.values[0]):
+            self.nan_count -= 1
+        if math.isnan(x):
+            self.nan_count += 1
+        self.values.append(x)
+
+    @property
+    def ready(self) -> bool:
+        return len(self.values) == self.size and self.nan_count == 0
+
+    def mean(self) -> float:
+        return sum(self.values) / self.size if self.ready else NAN
+
+    def std(self) -> float:
+        """Population standard deviation (ddof=0), as used by ta's BollingerBands."""
+        if not self.ready:
+            return NAN
+        mean = sum(self.values) / self.size
+        return math.sqrt(sum((v - mean) ** 2 for v in self.values) / self.size)
+
+    def min(self) -> float:
+        return min(self.values) if self.ready else NAN
+
+    def max(self) -> float:
+        return max(self.values) if self.ready else NAN
+
+
+def _divide(a: float, b: float) -> float:
+    """Float division with pandas semantics (x/0 -> +/-inf, 0/0 -> NaN)."""
+    if b == 0:
+        if a == 0 or math.isnan(a):
+            return NAN
+        return math.copysign(math.inf, a)
+    return a / b
+
+
+class IncrementalIndicators:
+    """
+    Streaming state for RSI, EMA200, ATR, Bollinger, ADX, MACD and StochRSI.
+
+    Usage:
+        state = IncrementalIndicators.from_frame(history_df)  # seed once
+        row = state.update({'open': ..., 'high': ..., 'low': ..., 'close': ..., 'volume': ...})
+    """
+
+    def __init__(self):
+        self.bars = 0
+        self._prev_close = NAN
+        self._prev_high = NAN
+        self._prev_low = NAN
+
+        # RSI (14): Wilder smoothing of gains/losses (ewm alpha=1/14)
+        self._rsi_up = _EWM(1 / 14, 14)
+        self._rsi_down = _EWM(1 / 14, 14)
+
+        # EMA 200 and MACD (12, 26, 9)
+        self._ema_200 = _EWM(2 / 201, 200)
+        self._ema_12 = _EWM(2 / 13, 12)
+        self._ema_26 = _EWM(2 / 27, 26)
+        self._macd_signal = _EWM(2 / 10, 9)
+        self._prev_histogram = NAN
+
+        # ATR (14): mean of the first 14 true ranges, then Wilder recursion
+        self._atr_window = 14
+        self._tr_sum = 0.0
+        self._atr = 0.0
+
+        # Bollinger Bands (20, 2)
+        self._bb = _Window(20)
+
+        # ADX (14): running sums of DM/+DM/-DM, then Wilder recursion of DX
+        self._adx_window = 14
+        self._trs = 0.0
+        self._dip = 0.0
+        self._din = 0.0
+        self._dx_sum = 0.0
+        self._adx = 0.0
+
+        # Stochastic RSI (14, 3, 3)
+        self._rsi_window = _Window(14)
+        self._stoch_k_window = _Window(3)
+        self._stoch_d_window = _Window(3)
+        self._prev_k = NAN
+        self._prev_d = NAN
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "IncrementalIndicators":
+        """
+        Seed the state by streaming every bar of an OHLCV history once.
+
+        Args:
+            df: DataFrame with open, high, low, close, volume columns
+
+        Returns:
+            IncrementalIndicators positioned after the last row of df
+        """
+        state = cls()
+        state.update_many(df)
+        return state
+
+    def update_many(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Stream several bars and return their indicator rows as a DataFrame.
+
+        Args:
+            df: DataFrame with open, high, low, close, volume columns
+
+        Returns:
+            DataFrame indexed like df with INDICATOR_COLUMNS
+        """
+        columns = {col: df[col].to_numpy(dtype=np.float64) for col in ('open', 'high', 'low', 'close', 'volume')}
+        rows = [
+            self.update({col: values[i] for col, values in columns.items()})
+            for i in range(len(df))
+        ]
+        return pd.DataFrame(rows, index=df.index, columns=INDICATOR_COLUMNS)
+
+    def update(self, bar: Dict[str, float]) -> Dict[str, float]:
+        """
+        Fold one newly closed candle into the state.
+
+        Args:
+            bar: Mapping with open, high, low, close (volume optional)
+
+        Returns:
+            Dictionary of the bar's indicator values (INDICATOR_COLUMNS)
+        """
+        high = float(bar['high'])
+        low = float(bar['low'])
+        close = float(bar['close'])
+        i = self.bars
+
+        row = {}
+        row['rsi'] = self._update_rsi(close, i)
+        row['ema_200'] = self._ema_200.update(close)
+        row['atr'] = self._update_atr(high, low, close, i)
+
+        self._bb.push(close)
+        bb_mid = self._bb.mean()
+        bb_std = self._bb.std()
+        row['bb_lower'] = bb_mid - 2 * bb_std
+        row['bb_mid'] = bb_mid
+        row['bb_upper'] = bb_mid + 2 * bb_std
+
+        row['adx'] = self._update_adx(high, low, close, i)
+        row.update(self._update_macd(close))
+        row.update(self._update_stoch_rsi(row['rsi']))
+
+        self._prev_close = close
+        self._prev_high = high
+        self._prev_low = low
+        self.bars += 1
+        return row
+
+    def _update_rsi(self, close: float, i: int) -> float:
+        diff = close - self._prev_close if i > 0 else NAN
+        up = diff if diff > 0 else 0.0
+        down = -diff if diff < 0 else 0.0
+        avg_up = self._rsi_up.update(up)
+        avg_down = self._rsi_down.update(down)
+        if math.isnan(avg_down):
+            return NAN
+        if avg_down == 0:
+            return 100.0
+        return 100 - (100 / (1 + avg_up / avg_down))
+
+    def _update_atr(self, high: float, low: float, close: float, i: int) -> float:
+        window = self._atr_window
+        if i == 0:
+            true_range = high - low
+        else:
+            true_range = max(high - low, abs(high - self._prev_close), abs(low - self._prev_close))
+
+        if i < window:
+            self._tr_sum += true_range
+            if i == window - 1:
+                self._atr = self._tr_sum / window
+            return self._atr if i == window - 1 else 0.0
+
+        self._atr = (self._atr * (window - 1) + true_range) / float(window)
+        return self._atr
+
+    def _update_adx(self, high: float, low: float, close: float, i: int) -> float:
+        window = self._adx_window
+        if i == 0:
+            return 0.0
+
+        directional_movement = max(high, self._prev_close) - min(low, self._prev_close)
+        diff_up = high - self._prev_high
+        diff_down = self._prev_low - low
+        pos = diff_up if (diff_up > diff_down and diff_up > 0) else 0.0
+        neg = diff_down if (diff_down > diff_up and diff_down > 0) else 0.0
+
+        if i <= window:
+            # ta seeds the smoothed sums with the first `window` valid values
+            self._trs += directional_movement
+            self._dip += pos
+            self._din += neg
+            if i < window:
+                return 0.0
+        else:
+            self._trs = self._trs - self._trs / float(window) + directional_movement
+            self._dip = self._dip - self._dip / float(window) + pos
+            self._din = self._din - self._din / float(window) + neg
+
+        if self._trs != 0:
+            dip = 100 * (self._dip / self._trs)
+            din = 100 * (self._din / self._trs)
+        else:
+            dip = din = 0.0
+        dx = 100 * abs((dip - din) / (dip + din)) if dip + din != 0 else 0.0
+
+        # DX is defined from bar `window`; ADX starts as the mean of the first `window` DX values
+        if i < 2 * window - 1:
+            self._dx_sum += dx
+            return 0.0
+        if i == 2 * window - 1:
+            self._adx = (self._dx_sum + dx) / window
+            return self._adx
+
+        self._adx = ((self._adx * (window - 1)) + dx) / float(window)
+        return self._adx
+
+    def _update_macd(self, close: float) -> Dict[str, float]:
+        ema_fast = self._ema_12.update(close)
+        ema_slow = self._ema_26.update(close)
+        macd = ema_fast - ema_slow
+        signal = self._macd_signal.update(macd)
+        histogram = macd - signal
+
+        prev = self._prev_histogram
+        self._prev_histogram = histogram
+        return {
+            'macd': macd,
+            'macd_signal': signal,
+            'macd_histogram': histogram,
+            'macd_bullish_cross': bool(histogram > 0 and prev <= 0),
+            'macd_bearish_cross': bool(histogram < 0 and prev >= 0),
+        }
+
+    def _update_stoch_rsi(self, rsi: float) -> Dict[str, float]:
+        self._rsi_window.push(rsi)
+        lowest = self._rsi_window.min()
+        stoch_rsi = _divide(rsi - lowest, self._rsi_window.max() - lowest)
+
+        self._stoch_k_window.push(stoch_rsi)
+        k = self._stoch_k_window.mean()
+        self._stoch_d_window.push(k)
+        d = self._stoch_d_window.mean()
+        k *= 100
+        d *= 100
+
+        prev_k, prev_d = self._prev_k, self._prev_d
+        self._prev_k, self._prev_d = k, d
+        return {
+            'stoch_rsi_k': k,
+            'stoch_rsi_d': d,
+            'stoch_rsi_bullish': bool(k > d and prev_k <= prev_d and k < 20),
+            'stoch_rsi_bearish': bool(k < d and prev_k >= prev_d and k > 80),
+        }
+
+
+def max_abs_difference(
+    streamed: pd.DataFrame,
+    full: pd.DataFrame,
+    columns: Optional[Iterable[str]] = None
+) -> Dict[str, float]:
+    """
+    Compare streamed indicator rows with a full recomputation.
+
+    Args:
+        streamed: Output of IncrementalIndicators.update_many
+        full: Output of calculate_indicators over the same bars
+        columns: Columns to compare (default: INDICATOR_COLUMNS present in both)
+
+    Returns:
+        Dictionary of {column: max absolute difference} (NaN positions must match,
+        otherwise the difference is reported as inf)
+    """
+    columns = [c for c in (columns or INDICATOR_COLUMNS) if c in streamed.columns and c in full.columns]
+    diffs = {}
+    for col in columns:
+        a = streamed[col].to_numpy(dtype=np.float64)
+        b = full[col].to_numpy(dtype=np.float64)
+        both_nan = np.isnan(a) & np.isnan(b)
+        if not np.array_equal(np.isnan(a), np.isnan(b)):
+            diffs[col] = math.inf
+            continue
+        with np.errstate(invalid='ignore'):
+            delta = np.abs(np.where(both_nan, 0.0, a - b))
+        finite = np.isfinite(a) | both_nan
+        diffs[col] = float(delta[finite].max()) if finite.any() else 0.0
+    return diffs
@@ -0,0 +1,346 @@
+"""
+Streaming candle ingestion for Market Scanner Core System.
+
+Instead of polling fetch_ohlcv for every symbol, closed candles can arrive as
+Binance kline stream events (wss://stream.binance.com, `<symbol>@kline_<tf>`).
+KlineStream keeps one fixed-size ring buffer of closed candles per symbol and
+reports each symbol as its candle closes, so the scanner can fold the bar in
+and re-evaluate immediately (see ScannerDaemon.run_stream).
+
+Only final klines (`"x": true`) are used; in-progress updates are skipped.
+Events are accepted raw or wrapped by the combined stream endpoint
+({"stream": ..., "data": {...}}), as dicts or JSON text.
+
+Sources are plain iterables of events:
+- BinanceKlineSource: live combined stream (needs the `websockets` package)
+- ReplaySource: JSON-lines file of recorded events, replayed at any speed
+  multiple of real time (write_replay_file builds one from OHLCV frames)
+"""
+
+import json
+import logging
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
+import numpy as np
+import pandas as pd
+from .data_loader import OHLCV_COLUMNS, rows_to_frame, timeframe_to_ms
+
+logger = logging.getLogger(__name__)
+
+BINANCE_STREAM_URL = 'wss://stream.binance.com:9443/stream'
+
+# Closed candles kept per symbol (more than enough to bridge a slow consumer)
+DEFAULT_BUFFER_SIZE = 1000
+
+
+def stream_symbol(symbol: str) -> str:
+    """Return the exchange id of a ccxt symbol as used in kline events (BTC/USDT -> BTCUSDT)."""
+    return symbol.replace('/', '').upper()
+
+
+def stream_name(symbol: str, timeframe: str = '1h') -> str:
+    """Return the Binance stream name of a symbol's klines (e.g. btcusdt@kline_1h)."""
+    return f"{stream_symbol(symbol).lower()}@kline_{timeframe}"
+
+
+def parse_kline_event(event: Union[str, bytes, Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Decode a kline event.
+
+    Args:
+        event: Raw or combined-stream event (dict or JSON text)
+
+    Returns:
+        Dictionary with symbol (exchange id), interval, closed, event_time
+        and row ([open_time_ms, open, high, low, close, volume] as floats);
+        None if the event is not a kline
+    """
+    if isinstance(event, (str, bytes)):
+        event = json.loads(event)
+    if 'data' in event and 'stream' in event:
+        event = event['data']
+    kline = event.get('k') if event.get('e') == 'kline' else None
+    if kline is None:
+        return None
+
+    return {
+        "symbol": kline['s'],
+        "interval": kline['i'],
+        "closed": bool(kline['x']),
+        "event_time": int(event.get('E', kline['T'])),
+        "row": [float(kline['t']), float(kline['o']), float(kline['h']),
+                float(kline['l']), float(kline['c']), float(kline['v'])],
+    }
+
+
+class KlineRingBuffer:
+    """
+    Fixed-capacity buffer of closed candles, oldest overwritten first.
+
+    Rows are (timestamp_ms, open, high, low, close, volume) float64, in
+    timestamp order; a candle not newer than the last one held is ignored
+    (replayed or duplicated events after a reconnect).
+    """
+
+    def __init__(self, capacity: int = DEFAULT_BUFFER_SIZE):
+        """
+        Args:
+            capacity: Number of candles kept
+        """
+        self.capacity = capacity
+        self._rows = np.empty((capacity, len(OHLCV_COLUMNS)), dtype=np.float64)
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def last_timestamp(self) -> Optional[int]:
+        """Open time (ms) of the newest candle held, or None."""
+        return int(self._rows[(self._next - 1) % self.capacity, 0]) if self._count else None
+
+    def push(self, row: Iterable[float]) -> bool:
+        """
+        Add a closed candle.
+
+        Returns:
+            True if stored, False if it is not newer than the last candle
+        """
+        row = np.asarray(row, dtype=np.float64)
+        if self._count and row[0] <= self._rows[(self._next - 1) % self.capacity, 0]:
+            return False
+        self._rows[self._next] = row
+        self._next = (self._next + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+        return True
+
+    def since(self, timestamp_ms: Optional[int] = None) -> np.ndarray:
+        """
+        Return the candles opened after a time, oldest first (copy).
+
+        Walks back from the newest candle, so the cost is proportional to the
+        number of rows returned, not to the capacity.
+
+        Args:
+            timestamp_ms: Exclusive lower bound (default: every candle held)
+
+        Returns:
+            (n, 6) float64 array
+        """
+        n = self._count
+        if timestamp_ms is not None:
+            n = 0
+            while n < self._count and self._rows[(self._next - 1 - n) % self.capacity, 0] > timestamp_ms:
+                n += 1
+        positions = (self._next - n + np.arange(n)) % self.capacity
+        return self._rows[positions]
+
+    def to_frame(self) -> pd.DataFrame:
+        """Return the candles held as an OHLCV DataFrame indexed by open time."""
+        return rows_to_frame(self.since())
+
+
+class KlineStream:
+    """
+    Routes closed kline events of subscribed symbols into per-symbol ring buffers.
+
+    Usage:
+        stream = KlineStream(['BTC/USDT', 'ETH/USDT'])
+        for symbol in stream.consume(ReplaySource('klines.jsonl')):
+            rows = stream.buffers[symbol].since(last_seen_ms)
+    """
+
+    def __init__(self, symbols: Iterable[str], timeframe: str = '1h', capacity: int = DEFAULT_BUFFER_SIZE):
+        """
+        Args:
+            symbols: ccxt symbols to accept (e.g. 'BTC/USDT')
+            timeframe: Kline interval to accept (default: 1h)
+            capacity: Ring buffer size per symbol
+        """
+        self.symbols = list(symbols)
+        self.timeframe = timeframe
+        self.buffers: Dict[str, KlineRingBuffer] = {symbol: KlineRingBuffer(capacity) for symbol in self.symbols}
+        self._by_id = {stream_symbol(symbol): symbol for symbol in self.symbols}
+        self.stats = {"events": 0, "closed": 0, "stored": 0}
+
+    def process(self, event) -> Optional[str]:
+        """
+        Handle one event.
+
+        Returns:
+            The ccxt symbol whose buffer received a new closed candle, else None
+            (in-progress kline, other symbol / interval, duplicate, non-kline)
+        """
+        self.stats["events"] += 1
+        kline = parse_kline_event(event)
+        if kline is None or not kline['closed'] or kline['interval'] != self.timeframe:
+            return None
+        self.stats["closed"] += 1
+
+        symbol = self._by_id.get(kline['symbol'])
+        if symbol is None or not self.buffers[symbol].push(kline['row']):
+            return None
+        self.stats["stored"] += 1
+        return symbol
+
+    def consume(self, source: Iterable, max_events: Optional[int] = None) -> Iterator[str]:
+        """
+        Read events from a source and yield each symbol as its candle closes.
+
+        Args:
+            source: Iterable of events (BinanceKlineSource, ReplaySource, list...)
+            max_events: Stop after this many events (default: until the source ends)
+
+        Yields:
+            ccxt symbol with a new closed candle in its buffer
+        """
+        for count, event in enumerate(source, 1):
+            try:
+                symbol = self.process(event)
+            except (ValueError, KeyError, TypeError) as e:
+                logger.warning(f"Skipping malformed kline event: {e}")
+                symbol = None
+            if symbol is not None:
+                yield symbol
+            if max_events is not None and count >= max_events:
+                return
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return counters: events read, closed klines, candles stored."""
+        return dict(self.stats)
+
+
+class ReplaySource:
+    """
+    Recorded kline events (one JSON object per line) replayed in event-time order.
+
+    With speed=None events are emitted as fast as they can be read; with
+    speed=S the gaps between event times are slept through S times faster
+    than real time (speed=3600 replays one hour of candles per second).
+    """
+
+    def __init__(
+        self,
+        path: str,
+        speed: Optional[float] = None,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        """
+        Args:
+            path: JSON-lines file of kline events (see write_replay_file)
+            speed: Real-time multiple (default: no pacing)
+            sleep: Sleep function (injectable for tests)
+        """
+        self.path = path
+        self.speed = speed
+        self.sleep = sleep
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        previous = None
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                event = json.loads(line)
+                if self.speed:
+                    event_time = int(event.get('data', event).get('E', 0))
+                    if previous is not None and event_time > previous:
+                        self.sleep((event_time - previous) / 1000 / self.speed)
+                    previous = event_time
+                yield event
+
+
+class BinanceKlineSource:
+    """
+    Live kline events from the Binance combined stream, reconnecting on drops.
+
+    Binance closes every connection after 24h and events are lost while
+    disconnected; consumers fill such gaps over REST (ScannerDaemon.ingest).
+    """
+
+    def __init__(
+        self,
+        symbols: Iterable[str],
+        timeframe: str = '1h',
+        url: str = BINANCE_STREAM_URL,
+        reconnect_delay: float = 5.0
+    ):
+        """
+        Args:
+            symbols: ccxt symbols to subscribe to
+            timeframe: Kline interval (default: 1h)
+            url: Combined stream endpoint
+            reconnect_delay: Seconds to wait before reconnecting
+        """
+        streams = '/'.join(stream_name(symbol, timeframe) for symbol in symbols)
+        self.url = f"{url}?streams={streams}"
+        self.reconnect_delay = reconnect_delay
+
+    def __iter__(self) -> Iterator[str]:
+        try:
+            from websockets.sync.client import connect
+            from websockets.exceptions import WebSocketException
+        except ImportError as e:
+            raise ImportError("Live kline streaming requires the 'websockets' package (pip install websockets)") from e
+
+        while True:
+            try:
+                with connect(self.url) as websocket:
+                    logger.info(f"✓ Connected to kline stream {self.url}")
+                    for message in websocket:
+                        yield message
+            except (OSError, WebSocketException) as e:
+                logger.warning(f"Kline stream disconnected: {e}")
+            time.sleep(self.reconnect_delay)
+
+
+def kline_event(symbol: str, row: Iterable[float], timeframe: str = '1h', closed: bool = True) -> Dict[str, Any]:
+    """
+    Build a Binance kline event for one candle.
+
+    Args:
+        symbol: ccxt symbol
+        row: [open_time_ms, open, high, low, close, volume]
+        timeframe: Kline interval
+        closed: Whether the kline is final
+
+    Returns:
+        Event dictionary in the Binance stream format (event time = close time)
+    """
+    open_time, open_, high, low, close, volume = row
+    close_time = int(open_time) + timeframe_to_ms(timeframe) - 1
+    return {
+        "e": "kline",
+        "E": close_time + 1 if closed else int(open_time),
+        "s": stream_symbol(symbol),
+        "k": {
+            "t": int(open_time), "T": close_time, "s": stream_symbol(symbol), "i": timeframe,
+            "o": repr(float(open_)), "h": repr(float(high)), "l": repr(float(low)),
+            "c": repr(float(close)), "v": repr(float(volume)), "x": closed,
+        },
+    }
+
+
+def write_replay_file(path: str, frames: Dict[str, pd.DataFrame], timeframe: str = '1h') -> int:
+    """
+    Record OHLCV frames as a replayable kline event file (event-time order).
+
+    Args:
+        path: Output JSON-lines file
+        frames: Dictionary of {ccxt symbol: OHLCV DataFrame indexed by open time}
+        timeframe: Timeframe of the frames
+
+    Returns:
+        Number of events written
+    """
+    events: List[Dict[str, Any]] = []
+    for symbol, df in frames.items():
+        timestamps = df.index.values.astype('datetime64[ms]').astype(np.int64)
+        values = df[OHLCV_COLUMNS[1:]].to_numpy(dtype=np.float64)
+        events.extend(kline_event(symbol, [t, *v], timeframe) for t, v in zip(timestamps, values))
+    events.sort(key=lambda event: (event['E'], event['s']))
+
+    with open(path, 'w', encoding='utf-8') as f:
+        f.writelines(json.dumps(event, separators=(',', ':')) + '\n' for event in events)
+    return len(events)
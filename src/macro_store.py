@@ -0,0 +1,263 @@
+"""
+Shared macro data store for Market Scanner Core System.
+
+Gold, DXY and S&P 500 daily bars change at most once per trading day and not
+at all on weekends. Bars are kept in the local CandleStore (timeframe '1d')
+and each ticker is refreshed only once a new session of its market has closed
+since the last check; stale tickers are refreshed together with ONE batched
+yf.download call. Loaded series stay in memory, so every consumer in the
+process (scanner, analysis tools) shares them without touching disk or network.
+
+Daily bars are indexed at their session close (naive UTC, e.g. 21:00 for a
+16:00 New York close in winter) rather than at midnight of the session date,
+so an as-of merge onto hourly crypto candles only sees a close once it exists.
+
+Market holidays are not modelled: on a holiday the expected session is
+checked once (one small request that returns no new bar) and then skipped.
+
+Layout:
+    <cache_dir>/ohlcv/GC=F_1d.bin     # CandleStore rows
+    <cache_dir>/macro/refresh.json    # {ticker: {session, days}} last checks
+"""
+
+import json
+import logging
+import threading
+from datetime import time as dt_time
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+import numpy as np
+import pandas as pd
+import yfinance as yf
+from .candle_store import CandleStore, get_candle_store, DEFAULT_CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+MACRO_TIMEFRAME = '1d'
+
+# Exchange timezone and daily session close per ticker (Mon-Fri sessions)
+MARKET_CALENDARS = {
+    'GC=F': ('America/New_York', dt_time(17, 0)),      # COMEX gold futures (CME Globex daily close)
+    'DX-Y.NYB': ('America/New_York', dt_time(17, 0)),  # ICE US Dollar Index
+    '^GSPC': ('America/New_York', dt_time(16, 0)),     # NYSE cash close
+}
+DEFAULT_CALENDAR = ('America/New_York', dt_time(17, 0))
+
+
+def session_close(session_date: pd.Timestamp, ticker: str) -> pd.Timestamp:
+    """
+    Return the close time of a ticker's session as naive UTC.
+
+    Args:
+        session_date: Session (trade) date
+        ticker: Yahoo Finance symbol (calendar from MARKET_CALENDARS)
+
+    Returns:
+        Naive UTC Timestamp of the session close
+    """
+    tz, close = MARKET_CALENDARS.get(ticker, DEFAULT_CALENDAR)
+    local = pd.Timestamp.combine(pd.Timestamp(session_date).date(), close)
+    return pd.Timestamp(local).tz_localize(tz).tz_convert('UTC').tz_localize(None)
+
+
+def last_session_close(ticker: str, now: Optional[pd.Timestamp] = None) -> pd.Timestamp:
+    """
+    Return the close of the most recent weekday session that has ended.
+
+    Args:
+        ticker: Yahoo Finance symbol
+        now: Current time as naive UTC (default: now)
+
+    Returns:
+        Naive UTC Timestamp of the last expected session close at or before now
+    """
+    now = pd.Timestamp.now(tz='UTC').tz_localize(None) if now is None else pd.Timestamp(now)
+    tz, _ = MARKET_CALENDARS.get(ticker, DEFAULT_CALENDAR)
+    today = now.tz_localize('UTC').tz_convert(tz).normalize().tz_localize(None)
+
+    for days_back in range(8):
+        day = today - pd.Timedelta(days=days_back)
+        if day.weekday() < 5:
+            close = session_close(day, ticker)
+            if close <= now:
+                return close
+    raise ValueError(f"No session close found before {now} for {ticker}")
+
+
+class MacroStore:
+    """
+    Calendar-aware, batched macro series cache with hit/refresh counters.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, candle_store: Optional[CandleStore] = None):
+        """
+        Args:
+            cache_dir: Root cache directory (default: data/cache)
+            candle_store: CandleStore holding the bars (default: shared store of cache_dir)
+        """
+        self.candles = candle_store or get_candle_store(cache_dir)
+        self.state_path = Path(cache_dir) / "macro" / "refresh.json"
+        self._lock = threading.Lock()
+        self._checked: Dict[str, Dict[str, int]] = self._read_state()
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self.stats = {"hits": 0, "refreshes": 0, "downloads": 0}
+
+    def get(
+        self,
+        tickers: Iterable[str],
+        days: int = 180,
+        now: Optional[pd.Timestamp] = None
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Return daily bars for several tickers, refreshing only stale ones.
+
+        A ticker is stale when a session of its market has closed since it was
+        last checked, or when more history is requested than was last fetched.
+        All stale tickers are downloaded with one yf.download call.
+
+        Args:
+            tickers: Yahoo Finance symbols (e.g. 'GC=F', 'DX-Y.NYB', '^GSPC')
+            days: Days of history (default: 180)
+            now: Current time as naive UTC (default: now; injectable for tests)
+
+        Returns:
+            Dictionary of {ticker: DataFrame with open, high, low, close, volume
+            indexed by session close}; empty DataFrame for a ticker without data
+        """
+        tickers = list(dict.fromkeys(tickers))
+        now = pd.Timestamp.now(tz='UTC').tz_localize(None) if now is None else pd.Timestamp(now)
+
+        with self._lock:
+            expected = {ticker: int(last_session_close(ticker, now).value // 10**6) for ticker in tickers}
+            stale = [ticker for ticker in tickers if self._is_stale(ticker, expected[ticker], days)]
+            self.stats["hits"] += len(tickers) - len(stale)
+
+            if stale:
+                self.stats["refreshes"] += len(stale)
+                self.stats["downloads"] += 1
+                logger.info(f"Refreshing macro data for {', '.join(stale)} (one batched download)")
+                downloaded = download_macro_data(stale, days)
+                for ticker in stale:
+                    if self._store(ticker, downloaded.get(ticker), now):
+                        # A failed ticker stays stale and is retried on the next call
+                        self._checked[ticker] = {"session": expected[ticker], "days": days}
+                self._write_state()
+            else:
+                logger.info(f"✓ Macro data up to date for {', '.join(tickers)} (no new session closed)")
+
+            start = now - pd.Timedelta(days=days)
+            return {ticker: self._frame(ticker).loc[start:] for ticker in tickers}
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return counters: hits (served without network), refreshes (tickers refreshed), downloads."""
+        with self._lock:
+            return dict(self.stats)
+
+    def _is_stale(self, ticker: str, expected_session: int, days: int) -> bool:
+        checked = self._checked.get(ticker)
+        return checked is None or checked["session"] < expected_session or checked["days"] < days
+
+    def _frame(self, ticker: str) -> pd.DataFrame:
+        """In-memory frame of a ticker (loaded from the candle store on first use)."""
+        from .data_loader import rows_to_frame  # data_loader imports this module
+
+        if ticker not in self._frames:
+            rows = np.asarray(self.candles.load(ticker, MACRO_TIMEFRAME))
+            self._frames[ticker] = rows_to_frame(rows)
+        return self._frames[ticker]
+
+    def _store(self, ticker: str, df: Optional[pd.DataFrame], now: pd.Timestamp) -> bool:
+        """Merge downloaded CLOSED sessions into the candle store and memory (False if none)."""
+        from .data_loader import rows_to_frame  # data_loader imports this module
+
+        if df is None or df.empty:
+            logger.warning(f"No macro data returned for {ticker}")
+            return False
+
+        df = df[df.index <= now]  # drop a session still in progress
+        rows = np.column_stack([
+            df.index.values.astype('datetime64[ms]').astype(np.int64).astype(np.float64),
+            df[['open', 'high', 'low', 'close', 'volume']].to_numpy(dtype=np.float64)
+        ])
+
+        existing = np.asarray(self.candles.load(ticker, MACRO_TIMEFRAME))
+        if len(existing):
+            # Downloaded rows win (yfinance may revise recent closes)
+            rows = np.concatenate([existing[existing[:, 0] < rows[0, 0]], rows]) if len(rows) else existing
+        self.candles.write(ticker, MACRO_TIMEFRAME, rows)
+        self._frames[ticker] = rows_to_frame(rows)
+        return True
+
+    def _read_state(self) -> Dict[str, Dict[str, int]]:
+        if not self.state_path.exists():
+            return {}
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable macro refresh state {self.state_path}: {e}")
+            return {}
+
+    def _write_state(self) -> None:
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._checked, f)
+        tmp_path.replace(self.state_path)
+
+
+def download_macro_data(tickers: Iterable[str], days: int = 180) -> Dict[str, pd.DataFrame]:
+    """
+    Download daily bars for several tickers with one yf.download call.
+
+    Args:
+        tickers: Yahoo Finance symbols
+        days: Days of history
+
+    Returns:
+        Dictionary of {ticker: DataFrame with open, high, low, close, volume
+        indexed by session close (naive UTC)}; tickers without data are omitted
+    """
+    tickers = list(tickers)
+    raw = yf.download(
+        tickers, period=f"{days}d", interval='1d', group_by='ticker',
+        auto_adjust=True, progress=False, threads=True
+    )
+    if raw is None or raw.empty:
+        return {}
+
+    frames = {}
+    for ticker in tickers:
+        if isinstance(raw.columns, pd.MultiIndex):
+            if ticker not in raw.columns.get_level_values(0):
+                continue
+            df = raw[ticker]
+        else:
+            df = raw
+        df = df.rename(columns=str.lower)[['open', 'high', 'low', 'close', 'volume']].dropna(subset=['close'])
+        if df.empty:
+            continue
+        df.index = pd.DatetimeIndex([session_close(day, ticker) for day in df.index], name='timestamp')
+        frames[ticker] = df
+    return frames
+
+
+_stores: Dict[str, MacroStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_macro_store(cache_dir: str = DEFAULT_CACHE_DIR) -> MacroStore:
+    """
+    Return the shared MacroStore for a cache directory (one per process).
+
+    Args:
+        cache_dir: Root cache directory (default: data/cache)
+
+    Returns:
+        MacroStore instance
+    """
+    key = str(Path(cache_dir).resolve())
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = MacroStore(cache_dir)
+        return _stores[key]
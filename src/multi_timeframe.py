@@ -0,0 +1,286 @@
+"""
+Multi-timeframe (1H + 4H + 1D) layer for Market Scanner Core System.
+
+Only 1h candles are fetched (and cached). 4h and 1d bars are derived locally
+by resampling that frame, indicators are computed per timeframe, and the
+higher-timeframe values are aligned back onto the 1h index with an as-of join.
+
+No lookahead: a higher-timeframe bar only becomes visible on the 1h bar that
+closes it (the bar opening at bin_start + timeframe - 1h). A still-forming 4h
+or 1d bar is never used, so backtests over the aligned columns see exactly
+what the live scanner would have seen at each hour.
+
+Higher-timeframe indicators use the streaming IncrementalIndicators state, so
+MultiTimeframeState.update() folds a newly closed 1h candle into the forming
+4h/1d bar in O(1) and recomputes only the higher-timeframe bar it closes.
+Columns are named {column}_{timeframe}, e.g. rsi_4h, ema_200_1d (FR-003).
+"""
+
+import logging
+from typing import Dict, Optional, Sequence
+import numpy as np
+import pandas as pd
+from .data_loader import timeframe_to_timedelta
+from .incremental import IncrementalIndicators
+
+logger = logging.getLogger(__name__)
+
+BASE_TIMEFRAME = '1h'
+HIGHER_TIMEFRAMES = ('4h', '1d')
+
+# Higher-timeframe columns aligned onto the base frame (trend, momentum, levels)
+DEFAULT_MTF_COLUMNS = [
+    'close', 'rsi', 'ema_200', 'atr', 'bb_lower', 'bb_mid', 'bb_upper', 'adx',
+    'macd_histogram', 'stoch_rsi_k', 'stoch_rsi_d'
+]
+
+OHLCV_AGG = {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'}
+
+
+def mtf_column_name(column: str, timeframe: str) -> str:
+    """Return the aligned column name for a higher-timeframe value (e.g. rsi_4h)."""
+    return f"{column}_{timeframe}"
+
+
+def resample_ohlcv(
+    df: pd.DataFrame,
+    timeframe: str,
+    base_timeframe: str = BASE_TIMEFRAME
+) -> pd.DataFrame:
+    """
+    Resample base candles into CLOSED higher-timeframe OHLCV bars.
+
+    Bins are aligned to midnight UTC (like exchange 4h/1d candles) and labelled
+    by their open time. The trailing bin is dropped while it is still forming.
+
+    Args:
+        df: Base OHLCV DataFrame with a DatetimeIndex of candle open times
+        timeframe: Target timeframe (e.g. '4h', '1d')
+        base_timeframe: Timeframe of df (default: 1h)
+
+    Returns:
+        DataFrame with open, high, low, close, volume per closed bin
+    """
+    freq = timeframe_to_timedelta(timeframe)
+    base = timeframe_to_timedelta(base_timeframe)
+    if df.empty:
+        return pd.DataFrame(columns=list(OHLCV_AGG))
+
+    bars = df[list(OHLCV_AGG)].resample(freq, label='left', closed='left').agg(OHLCV_AGG)
+    bars = bars.dropna(subset=['close'])  # bins inside data gaps
+
+    closed = bars.index + freq <= df.index[-1] + base
+    return bars[closed]
+
+
+def higher_timeframe_indicators(bars: pd.DataFrame) -> pd.DataFrame:
+    """
+    Calculate indicators on resampled bars.
+
+    Uses the streaming engine (identical values to calculate_indicators), which
+    also handles short histories: 180 days give only 180 daily bars, below the
+    200-row minimum of calculate_indicators, so ema_200_1d is simply NaN there.
+
+    Args:
+        bars: Output of resample_ohlcv
+
+    Returns:
+        bars with INDICATOR_COLUMNS added
+    """
+    indicators = IncrementalIndicators().update_many(bars)
+    return bars.join(indicators)
+
+
+def align_higher_timeframe(
+    df: pd.DataFrame,
+    htf: pd.DataFrame,
+    timeframe: str,
+    columns: Optional[Sequence[str]] = None,
+    base_timeframe: str = BASE_TIMEFRAME
+) -> pd.DataFrame:
+    """
+    As-of join higher-timeframe values onto the base index without lookahead.
+
+    Each higher-timeframe row becomes available on the base bar that closes
+    its bin (bin_start + timeframe - base_timeframe) and stays in effect until
+    the next bin closes.
+
+    Args:
+        df: Base DataFrame (DatetimeIndex, sorted)
+        htf: Higher-timeframe bars with indicators (higher_timeframe_indicators)
+        timeframe: Timeframe of htf (used for the availability time and suffix)
+        columns: Columns of htf to align (default: DEFAULT_MTF_COLUMNS present)
+        base_timeframe: Timeframe of df (default: 1h)
+
+    Returns:
+        df with added {column}_{timeframe} columns (NaN before the first closed bin)
+    """
+    columns = [c for c in (columns or DEFAULT_MTF_COLUMNS) if c in htf.columns]
+    available = htf[columns].rename(columns={c: mtf_column_name(c, timeframe) for c in columns})
+    available.index = htf.index + timeframe_to_timedelta(timeframe) - timeframe_to_timedelta(base_timeframe)
+
+    return pd.merge_asof(
+        df,
+        available,
+        left_index=True,
+        right_index=True,
+        direction='backward'  # Most recent CLOSED higher-timeframe bar
+    )
+
+
+def add_timeframe_features(
+    df: pd.DataFrame,
+    timeframes: Sequence[str] = HIGHER_TIMEFRAMES,
+    columns: Optional[Sequence[str]] = None,
+    base_timeframe: str = BASE_TIMEFRAME
+) -> pd.DataFrame:
+    """
+    Resample, compute and align every higher timeframe onto a base frame.
+
+    Args:
+        df: Base OHLCV DataFrame (indicators optional)
+        timeframes: Higher timeframes to derive (default: 4h, 1d)
+        columns: Higher-timeframe columns to align (default: DEFAULT_MTF_COLUMNS)
+        base_timeframe: Timeframe of df (default: 1h)
+
+    Returns:
+        DataFrame with added columns like rsi_4h, ema_200_1d, adx_4h.
+        Returns original DataFrame on error.
+    """
+    try:
+        result = df
+        for timeframe in timeframes:
+            bars = resample_ohlcv(df, timeframe, base_timeframe)
+            if len(bars) < 200:
+                logger.warning(f"Only {len(bars)} closed {timeframe} bars: {timeframe} EMA200 not available yet")
+            htf = higher_timeframe_indicators(bars)
+            result = align_higher_timeframe(result, htf, timeframe, columns, base_timeframe)
+        return result
+
+    except Exception as e:
+        logger.error(f"Error adding multi-timeframe features: {e}")
+        return df
+
+
+class MultiTimeframeState:
+    """
+    Streaming higher-timeframe state fed by closed base candles.
+
+    Keeps, per higher timeframe, the forming bar's OHLCV aggregate and the
+    IncrementalIndicators state of the closed bars. A new base candle updates
+    the forming aggregate; only when it closes a bin is that one bar folded
+    into the indicator state. Emitted values match add_timeframe_features()
+    on the same history.
+
+    Usage:
+        state = MultiTimeframeState.from_frame(history_df)  # seed once
+        values = state.update(timestamp, {'open': ..., 'high': ..., 'low': ..., 'close': ..., 'volume': ...})
+    """
+
+    def __init__(
+        self,
+        timeframes: Sequence[str] = HIGHER_TIMEFRAMES,
+        columns: Optional[Sequence[str]] = None,
+        base_timeframe: str = BASE_TIMEFRAME
+    ):
+        self.timeframes = list(timeframes)
+        self.columns = list(columns or DEFAULT_MTF_COLUMNS)
+        self.base = timeframe_to_timedelta(base_timeframe)
+        self._freq = {tf: timeframe_to_timedelta(tf) for tf in self.timeframes}
+        self._indicators = {tf: IncrementalIndicators() for tf in self.timeframes}
+        self._forming: Dict[str, Optional[Dict[str, float]]] = {tf: None for tf in self.timeframes}
+        self._bin_start: Dict[str, Optional[pd.Timestamp]] = {tf: None for tf in self.timeframes}
+        self._latest: Dict[str, Dict[str, float]] = {
+            tf: {mtf_column_name(c, tf): np.nan for c in self.columns} for tf in self.timeframes
+        }
+
+    @classmethod
+    def from_frame(
+        cls,
+        df: pd.DataFrame,
+        timeframes: Sequence[str] = HIGHER_TIMEFRAMES,
+        columns: Optional[Sequence[str]] = None,
+        base_timeframe: str = BASE_TIMEFRAME
+    ) -> "MultiTimeframeState":
+        """
+        Seed the state from a base OHLCV history.
+
+        Closed bins are resampled and streamed in bulk; the base candles of the
+        still-forming bin are replayed into its aggregate.
+
+        Args:
+            df: Base OHLCV DataFrame (DatetimeIndex of candle open times)
+            timeframes: Higher timeframes (default: 4h, 1d)
+            columns: Columns to emit (default: DEFAULT_MTF_COLUMNS)
+            base_timeframe: Timeframe of df (default: 1h)
+
+        Returns:
+            MultiTimeframeState positioned after the last row of df
+        """
+        state = cls(timeframes, columns, base_timeframe)
+        if df.empty:
+            return state
+
+        for tf in state.timeframes:
+            bars = resample_ohlcv(df, tf, base_timeframe)
+            if len(bars):
+                indicators = state._indicators[tf].update_many(bars)
+                state._store_latest(tf, bars.iloc[-1].to_dict(), indicators.iloc[-1].to_dict())
+
+            # Replay the candles of the forming bin (after the last closed one)
+            tail = df[df.index >= bars.index[-1] + state._freq[tf]] if len(bars) else df
+            for timestamp, bar in zip(tail.index, tail[list(OHLCV_AGG)].to_dict('records')):
+                state._update_timeframe(tf, timestamp, bar)
+        return state
+
+    def update(self, timestamp: pd.Timestamp, bar: Dict[str, float]) -> Dict[str, float]:
+        """
+        Fold one newly closed base candle into every higher timeframe.
+
+        Args:
+            timestamp: Open time of the base candle
+            bar: Mapping with open, high, low, close, volume
+
+        Returns:
+            Dictionary of aligned values ({column}_{timeframe}) for this base bar,
+            i.e. the most recent CLOSED higher-timeframe bar of each timeframe
+        """
+        timestamp = pd.Timestamp(timestamp)
+        values = {}
+        for tf in self.timeframes:
+            self._update_timeframe(tf, timestamp, bar)
+            values.update(self._latest[tf])
+        return values
+
+    def _update_timeframe(self, tf: str, timestamp: pd.Timestamp, bar: Dict[str, float]) -> None:
+        freq = self._freq[tf]
+        bin_start = timestamp.floor(freq)
+
+        # A gap skipped the closing candle: the previous bin closed by time
+        if self._bin_start[tf] is not None and bin_start != self._bin_start[tf]:
+            self._close_bin(tf)
+
+        forming = self._forming[tf]
+        if forming is None:
+            self._forming[tf] = {col: float(bar[col]) for col in OHLCV_AGG}
+            self._bin_start[tf] = bin_start
+        else:
+            forming['high'] = max(forming['high'], float(bar['high']))
+            forming['low'] = min(forming['low'], float(bar['low']))
+            forming['close'] = float(bar['close'])
+            forming['volume'] += float(bar['volume'])
+
+        if timestamp + self.base >= bin_start + freq:
+            self._close_bin(tf)
+
+    def _close_bin(self, tf: str) -> None:
+        """Recompute the one higher-timeframe bar that just closed."""
+        forming = self._forming[tf]
+        self._store_latest(tf, forming, self._indicators[tf].update(forming))
+        self._forming[tf] = None
+        self._bin_start[tf] = None
+
+    def _store_latest(self, tf: str, bar: Dict[str, float], indicators: Dict[str, float]) -> None:
+        row = {**bar, **indicators}
+        self._latest[tf] = {mtf_column_name(c, tf): row.get(c, np.nan) for c in self.columns}
+
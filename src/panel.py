@@ -0,0 +1,246 @@
+"""
+Columnar multi-symbol panel for Market Scanner Core System.
+
+A scan normally holds every symbol as its own float64 DataFrame. OHLCVPanel
+holds the whole universe column by column instead: one 2D (time x symbol)
+array per column on the union of all symbols' timestamps, optionally in
+float32. Arrays are Fortran-ordered, so each symbol's series is contiguous
+and per-symbol access is a zero-copy view:
+
+- panel['close']                 -> (time x symbol) array
+- panel.columns_of('BTC/USDT')   -> {column: 1D view}, accepted directly by
+                                    CompiledCondition.evaluate / evaluate_last
+- panel.frame('BTC/USDT')        -> DataFrame over those views (pandas layer)
+- panel.to_frames()              -> {symbol: DataFrame}, the usual crypto_data
+
+Columns shared by every symbol (macro closes) are stored once as 1D arrays.
+Rows where a symbol has no candle (before its listing) are NaN; a symbol with
+gaps inside its history is served through a gathered copy instead of a view.
+
+Memory: 500 symbols x 3 years of 1h candles with all indicators is about
+0.9 GB in float32, against 1.7 GB of float64 DataFrames before any of the
+per-step copies (tools/benchmark_panel.py). float32 keeps ~7 significant
+digits, so conditions comparing values equal to within 1e-7 relative may
+flip; indicators are computed in float64 (analyze_panel) and only stored as
+float32.
+
+Frames and views share the panel's memory: treat them as read-only.
+"""
+
+import logging
+from typing import Dict, Iterable, List, Optional, Union
+import numpy as np
+import pandas as pd
+from .analysis import MacroPanel, calculate_indicators
+from .data_loader import OHLCV_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+# Candle columns of a panel built from OHLCV frames
+PRICE_COLUMNS = OHLCV_COLUMNS[1:]
+
+
+class OHLCVPanel:
+    """
+    All symbols' columns as contiguous (time x symbol) arrays.
+
+    Usage:
+        panel = OHLCVPanel.from_frames(crypto_data, dtype=np.float32)
+        analyze_panel(panel, macro_data)
+        crypto_data = panel.to_frames()  # zero-copy DataFrames for the tools
+    """
+
+    def __init__(self, index: pd.DatetimeIndex, symbols: Iterable[str], dtype=np.float64):
+        """
+        Args:
+            index: Sorted union of the symbols' timestamps
+            symbols: Symbol names, one array column each
+            dtype: Storage dtype of float columns (np.float64 or np.float32)
+        """
+        self.index = pd.DatetimeIndex(index, name='timestamp')
+        self.symbols = list(symbols)
+        self.dtype = np.dtype(dtype)
+        self._positions = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self._rows: Dict[str, Union[slice, np.ndarray]] = {symbol: slice(0, 0) for symbol in self.symbols}
+        self._data: Dict[str, np.ndarray] = {}
+        self._shared: Dict[str, np.ndarray] = {}
+
+    @classmethod
+    def from_frames(
+        cls,
+        frames: Dict[str, pd.DataFrame],
+        dtype=np.float64,
+        columns: Optional[List[str]] = None,
+        release: bool = False
+    ) -> 'OHLCVPanel':
+        """
+        Pack per-symbol frames into one panel.
+
+        Args:
+            frames: Dictionary of {symbol: DataFrame indexed by timestamp}
+            dtype: Storage dtype of float columns
+            columns: Columns to pack (default: open, high, low, close, volume)
+            release: Remove each frame from `frames` once packed, so the
+                     float64 frames and the panel never coexist in full
+
+        Returns:
+            OHLCVPanel on the union of the frames' timestamps
+        """
+        columns = list(columns or PRICE_COLUMNS)
+        symbols = list(frames)
+        unit = next((frames[s].index.dtype for s in symbols if len(frames[s])), np.dtype('datetime64[ns]'))
+        stamps = [frames[s].index.values.astype(unit) for s in symbols]
+        index = pd.DatetimeIndex(np.unique(np.concatenate(stamps)) if stamps else np.array([], dtype=unit))
+
+        panel = cls(index, symbols, dtype)
+        for col in columns:
+            panel.add_column(col)
+        for symbol, timestamps in zip(symbols, stamps):
+            df = frames.pop(symbol) if release else frames[symbol]
+            panel._set_rows(symbol, timestamps)
+            for col in columns:
+                panel.write(symbol, col, df[col].to_numpy())
+        return panel
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._positions
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        """(time x symbol) array of a column (shared columns are 1D, time only)."""
+        return self._data[column] if column in self._data else self._shared[column]
+
+    @property
+    def columns(self) -> List[str]:
+        """Per-symbol columns followed by shared columns."""
+        return list(self._data) + list(self._shared)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the column arrays."""
+        return sum(a.nbytes for a in self._data.values()) + sum(a.nbytes for a in self._shared.values())
+
+    def add_column(self, column: str, dtype=None) -> np.ndarray:
+        """
+        Allocate a per-symbol column (NaN, or False for bool columns) if missing.
+
+        Args:
+            column: Column name
+            dtype: Storage dtype (default: the panel dtype)
+
+        Returns:
+            The (time x symbol) array
+        """
+        if column not in self._data:
+            dtype = np.dtype(dtype or self.dtype)
+            shape = (len(self.index), len(self.symbols))
+            if dtype == np.bool_:
+                self._data[column] = np.zeros(shape, dtype=dtype, order='F')
+            else:
+                self._data[column] = np.full(shape, np.nan, dtype=dtype, order='F')
+        return self._data[column]
+
+    def write(self, symbol: str, column: str, values: np.ndarray) -> None:
+        """Store a symbol's values of a column (one value per row of the symbol, cast to the column dtype)."""
+        data = self._data[column] if column in self._data else self.add_column(column)
+        data[self._rows[symbol], self._positions[symbol]] = values
+
+    def set_shared(self, column: str, values: np.ndarray) -> None:
+        """Store a column common to every symbol (one value per panel timestamp)."""
+        self._shared[column] = np.asarray(values, dtype=self.dtype)
+
+    def columns_of(self, symbol: str, columns: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+        """
+        One symbol's columns as 1D arrays over its own rows.
+
+        Args:
+            symbol: Symbol name
+            columns: Columns to return (default: all)
+
+        Returns:
+            Dictionary of {column: array}; zero-copy views unless the symbol
+            has gaps inside its history
+        """
+        rows = self._rows[symbol]
+        pos = self._positions[symbol]
+        result = {}
+        for col in columns or self.columns:
+            if col in self._data:
+                result[col] = self._data[col][rows, pos]
+            else:
+                result[col] = self._shared[col][rows]
+        return result
+
+    def frame(self, symbol: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        One symbol as a DataFrame (pandas compatibility layer).
+
+        Args:
+            symbol: Symbol name
+            columns: Columns to include (default: all)
+
+        Returns:
+            DataFrame indexed by the symbol's timestamps, built over the
+            column views without copying them
+        """
+        return pd.DataFrame(self.columns_of(symbol, columns), index=self.index[self._rows[symbol]], copy=False)
+
+    def to_frames(self, columns: Optional[List[str]] = None) -> Dict[str, pd.DataFrame]:
+        """Return {symbol: frame(symbol)} for code written against per-symbol DataFrames."""
+        return {symbol: self.frame(symbol, columns) for symbol in self.symbols}
+
+    def _set_rows(self, symbol: str, timestamps: np.ndarray) -> None:
+        """Map a symbol's timestamps to panel rows (a slice when they are contiguous)."""
+        rows = np.searchsorted(self.index.values, timestamps)
+        if len(rows) == 0:
+            self._rows[symbol] = slice(0, 0)
+        elif rows[-1] - rows[0] + 1 == len(rows):
+            self._rows[symbol] = slice(int(rows[0]), int(rows[-1]) + 1)
+        else:
+            self._rows[symbol] = rows
+
+
+def analyze_panel(
+    panel: OHLCVPanel,
+    macro_data: Optional[Union[Dict[str, pd.DataFrame], MacroPanel]] = None
+) -> OHLCVPanel:
+    """
+    Calculate indicators and merge macro data into a panel (see analyze_symbols).
+
+    Indicators are computed per symbol in float64 on a temporary frame and
+    stored in the panel's dtype; flag columns (crossovers) are stored as bool.
+    A symbol too short for an indicator keeps NaN / False in that column.
+    Macro closes are aligned once on the panel index and stored as shared
+    columns.
+
+    Args:
+        panel: Panel holding at least the OHLCV columns
+        macro_data: Optional dictionary of {asset_name: DataFrame}, or a MacroPanel
+
+    Returns:
+        The same panel, with indicator and {asset}_close columns added
+    """
+    for symbol in panel.symbols:
+        logger.info(f"Analyzing {symbol}...")
+        df = calculate_indicators(panel.frame(symbol, PRICE_COLUMNS).astype(np.float64))
+        for col in df.columns:
+            if col in PRICE_COLUMNS:
+                continue
+            values = df[col].to_numpy()
+            if col not in panel.columns:
+                panel.add_column(col, np.bool_ if values.dtype == np.bool_ else None)
+            panel.write(symbol, col, values)
+
+    if macro_data:
+        macro_panel = macro_data if isinstance(macro_data, MacroPanel) else MacroPanel(macro_data)
+        if macro_panel.columns and len(panel):
+            values = macro_panel.align_values(panel.index)
+            for j, col in enumerate(macro_panel.columns):
+                panel.set_shared(col, values[:, j])
+            logger.info(f"✓ Merged macro data (columns: {', '.join(macro_panel.columns)})")
+
+    logger.info(f"✓ Panel: {len(panel.symbols)} symbols x {len(panel)} bars x {len(panel.columns)} columns "
+                f"({panel.nbytes / 1024**2:.1f} MB, {panel.dtype})")
+    return panel
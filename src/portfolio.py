@@ -0,0 +1,386 @@
+"""
+Portfolio backtester for Market Scanner Core System.
+
+The proof engine simulates isolated trades with a fixed PnL equal to the SL/TP
+percentage. This module replays ALL symbols and strategies as one portfolio:
+
+- Every (symbol, strategy) signal stream is resolved with the batched exit
+  engine (one PathIndex per symbol, shared by its strategies)
+- The streams are merged into one time-ordered entry queue; open positions
+  wait in a heap keyed by exit timestamp, so capital is released before any
+  entry at the same or a later bar
+- Sizing follows specs/02_risk_rules.md (risk 1% of capital per trade,
+  size = risk / |entry - stop|, minimum 1:2 R:R) and specs/01_mission.md
+  (max 5 trades per calendar month)
+- Positions are stored in a NumPy structured array, not per-trade dicts
+
+Entries fill at the signal bar's close; exits fill at the SL/TP price, or are
+marked to market at the last close if still open at the end of data.
+"""
+
+import heapq
+import logging
+import argparse
+from typing import List, Dict, Any, Optional
+import numpy as np
+import pandas as pd
+from .backtester import find_all_signal_indices
+from .exit_engine import PathIndex, resolve_exits, RESULT_TP, RESULT_SL, RESULT_OPEN, DIRECTION_LONG, DIRECTION_SHORT
+from .utils import setup_logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CAPITAL = 10000.0
+DEFAULT_RISK_PER_TRADE = 0.01
+DEFAULT_MAX_TRADES_PER_MONTH = 5
+DEFAULT_MIN_REWARD_RISK = 2.0
+
+# One record per executed position
+POSITION_DTYPE = np.dtype([
+    ('symbol', 'i4'),
+    ('strategy', 'i4'),
+    ('direction', 'i1'),        # +1 long, -1 short
+    ('entry_time', 'i8'),       # ns since epoch
+    ('exit_time', 'i8'),        # ns since epoch
+    ('entry_price', 'f8'),
+    ('stop_price', 'f8'),
+    ('take_price', 'f8'),
+    ('exit_price', 'f8'),
+    ('size', 'f8'),             # units
+    ('risk', 'f8'),             # capital at risk (size * |entry - stop|)
+    ('pnl', 'f8'),
+    ('result', 'i1'),           # RESULT_CODES key
+])
+
+# Result codes stored in POSITION_DTYPE['result']
+RESULT_CODES = {1: RESULT_TP, -1: RESULT_SL, 0: RESULT_OPEN}
+
+
+def build_candidates(
+    data: Dict[str, pd.DataFrame],
+    strategies: List[Dict[str, Any]]
+) -> Dict[str, np.ndarray]:
+    """
+    Resolve every signal of every (symbol, strategy) pair into a candidate trade.
+
+    Args:
+        data: Dictionary of {symbol: DataFrame with indicators}
+        strategies: Strategy dicts from load_strategies() (list order = priority)
+
+    Returns:
+        Dictionary of equal-length arrays sorted by entry time (ties broken by
+        strategy priority, then symbol order): symbol, strategy, direction,
+        entry_time, exit_time, entry_price, stop_price, take_price, exit_price, result
+    """
+    parts = []
+
+    for symbol_id, (symbol, df) in enumerate(data.items()):
+        if df.empty:
+            continue
+
+        path = PathIndex.from_frame(df)
+        close = df['close'].to_numpy(dtype=np.float64)
+        times = df.index.values.astype('datetime64[ns]').view(np.int64)
+
+        for strategy_id, strategy in enumerate(strategies):
+            try:
+                entries = find_all_signal_indices(df, strategy['condition'])
+            except Exception as e:
+                logger.error(f"✗ Error scanning {strategy['name']} on {symbol}: {e}")
+                continue
+            if len(entries) == 0:
+                continue
+
+            params = strategy['params']
+            direction = strategy.get('direction', DIRECTION_LONG)
+            side = -1 if direction == DIRECTION_SHORT else 1
+            entry_prices = close[entries]
+            stop_prices = entry_prices * (1 - side * params['stop_loss_pct'])
+            take_prices = entry_prices * (1 + side * params['take_profit_pct'])
+            results, exit_idx = resolve_exits(path, entries, stop_prices, take_prices, direction)
+
+            codes = np.where(results == RESULT_TP, 1, np.where(results == RESULT_SL, -1, 0)).astype(np.int8)
+            exit_prices = np.where(codes == 1, take_prices, np.where(codes == -1, stop_prices, close[exit_idx]))
+
+            parts.append({
+                "symbol": np.full(len(entries), symbol_id, dtype=np.int32),
+                "strategy": np.full(len(entries), strategy_id, dtype=np.int32),
+                "direction": np.full(len(entries), side, dtype=np.int8),
+                "entry_time": times[entries],
+                "exit_time": times[exit_idx],
+                "entry_price": entry_prices,
+                "stop_price": stop_prices,
+                "take_price": take_prices,
+                "exit_price": exit_prices,
+                "result": codes,
+            })
+
+    keys = ["symbol", "strategy", "direction", "entry_time", "exit_time", "entry_price",
+            "stop_price", "take_price", "exit_price", "result"]
+    if not parts:
+        return {key: np.empty(0, dtype=POSITION_DTYPE[key]) for key in keys}
+
+    candidates = {key: np.concatenate([part[key] for part in parts]) for key in keys}
+
+    # k-way merge of the per-stream signal lists into one time-ordered queue
+    order = np.lexsort((candidates["symbol"], candidates["strategy"], candidates["entry_time"]))
+    return {key: values[order] for key, values in candidates.items()}
+
+
+def run_portfolio(
+    data: Dict[str, pd.DataFrame],
+    strategies: List[Dict[str, Any]],
+    initial_capital: float = DEFAULT_CAPITAL,
+    risk_per_trade: float = DEFAULT_RISK_PER_TRADE,
+    max_trades_per_month: Optional[int] = DEFAULT_MAX_TRADES_PER_MONTH,
+    min_reward_risk: Optional[float] = DEFAULT_MIN_REWARD_RISK,
+    max_open_positions: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Run an event-driven portfolio backtest over all symbols and strategies.
+
+    Rules applied to each entry, in time order:
+    - Skip if reward/risk of the strategy's SL/TP is below min_reward_risk
+    - Skip if the calendar month already has max_trades_per_month entries
+    - Skip if the symbol already has an open position
+    - Skip if max_open_positions positions are open
+    - Size = (risk_per_trade * equity) / |entry - stop|; skip if that notional
+      exceeds the free cash (no leverage, no partial fills; shorts also
+      reserve their notional)
+
+    Args:
+        data: Dictionary of {symbol: DataFrame with indicators}
+        strategies: Strategy dicts from load_strategies() (list order = priority)
+        initial_capital: Starting capital
+        risk_per_trade: Fraction of equity risked per trade (default: 1%)
+        max_trades_per_month: Entry cap per calendar month (None = unlimited)
+        min_reward_risk: Minimum (take - entry) / (entry - stop) (None = off)
+        max_open_positions: Cap on concurrent positions (None = unlimited)
+
+    Returns:
+        Dictionary with:
+        - positions: POSITION_DTYPE structured array of executed positions
+        - equity_curve: Series of realized equity indexed by exit time
+        - stats: summary dictionary (see _portfolio_stats)
+    """
+    symbols = list(data.keys())
+    cand = build_candidates(data, strategies)
+    n = len(cand["entry_time"])
+
+    entry_time = cand["entry_time"]
+    entry_price = cand["entry_price"]
+    stop_price = cand["stop_price"]
+    month = entry_time.astype('datetime64[ns]').astype('datetime64[M]').astype(np.int64)
+
+    skipped = {"reward_risk": 0, "month_cap": 0, "symbol_open": 0, "max_open": 0, "capital": 0}
+
+    # Vectorized pre-filter: the R:R rule does not depend on portfolio state
+    side = cand["direction"].astype(np.float64)
+    risk_per_unit = side * (entry_price - stop_price)
+    eligible = risk_per_unit > 0
+    if min_reward_risk is not None:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            reward_risk = side * (cand["take_price"] - entry_price) / risk_per_unit
+        eligible &= reward_risk >= min_reward_risk - 1e-9
+    skipped["reward_risk"] = int((~eligible).sum())
+
+    positions = np.zeros(n, dtype=POSITION_DTYPE)
+    count = 0
+    exits = []  # heap of (exit_time, position slot)
+    symbol_open = np.zeros(len(symbols), dtype=bool)
+    month_counts: Dict[int, int] = {}
+
+    equity = float(initial_capital)
+    committed = 0.0  # notional tied up in open positions
+    curve_times = []
+    curve_values = []
+
+    def close_until(t: int) -> None:
+        nonlocal equity, committed
+        while exits and exits[0][0] <= t:
+            exit_time, slot = heapq.heappop(exits)
+            record = positions[slot]
+            if record['result'] == 0:
+                # Still open at end of data: stays open, marked to market in the stats
+                continue
+            equity += record['pnl']
+            committed -= record['size'] * record['entry_price']
+            symbol_open[record['symbol']] = False
+            curve_times.append(exit_time)
+            curve_values.append(equity)
+
+    i = 0
+    while i < n:
+        if not eligible[i]:
+            i += 1
+            continue
+
+        t = int(entry_time[i])
+        close_until(t)
+
+        if max_trades_per_month is not None and month_counts.get(month[i], 0) >= max_trades_per_month:
+            # Jump straight to the first candidate of the next month
+            next_i = int(np.searchsorted(month, month[i], side='right'))
+            skipped["month_cap"] += int(eligible[i:next_i].sum())
+            i = next_i
+            continue
+
+        symbol = cand["symbol"][i]
+        if symbol_open[symbol]:
+            skipped["symbol_open"] += 1
+            i += 1
+            continue
+        if max_open_positions is not None and len(exits) >= max_open_positions:
+            skipped["max_open"] += 1
+            i += 1
+            continue
+
+        size = (equity * risk_per_trade) / risk_per_unit[i]
+        if size * entry_price[i] > equity - committed:
+            skipped["capital"] += 1
+            i += 1
+            continue
+
+        record = positions[count]
+        for key in ("symbol", "strategy", "direction", "entry_time", "exit_time", "entry_price",
+                    "stop_price", "take_price", "exit_price", "result"):
+            record[key] = cand[key][i]
+        record['size'] = size
+        record['risk'] = size * risk_per_unit[i]
+        record['pnl'] = size * side[i] * (cand["exit_price"][i] - entry_price[i])
+
+        committed += size * entry_price[i]
+        symbol_open[symbol] = True
+        month_counts[month[i]] = month_counts.get(month[i], 0) + 1
+        heapq.heappush(exits, (int(cand["exit_time"][i]), count))
+        count += 1
+        i += 1
+
+    close_until(np.iinfo(np.int64).max)
+    positions = positions[:count]
+
+    equity_curve = pd.Series(
+        curve_values,
+        index=pd.DatetimeIndex(np.asarray(curve_times, dtype='datetime64[ns]'), name='timestamp'),
+        name='equity',
+        dtype=np.float64
+    )
+    stats = _portfolio_stats(positions, equity_curve, initial_capital, n, skipped)
+    return {"positions": positions, "equity_curve": equity_curve, "stats": stats}
+
+
+def positions_frame(
+    positions: np.ndarray,
+    symbols: List[str],
+    strategies: List[Dict[str, Any]]
+) -> pd.DataFrame:
+    """
+    Convert position records into a readable DataFrame.
+
+    Args:
+        positions: POSITION_DTYPE array from run_portfolio
+        symbols: Symbol names in the order of the data dict
+        strategies: Strategy dicts in the order passed to run_portfolio
+
+    Returns:
+        DataFrame with symbol / strategy names, datetime entry/exit and result labels
+    """
+    df = pd.DataFrame(positions)
+    df['symbol'] = np.asarray(symbols, dtype=object)[positions['symbol']]
+    df['strategy'] = np.asarray([s['name'] for s in strategies], dtype=object)[positions['strategy']]
+    df['entry_time'] = positions['entry_time'].astype('datetime64[ns]')
+    df['exit_time'] = positions['exit_time'].astype('datetime64[ns]')
+    df['result'] = [RESULT_CODES[code] for code in positions['result']]
+    return df
+
+
+def _portfolio_stats(
+    positions: np.ndarray,
+    equity_curve: pd.Series,
+    initial_capital: float,
+    candidates: int,
+    skipped: Dict[str, int]
+) -> Dict[str, Any]:
+    """Summarize executed positions (open positions are marked to market)."""
+    closed = positions['result'] != 0
+    wins = int((positions['result'] == 1).sum())
+    losses = int((positions['result'] == -1).sum())
+    realized = float(positions['pnl'][closed].sum())
+    unrealized = float(positions['pnl'][~closed].sum())
+    final_equity = initial_capital + realized + unrealized
+
+    curve = np.concatenate(([initial_capital], equity_curve.to_numpy()))
+    peaks = np.maximum.accumulate(curve)
+    max_drawdown = float(((peaks - curve) / peaks).max() * 100)
+
+    return {
+        "candidates": candidates,
+        "trades": len(positions),
+        "wins": wins,
+        "losses": losses,
+        "open": int((~closed).sum()),
+        "win_rate": (wins / (wins + losses) * 100) if (wins + losses) else 0.0,
+        "realized_pnl": realized,
+        "unrealized_pnl": unrealized,
+        "final_equity": final_equity,
+        "total_return_pct": (final_equity / initial_capital - 1) * 100,
+        "max_drawdown_pct": max_drawdown,
+        "skipped": skipped
+    }
+
+
+def main():
+    """
+    Standalone portfolio backtest over the scanner's symbols and strategies.
+
+    Usage:
+        python -m src.portfolio --days 365 --capital 10000
+    """
+    parser = argparse.ArgumentParser(description='Portfolio backtest across symbols and strategies')
+    parser.add_argument('--symbols', type=str, default='BTC/USDT,ETH/USDT,SOL/USDT,BNB/USDT,XRP/USDT',
+                        help='Comma-separated trading symbols')
+    parser.add_argument('--days', type=int, default=365, help='Days of historical data')
+    parser.add_argument('--capital', type=float, default=DEFAULT_CAPITAL, help='Initial capital')
+    parser.add_argument('--risk', type=float, default=DEFAULT_RISK_PER_TRADE, help='Risk per trade (e.g., 0.01 = 1%)')
+    parser.add_argument('--max-trades-per-month', type=int, default=DEFAULT_MAX_TRADES_PER_MONTH,
+                        help='Entry cap per calendar month (0 = unlimited)')
+
+    args = parser.parse_args()
+
+    setup_logging()
+
+    from .data_loader import fetch_crypto_data
+    from .analysis import analyze_symbols
+    from .strategy_loader import load_strategies, add_condition_features
+
+    symbols = [s.strip() for s in args.symbols.split(',') if s.strip()]
+    data = {symbol: fetch_crypto_data(symbol, days=args.days) for symbol in symbols}
+    data = analyze_symbols({symbol: df for symbol, df in data.items() if not df.empty})
+
+    strategies = load_strategies()
+    for df in data.values():
+        add_condition_features(df, strategies)
+
+    result = run_portfolio(
+        data,
+        strategies,
+        initial_capital=args.capital,
+        risk_per_trade=args.risk,
+        max_trades_per_month=args.max_trades_per_month or None
+    )
+    stats = result["stats"]
+
+    print("\n" + "=" * 60)
+    print("PORTFOLIO BACKTEST:")
+    print("=" * 60)
+    print(f"Symbols: {len(data)} | Strategies: {len(strategies)} | Candidate signals: {stats['candidates']}")
+    print(f"Trades: {stats['trades']} (Wins: {stats['wins']}, Losses: {stats['losses']}, Open: {stats['open']})")
+    print(f"Win Rate: {stats['win_rate']:.1f}%")
+    print(f"Final Equity: ${stats['final_equity']:,.2f} ({stats['total_return_pct']:+.2f}%)")
+    print(f"Max Drawdown: {stats['max_drawdown_pct']:.2f}%")
+    print(f"Skipped: {stats['skipped']}")
+    print("=" * 60)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,326 @@
+"""
+Historical replay of the scanner for Market Scanner Core System.
+
+Answers "what would the scanner have reported at each hour": the candles of
+every symbol are replayed in time order, one closed bar per step, through the
+same in-memory SymbolState the daemon uses (streaming indicators and
+higher-timeframe state), every strategy is evaluated on the new bar, and each
+match is logged with the proof the scanner would have attached at that hour.
+
+The proof engine is incremental too. Each signal's exit (first SL/TP touch)
+is resolved once, when the signal appears, with a PathIndex over the whole
+replayed history; a trade only counts as closed once the replay has reached
+its exit bar, so nothing after the current bar leaks into the log. Per
+(symbol, strategy) the trades inside the trailing history window are kept in
+a queue with running win / loss / PnL totals, so a step costs
+O(symbols x strategies) instead of a full recompute.
+
+Differences from a one-shot scan at the same hour: indicators are streamed
+from the first replayed candle instead of being warmed up from the start of a
+fresh `days` window, so long-memory values (EMA200) are the converged ones.
+"""
+
+import heapq
+import logging
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import numpy as np
+import pandas as pd
+from .analysis import MacroPanel
+from .backtester import simulate_trades
+from .data_loader import timeframe_to_ms
+from .exit_engine import PathIndex, RESULT_OPEN
+from .fake_exchange import frame_to_rows
+from .scanner_daemon import SymbolState
+
+logger = logging.getLogger(__name__)
+
+# Columns of the replay signal log (one row per strategy match per bar)
+SIGNAL_LOG_COLUMNS = [
+    'timestamp', 'asset', 'strategy', 'direction', 'entry_price', 'proof', 'proof_wins', 'win_rate',
+    'history_total', 'history_wins', 'history_losses', 'history_open', 'history_win_rate',
+    'history_expectancy', 'history_avg_duration'
+]
+
+
+class _Trade:
+    __slots__ = ('entry', 'exit', 'result', 'pnl', 'closed', 'in_window')
+
+    def __init__(self, entry: int, exit_idx: float, result: str, pnl: float):
+        self.entry = entry
+        self.exit = exit_idx
+        self.result = result
+        self.pnl = pnl
+        self.closed = False
+        self.in_window = True
+
+
+class ProofTracker:
+    """
+    Incremental proof-engine state of one (symbol, strategy) pair.
+
+    Reproduces, at any bar i, backtest_all_signals over the trailing window
+    ending at i followed by format_proof / summarize_trades, with amortized
+    O(1) work per bar and O(log n) per signal.
+    """
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        path: PathIndex,
+        params: Dict[str, float],
+        direction: str,
+        window_bars: int
+    ):
+        """
+        Args:
+            df: Full replayed OHLCV history of the symbol
+            path: PathIndex over df (shared by the symbol's strategies)
+            params: Strategy params (stop_loss_pct, take_profit_pct)
+            direction: "long" or "short"
+            window_bars: Bars of history the scanner backtests (days x 24 for 1h)
+        """
+        self.df = df
+        self.path = path
+        self.stop_loss_pct = params['stop_loss_pct']
+        self.take_profit_pct = params['take_profit_pct']
+        self.direction = direction
+        self.window_bars = window_bars
+
+        self._trades: deque = deque()
+        self._pending: List = []  # heap of (exit bar, entry bar, trade)
+        self._wins = 0
+        self._losses = 0
+        self._open = 0
+        self._closed_pnl = 0.0
+        self._closed_duration = 0
+        self._open_entries = 0
+
+    def add_signals(self, entries: np.ndarray) -> None:
+        """
+        Register signal bars (ascending, not older than the last registered one).
+
+        Exits are resolved against the full history in one batched call; a
+        trade stays open until advance() reaches its exit bar.
+        """
+        entries = np.asarray(entries, dtype=np.int64)
+        if len(entries) == 0:
+            return
+        trades = simulate_trades(
+            self.df, entries, self.stop_loss_pct, self.take_profit_pct, path=self.path, direction=self.direction
+        )
+        for entry, result, pnl, duration in zip(entries, trades['result'], trades['pnl_percent'], trades['duration_bars']):
+            exit_idx = np.inf if result == RESULT_OPEN else int(entry + duration)
+            trade = _Trade(int(entry), exit_idx, result, float(pnl))
+            self._trades.append(trade)
+            self._open += 1
+            self._open_entries += trade.entry
+            if exit_idx != np.inf:
+                heapq.heappush(self._pending, (exit_idx, trade.entry, trade))
+
+    def advance(self, i: int) -> None:
+        """Close trades whose exit bar is <= i and drop trades older than the window."""
+        while self._pending and self._pending[0][0] <= i:
+            _, _, trade = heapq.heappop(self._pending)
+            if not trade.in_window:
+                continue
+            trade.closed = True
+            self._open -= 1
+            self._open_entries -= trade.entry
+            self._count_closed(trade, 1)
+
+        first = i - self.window_bars + 1
+        while self._trades and self._trades[0].entry < first:
+            trade = self._trades.popleft()
+            trade.in_window = False
+            if trade.closed:
+                self._count_closed(trade, -1)
+            else:
+                self._open -= 1
+                self._open_entries -= trade.entry
+
+    def proof(self, i: int, last_n: int = 3) -> List[str]:
+        """Results (TP / SL / Open) of the last N signals as of bar i (call advance(i) first)."""
+        count = min(last_n, len(self._trades))
+        return [
+            trade.result if trade.closed else RESULT_OPEN
+            for trade in (self._trades[-k] for k in range(count, 0, -1))
+        ]
+
+    def summary(self, i: int) -> Dict[str, Any]:
+        """summarize_trades() of the window as of bar i (call advance(i) first)."""
+        total = len(self._trades)
+        closed = self._wins + self._losses
+        open_duration = self._open * i - self._open_entries
+        return {
+            "total": total,
+            "wins": self._wins,
+            "losses": self._losses,
+            "open": total - closed,
+            "win_rate": (self._wins / total * 100) if total else 0.0,
+            "expectancy": self._closed_pnl / closed if closed else 0.0,
+            "avg_duration_bars": (self._closed_duration + open_duration) / total if total else 0.0
+        }
+
+    def _count_closed(self, trade: _Trade, sign: int) -> None:
+        # A trailing stop could close in profit, so wins are counted by PnL (as summarize_trades)
+        if trade.pnl > 0:
+            self._wins += sign
+        else:
+            self._losses += sign
+        self._closed_pnl += sign * trade.pnl
+        self._closed_duration += sign * int(trade.exit - trade.entry)
+
+
+class ReplayScanner:
+    """
+    Bar-by-bar replay of the scan + proof pipeline over stored history.
+
+    Usage:
+        replay = ReplayScanner(frames, load_strategies(), start='2025-01-01')
+        log = replay.run()  # DataFrame with SIGNAL_LOG_COLUMNS
+    """
+
+    def __init__(
+        self,
+        frames: Dict[str, pd.DataFrame],
+        strategies: List[Dict[str, Any]],
+        start,
+        window_days: int = 180,
+        timeframe: str = '1h',
+        macro_panel: Optional[MacroPanel] = None,
+        sentiment_windows: Optional[pd.DataFrame] = None
+    ):
+        """
+        Args:
+            frames: Dictionary of {symbol: OHLCV DataFrame of closed candles}
+            strategies: Strategy dicts from load_strategies()
+            start: First replayed bar (earlier candles only warm up the state)
+            window_days: History the proof engine backtests (the scanner's --days)
+            timeframe: Candle timeframe of the frames
+            macro_panel: Optional macro closes merged onto every bar
+            sentiment_windows: Optional rolling sentiment merged onto every bar
+        """
+        self.frames = {symbol: df for symbol, df in frames.items() if not df.empty}
+        self.strategies = strategies
+        self.start = pd.Timestamp(start)
+        self.window_bars = window_days * 24 * 3600 * 1000 // timeframe_to_ms(timeframe)
+        self.macro_panel = macro_panel
+        self.sentiment_windows = sentiment_windows
+        self.stats = {"steps": 0, "bars": 0, "evaluations": 0, "signals": 0}
+
+    def run(self, progress_every: int = 0) -> pd.DataFrame:
+        """
+        Replay every bar from `start` and log each strategy match.
+
+        Args:
+            progress_every: Log progress every N steps (0 = never)
+
+        Returns:
+            DataFrame with SIGNAL_LOG_COLUMNS, one row per (bar, symbol, strategy) match
+        """
+        states, trackers, rows, positions = {}, {}, {}, {}
+        for symbol, df in self.frames.items():
+            history = df[df.index < self.start]
+            if history.empty:
+                logger.warning(f"⚠ {symbol}: no candles before {self.start}, skipping")
+                continue
+            states[symbol] = SymbolState.from_history(symbol, history, self.macro_panel, self.sentiment_windows)
+            trackers[symbol] = self._seed_trackers(df, states[symbol])
+            rows[symbol] = frame_to_rows(df)
+            positions[symbol] = len(history)
+
+        timeline = np.unique(np.concatenate([
+            rows[symbol][positions[symbol]:, 0] for symbol in states
+        ])) if states else np.array([])
+
+        log: List[tuple] = []
+        for step, timestamp_ms in enumerate(timeline, 1):
+            for symbol, state in states.items():
+                i = positions[symbol]
+                if i >= len(rows[symbol]) or rows[symbol][i, 0] != timestamp_ms:
+                    continue
+                state.append(rows[symbol][i:i + 1], self.macro_panel, self.sentiment_windows)
+                positions[symbol] = i + 1
+                self.stats["bars"] += 1
+                self._scan(symbol, state, trackers[symbol], i, log)
+
+            self.stats["steps"] += 1
+            if progress_every and step % progress_every == 0:
+                logger.info(f"Replayed {step}/{len(timeline)} bars ({self.stats['signals']} signals)")
+
+        return pd.DataFrame(log, columns=SIGNAL_LOG_COLUMNS)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return counters: steps, bars appended, strategy evaluations, signals logged."""
+        return dict(self.stats)
+
+    def _seed_trackers(self, df: pd.DataFrame, state: SymbolState) -> Dict[str, ProofTracker]:
+        """One tracker per strategy, seeded with the signals of the warm-up history."""
+        path = PathIndex.from_frame(df)
+        columns = state.columns()
+        trackers = {}
+        for strategy in self.strategies:
+            try:
+                matches = strategy['compiled'].evaluate(columns)
+            except KeyError as e:
+                logger.warning(f"⚠ {strategy['name']} cannot run on {state.symbol}: {e}")
+                continue
+            tracker = ProofTracker(df, path, strategy['params'], strategy['direction'], self.window_bars)
+            tracker.add_signals(np.flatnonzero(matches))
+            trackers[strategy['name']] = tracker
+        return trackers
+
+    def _scan(self, symbol: str, state: SymbolState, trackers: Dict[str, ProofTracker], i: int, log: List[tuple]) -> None:
+        """Evaluate every strategy on bar i and log matches with their proof."""
+        columns = state.columns()
+        timestamp = state.last_timestamp
+        for strategy in self.strategies:
+            tracker = trackers.get(strategy['name'])
+            if tracker is None:
+                continue
+            self.stats["evaluations"] += 1
+            if not strategy['compiled'].evaluate_last(columns):
+                continue
+
+            tracker.add_signals([i])
+            tracker.advance(i)
+            proof = tracker.proof(i)
+            history = tracker.summary(i)
+            wins = proof.count('TP')
+            self.stats["signals"] += 1
+            log.append((
+                timestamp, symbol, strategy['name'], strategy['direction'], float(columns['close'][-1]),
+                '|'.join(proof), wins, wins / len(proof) * 100,
+                history['total'], history['wins'], history['losses'], history['open'],
+                history['win_rate'], history['expectancy'] * 100, history['avg_duration_bars']
+            ))
+
+
+def write_signal_log(log: pd.DataFrame, path: str) -> str:
+    """
+    Write a replay signal log as Parquet (.parquet suffix) or CSV.
+
+    Parquet needs pyarrow or fastparquet; without either the log is written
+    as CSV next to the requested path.
+
+    Args:
+        log: Output of ReplayScanner.run
+        path: Output file path
+
+    Returns:
+        Path actually written
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix == '.parquet':
+        compact = log.astype({'asset': 'category', 'strategy': 'category', 'direction': 'category'})
+        try:
+            compact.to_parquet(path, index=False)
+            return str(path)
+        except ImportError as e:
+            logger.warning(f"Parquet unavailable ({e}), writing CSV instead")
+            path = path.with_suffix('.csv')
+    log.to_csv(path, index=False, float_format='%.8g')
+    return str(path)
@@ -0,0 +1,579 @@
+"""
+Long-running scanner for Market Scanner Core System.
+
+The one-shot scanner reloads and recomputes everything on every run. The
+daemon loads each symbol's history once, then keeps it in memory together
+with the streaming indicator state (IncrementalIndicators) and the
+higher-timeframe state (MultiTimeframeState). It wakes on each candle
+boundary, fetches only the candles that closed since the last one it holds,
+folds them in with O(1) work per bar, and re-evaluates every strategy on the
+new last bar. Fed by a KlineStream instead (run_stream), it re-evaluates each
+symbol as soon as its closed candle arrives, without polling.
+
+Reports and signal events are written only when the set of active signals
+(asset, strategy) changes: a new match opens a signal (and runs the proof
+engine for it), a match that no longer holds closes it.
+
+Any ccxt-compatible exchange works; FakeExchange plus SimulatedClock
+(src/fake_exchange.py) run the whole loop offline.
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+import ccxt
+from .analysis import MacroPanel, merge_macro_data, merge_sentiment_data
+from .backtester import backtest_all_signals, format_proof, summarize_trades
+from .candle_store import get_candle_store, DEFAULT_CACHE_DIR
+from .data_loader import OHLCV_COLUMNS, fetch_crypto_data, fetch_ohlcv_rows, timeframe_to_ms
+from .fake_exchange import SystemClock
+from .incremental import IncrementalIndicators
+from .multi_timeframe import MultiTimeframeState, add_timeframe_features
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEFRAME = '1h'
+
+# Seconds to wait after a candle boundary before polling (exchange close latency)
+DEFAULT_GRACE_SECONDS = 5.0
+
+# Indicator values copied onto every signal (None when missing or NaN)
+SIGNAL_INDICATORS = ['macd', 'macd_signal', 'macd_histogram', 'stoch_rsi_k', 'stoch_rsi_d', 'rsi_4h', 'rsi_1d']
+
+EVENT_OPENED = "opened"
+EVENT_CLOSED = "closed"
+
+
+def build_signal(
+    symbol: str,
+    strategy: Dict[str, Any],
+    timestamp: pd.Timestamp,
+    data
+) -> Dict[str, Any]:
+    """
+    Build the signal record of a strategy matching on the last bar.
+
+    Args:
+        symbol: Trading pair
+        strategy: Strategy dict from load_strategies()
+        timestamp: Open time of the last bar
+        data: DataFrame or mapping of {column: NumPy array} (last row is used)
+
+    Returns:
+        Signal dictionary (asset, strategy, direction, entry_price, indicators...)
+    """
+    signal = {
+        "asset": symbol,
+        "strategy": strategy['name'],
+        "strategy_type": strategy['type'],
+        "direction": strategy['direction'],
+        "timestamp": pd.Timestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S'),
+        "entry_price": float(np.asarray(data['close'])[-1]),
+        "condition": strategy['condition'],
+        "params": strategy['params'],
+    }
+    for col in SIGNAL_INDICATORS:
+        value = float(np.asarray(data[col])[-1]) if col in data else np.nan
+        signal[col] = None if np.isnan(value) else value
+    return signal
+
+
+def verify_signal(signal: Dict[str, Any], df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Attach backtest proof (last 3 occurrences) and full-history stats to a signal.
+
+    Args:
+        signal: Output of build_signal
+        df: Analyzed DataFrame of the signal's asset
+
+    Returns:
+        The signal, with proof, history and win_rate (% of the last 3 that hit TP)
+    """
+    trades = backtest_all_signals(
+        df,
+        signal['condition'],
+        stop_loss_pct=signal['params']['stop_loss_pct'],
+        take_profit_pct=signal['params']['take_profit_pct'],
+        direction=signal['direction']
+    )
+    signal['proof'] = format_proof(trades)
+    signal['history'] = summarize_trades(trades)
+    wins = sum(1 for r in signal['proof'] if r['result'] == 'TP')
+    signal['win_rate'] = (wins / len(signal['proof']) * 100) if signal['proof'] else 0
+    return signal
+
+
+def merge_context(
+    df: pd.DataFrame,
+    macro_panel: Optional[MacroPanel] = None,
+    sentiment_windows: Optional[pd.DataFrame] = None
+) -> pd.DataFrame:
+    """Merge macro closes and rolling sentiment onto a frame (each optional)."""
+    if macro_panel is not None:
+        df = merge_macro_data(df, macro_panel)
+    if sentiment_windows is not None and not sentiment_windows.empty:
+        df = merge_sentiment_data(df, sentiment_windows)
+    return df
+
+
+class SymbolState:
+    """
+    In-memory analyzed frame of one symbol, grown one closed candle at a time.
+
+    Columns are kept as NumPy buffers with spare capacity, so appending a bar
+    is amortized O(1) and columns() hands zero-copy views to the condition
+    evaluator. With max_bars set the oldest rows are dropped on growth (at
+    least max_bars rows are always kept); the streaming state is unaffected.
+    """
+
+    def __init__(
+        self,
+        symbol: str,
+        frame: pd.DataFrame,
+        indicators: IncrementalIndicators,
+        mtf: MultiTimeframeState,
+        max_bars: Optional[int] = None
+    ):
+        """
+        Args:
+            symbol: Trading pair
+            frame: Analyzed history (OHLCV, indicators, higher-timeframe and context columns)
+            indicators: Streaming indicator state positioned after the last row of frame
+            mtf: Higher-timeframe state positioned after the last row of frame
+            max_bars: Optional number of rows to keep in memory (default: unbounded)
+        """
+        self.symbol = symbol
+        self.indicators = indicators
+        self.mtf = mtf
+        self.max_bars = max_bars
+        self._size = 0
+        self._times = np.empty(0, dtype='datetime64[ns]')
+        self._columns: Dict[str, np.ndarray] = {}
+        self._extend(frame.index, {col: frame[col].to_numpy() for col in frame.columns})
+
+    @classmethod
+    def from_history(
+        cls,
+        symbol: str,
+        history: pd.DataFrame,
+        macro_panel: Optional[MacroPanel] = None,
+        sentiment_windows: Optional[pd.DataFrame] = None,
+        max_bars: Optional[int] = None
+    ) -> "SymbolState":
+        """
+        Analyze a closed-candle OHLCV history and seed the streaming state from it.
+
+        Args:
+            symbol: Trading pair
+            history: OHLCV DataFrame indexed by candle open time (closed candles only)
+            macro_panel: Optional macro closes to merge
+            sentiment_windows: Optional rolling sentiment (SentimentSeries.rolling)
+            max_bars: Optional number of rows to keep in memory
+
+        Returns:
+            SymbolState positioned after the last row of history
+        """
+        history = history[OHLCV_COLUMNS[1:]]
+        indicators = IncrementalIndicators()
+        frame = history.join(indicators.update_many(history))
+        frame = add_timeframe_features(frame)
+        frame = merge_context(frame, macro_panel, sentiment_windows)
+        return cls(symbol, frame, indicators, MultiTimeframeState.from_frame(history), max_bars)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def last_timestamp(self) -> Optional[pd.Timestamp]:
+        return pd.Timestamp(self._times[self._size - 1]) if self._size else None
+
+    def append(
+        self,
+        rows: np.ndarray,
+        macro_panel: Optional[MacroPanel] = None,
+        sentiment_windows: Optional[pd.DataFrame] = None
+    ) -> int:
+        """
+        Fold newly closed candles into the state and the buffers.
+
+        Args:
+            rows: (n, 6) closed candles (timestamp_ms, open, high, low, close,
+                  volume); rows not newer than last_timestamp are ignored
+            macro_panel: Optional macro closes to merge onto the new rows
+            sentiment_windows: Optional rolling sentiment to merge onto the new rows
+
+        Returns:
+            Number of bars appended
+        """
+        rows = np.asarray(rows, dtype=np.float64).reshape(-1, len(OHLCV_COLUMNS))
+        if self._size:
+            rows = rows[rows[:, 0] > self.last_timestamp.value // 10**6]
+        if len(rows) == 0:
+            return 0
+
+        index = pd.to_datetime(rows[:, 0].astype(np.int64), unit='ms')
+        values: Dict[str, list] = {}
+        for timestamp, row in zip(index, rows[:, 1:].tolist()):
+            bar = dict(zip(OHLCV_COLUMNS[1:], row))
+            for col, value in {**bar, **self.indicators.update(bar), **self.mtf.update(timestamp, bar)}.items():
+                values.setdefault(col, []).append(value)
+        columns = {col: np.asarray(column) for col, column in values.items()}
+
+        if macro_panel is not None or sentiment_windows is not None:
+            context = merge_context(pd.DataFrame(index=index), macro_panel, sentiment_windows)
+            columns.update({col: context[col].to_numpy() for col in context.columns})
+        self._extend(index, columns)
+        return len(rows)
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Return {column: NumPy view} of the rows held (no copy; valid until the next append)."""
+        return {col: values[:self._size] for col, values in self._columns.items()}
+
+    def frame(self) -> pd.DataFrame:
+        """Return the rows held as a DataFrame (copy)."""
+        index = pd.DatetimeIndex(self._times[:self._size].copy(), name='timestamp')
+        return pd.DataFrame({col: values[:self._size].copy() for col, values in self._columns.items()}, index=index)
+
+    def _extend(self, index: pd.DatetimeIndex, columns: Dict[str, np.ndarray]) -> None:
+        self._reserve(len(index))
+        start, stop = self._size, self._size + len(index)
+        self._times[start:stop] = index.values.astype('datetime64[ns]')
+
+        for col, values in columns.items():
+            if col not in self._columns:
+                # A column first seen now (e.g. macro panel added later) is missing before
+                self._columns[col] = _empty_column(values.dtype, len(self._times))
+            self._columns[col][start:stop] = values
+        for col, buffer in self._columns.items():
+            if col not in columns:
+                buffer[start:stop] = _missing_value(buffer.dtype)
+        self._size = stop
+
+    def _reserve(self, extra: int) -> None:
+        """Make room for `extra` rows, dropping the oldest beyond max_bars."""
+        if self._size + extra <= len(self._times):
+            return
+        keep = self._size if self.max_bars is None else min(self._size, max(self.max_bars - extra, 0))
+        capacity = max(2 * (keep + extra), 64)
+        first = self._size - keep
+
+        times = np.empty(capacity, dtype='datetime64[ns]')
+        times[:keep] = self._times[first:self._size]
+        self._times = times
+        for col, buffer in self._columns.items():
+            resized = _empty_column(buffer.dtype, capacity)
+            resized[:keep] = buffer[first:self._size]
+            self._columns[col] = resized
+        self._size = keep
+
+
+def _empty_column(dtype: np.dtype, capacity: int) -> np.ndarray:
+    column = np.empty(capacity, dtype=dtype)
+    column[:] = _missing_value(dtype)
+    return column
+
+
+def _missing_value(dtype: np.dtype):
+    return False if dtype == np.bool_ else np.nan
+
+
+class ScannerDaemon:
+    """
+    Candle-close driven scanner holding every symbol's state in memory.
+
+    Usage:
+        daemon = ScannerDaemon(symbols, load_strategies(), on_change=write_report)
+        daemon.run()  # bootstrap, then step() after every 1h candle close
+    """
+
+    def __init__(
+        self,
+        symbols: Iterable[str],
+        strategies: List[Dict[str, Any]],
+        exchange=None,
+        clock=None,
+        days: int = 180,
+        timeframe: str = DEFAULT_TIMEFRAME,
+        on_change: Optional[Callable[[List[Dict[str, Any]], List[Dict[str, Any]]], None]] = None,
+        events_path: Optional[str] = None,
+        use_cache: bool = True,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        max_bars: Optional[int] = None,
+        grace_seconds: float = DEFAULT_GRACE_SECONDS
+    ):
+        """
+        Args:
+            symbols: Trading pairs to scan
+            strategies: Strategy dicts from load_strategies()
+            exchange: ccxt exchange (default: ccxt.binance(), created on first fetch)
+            clock: Object with now_ms() and sleep(seconds) (default: SystemClock)
+            days: Days of history loaded at bootstrap
+            timeframe: Candle timeframe (default: 1h)
+            on_change: Called as on_change(active_signals, events) whenever the
+                       active signal set changes (e.g. to rewrite the report)
+            events_path: Optional JSON-lines file receiving every signal event
+            use_cache: Load history from / append new candles to the candle store
+            cache_dir: Candle store directory (default: data/cache)
+            max_bars: Optional number of rows kept per symbol (default: unbounded)
+            grace_seconds: Delay after a candle boundary before polling
+        """
+        self.symbols = list(symbols)
+        self.strategies = strategies
+        self.exchange = exchange
+        self.clock = clock or SystemClock()
+        self.days = days
+        self.timeframe = timeframe
+        self.on_change = on_change
+        self.events_path = Path(events_path) if events_path else None
+        self.use_cache = use_cache
+        self.cache_dir = cache_dir
+        self.max_bars = max_bars
+        self.grace_seconds = grace_seconds
+
+        self.macro_panel: Optional[MacroPanel] = None
+        self.sentiment_windows: Optional[pd.DataFrame] = None
+        self.states: Dict[str, SymbolState] = {}
+        self.active: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.stats = {"cycles": 0, "bars": 0, "fetches": 0, "changes": 0}
+        self._failed: set = set()
+        self._tf_ms = timeframe_to_ms(timeframe)
+
+    def set_context(
+        self,
+        macro_panel: Optional[MacroPanel] = None,
+        sentiment_windows: Optional[pd.DataFrame] = None
+    ) -> None:
+        """Set the macro panel / rolling sentiment merged onto bars appended from now on."""
+        self.macro_panel = macro_panel
+        self.sentiment_windows = sentiment_windows
+
+    def bootstrap(self) -> List[Dict[str, Any]]:
+        """
+        Load and analyze every symbol's history, then evaluate the strategies once.
+
+        Returns:
+            Signal events for the signals active on the last closed bar
+        """
+        latest_closed = self._latest_closed()
+        for symbol in self.symbols:
+            history = fetch_crypto_data(
+                symbol, self.days, exchange=self.exchange,
+                use_cache=self.use_cache, cache_dir=self.cache_dir
+            )
+            if history.empty:
+                logger.warning(f"⚠ No history for {symbol}, skipping")
+                continue
+            # The uncached path may include the still-forming candle
+            history = history[history.index <= pd.Timestamp(latest_closed, unit='ms')]
+            self.states[symbol] = SymbolState.from_history(
+                symbol, history, self.macro_panel, self.sentiment_windows, self.max_bars
+            )
+            logger.info(f"✓ {symbol}: {len(self.states[symbol])} bars in memory")
+        return self._evaluate(self.states)
+
+    def step(self) -> List[Dict[str, Any]]:
+        """
+        Fetch candles closed since the last step, fold them in and re-evaluate.
+
+        Returns:
+            Signal events (opened / closed) caused by the new bars; empty if
+            nothing changed
+        """
+        self.stats["cycles"] += 1
+        latest_closed = self._latest_closed()
+        updated = {}
+        for symbol, state in self.states.items():
+            try:
+                rows = self._fetch_closed(symbol, self._next_open(state), latest_closed)
+                appended = self._append_rows(symbol, state, rows)
+            except Exception as e:
+                logger.error(f"✗ Error updating {symbol}: {e}")
+                continue
+            if appended:
+                updated[symbol] = state
+
+        if not updated:
+            logger.info("No new closed candles")
+            return []
+        return self._evaluate(updated)
+
+    def ingest(self, symbol: str, rows: np.ndarray) -> List[Dict[str, Any]]:
+        """
+        Fold streamed closed candles of one symbol and re-evaluate it.
+
+        Candles missed by the stream (e.g. during a reconnect) are fetched
+        over REST before the streamed ones are appended.
+
+        Args:
+            symbol: Trading pair
+            rows: (n, 6) closed candles (timestamp_ms, open, high, low, close, volume)
+
+        Returns:
+            Signal events caused by the new bars
+        """
+        state = self.states.get(symbol)
+        if state is None or len(rows) == 0:
+            return []
+
+        rows = rows[rows[:, 0] >= self._next_open(state)]
+        if len(rows) and rows[0, 0] > self._next_open(state):
+            gap = self._fetch_closed(symbol, self._next_open(state), int(rows[0, 0]) - self._tf_ms)
+            logger.info(f"Backfilled {len(gap)} missed {symbol} candles over REST")
+            rows = np.concatenate([gap, rows])
+        if not self._append_rows(symbol, state, rows):
+            return []
+        return self._evaluate({symbol: state})
+
+    def run_stream(
+        self,
+        stream,
+        source,
+        max_events: Optional[int] = None,
+        before_step: Optional[Callable[["ScannerDaemon"], None]] = None
+    ) -> None:
+        """
+        Bootstrap (if needed), then re-evaluate each symbol as its candle closes on a stream.
+
+        Args:
+            stream: KlineStream subscribed to the daemon's symbols
+            source: Event source (BinanceKlineSource, ReplaySource, ...)
+            max_events: Stop after this many events (default: until the source ends)
+            before_step: Optional hook called once per new candle open time,
+                         before the first symbol of that candle is ingested
+        """
+        if not self.states:
+            self.bootstrap()
+
+        current_open = None
+        for symbol in stream.consume(source, max_events):
+            state = self.states.get(symbol)
+            if state is None:
+                continue
+            rows = stream.buffers[symbol].since(self._next_open(state) - 1)
+            if before_step is not None and len(rows) and (current_open is None or rows[-1, 0] > current_open):
+                current_open = rows[-1, 0]
+                before_step(self)
+            try:
+                self.ingest(symbol, rows)
+            except Exception as e:
+                logger.error(f"✗ Error ingesting {symbol}: {e}")
+
+    def run(
+        self,
+        max_cycles: Optional[int] = None,
+        before_step: Optional[Callable[["ScannerDaemon"], None]] = None
+    ) -> None:
+        """
+        Bootstrap (if needed), then sleep until each candle close and step().
+
+        Args:
+            max_cycles: Stop after this many steps (default: run forever)
+            before_step: Optional hook called before every step (e.g. to
+                         refresh the macro / sentiment context)
+        """
+        if not self.states:
+            self.bootstrap()
+
+        cycles = 0
+        while max_cycles is None or cycles < max_cycles:
+            now = self.clock.now_ms()
+            wake = (now // self._tf_ms + 1) * self._tf_ms + int(self.grace_seconds * 1000)
+            self.clock.sleep((wake - now) / 1000)
+
+            if before_step is not None:
+                before_step(self)
+            self.step()
+            cycles += 1
+
+    def active_signals(self) -> List[Dict[str, Any]]:
+        """Return the active signals in the order they opened."""
+        return list(self.active.values())
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return counters: cycles, bars appended, fetches (REST pulls), changes."""
+        return dict(self.stats)
+
+    def _latest_closed(self) -> int:
+        """Open time (ms) of the newest candle that has closed by clock time."""
+        return (self.clock.now_ms() // self._tf_ms) * self._tf_ms - self._tf_ms
+
+    def _next_open(self, state: SymbolState) -> int:
+        """Open time (ms) of the candle following the state's last bar."""
+        return int(state.last_timestamp.value // 10**6) + self._tf_ms
+
+    def _fetch_closed(self, symbol: str, since: int, until: int) -> np.ndarray:
+        """Fetch closed candles opened in [since, until] (paginated, throttled, retried on network errors)."""
+        if since > until:
+            return np.empty((0, len(OHLCV_COLUMNS)))
+        if self.exchange is None:
+            self.exchange = ccxt.binance()
+
+        self.stats["fetches"] += 1
+        return fetch_ohlcv_rows(self.exchange, symbol, self.timeframe, since=since, until=until)
+
+    def _append_rows(self, symbol: str, state: SymbolState, rows: np.ndarray) -> int:
+        """Store new closed candles (candle store + in-memory state); returns bars appended."""
+        if len(rows) == 0:
+            return 0
+        if self.use_cache:
+            get_candle_store(self.cache_dir).append(symbol, self.timeframe, rows)
+        appended = state.append(rows, self.macro_panel, self.sentiment_windows)
+        self.stats["bars"] += appended
+        return appended
+
+    def _evaluate(self, states: Dict[str, SymbolState]) -> List[Dict[str, Any]]:
+        """Re-evaluate the strategies on the updated symbols and emit changes."""
+        events = []
+        for symbol, state in states.items():
+            columns = state.columns()
+            frame = None
+            for strategy in self.strategies:
+                key = (symbol, strategy['name'])
+                try:
+                    matched = strategy['compiled'].evaluate_last(columns)
+                except KeyError as e:
+                    if key not in self._failed:
+                        self._failed.add(key)
+                        logger.warning(f"⚠ {strategy['name']} cannot run on {symbol}: {e}")
+                    continue
+
+                if matched and key not in self.active:
+                    signal = build_signal(symbol, strategy, state.last_timestamp, columns)
+                    if frame is None:
+                        frame = state.frame()
+                    self.active[key] = verify_signal(signal, frame)
+                    events.append(self._event(EVENT_OPENED, self.active[key], state.last_timestamp))
+                    logger.info(f"  ✓ SIGNAL OPENED: {symbol} {strategy['name']} @ ${signal['entry_price']:.2f}")
+                elif not matched and key in self.active:
+                    signal = self.active.pop(key)
+                    events.append(self._event(EVENT_CLOSED, signal, state.last_timestamp))
+                    logger.info(f"  ✓ Signal closed: {symbol} {strategy['name']}")
+
+        if events:
+            self.stats["changes"] += 1
+            self._write_events(events)
+            if self.on_change is not None:
+                self.on_change(self.active_signals(), events)
+        return events
+
+    @staticmethod
+    def _event(kind: str, signal: Dict[str, Any], timestamp: pd.Timestamp) -> Dict[str, Any]:
+        return {
+            "event": kind,
+            "bar": timestamp.strftime('%Y-%m-%d %H:%M:%S'),
+            "asset": signal['asset'],
+            "strategy": signal['strategy'],
+            "direction": signal['direction'],
+            "entry_price": signal['entry_price'],
+            "win_rate": signal.get('win_rate'),
+        }
+
+    def _write_events(self, events: List[Dict[str, Any]]) -> None:
+        if self.events_path is None:
+            return
+        self.events_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.events_path, 'a', encoding='utf-8') as f:
+            f.writelines(json.dumps(event) + '\n' for event in events)
@@ -0,0 +1,183 @@
+"""
+Persistent headline sentiment cache for Market Scanner Core System.
+
+RSS feeds repeat most titles from one run to the next, so TextBlob polarity is
+stored per headline, keyed by a hash of the normalized text (case and
+whitespace differences do not change TextBlob's score). The cache is bounded:
+once it holds more than `max_entries` headlines the least recently used are
+evicted. It is persisted as one small JSON file written once per batch.
+
+Layout:
+    <cache_dir>/sentiment/polarity.json
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List
+from textblob.sentiments import PatternAnalyzer
+from .candle_store import DEFAULT_CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 20000
+
+
+def headline_key(headline: str) -> str:
+    """Return the cache key of a headline (hash of its case/whitespace-normalized text)."""
+    normalized = ' '.join(headline.split()).casefold()
+    return hashlib.blake2b(normalized.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class SentimentCache:
+    """
+    Size-bounded, persistent headline -> polarity cache with hit/miss counters.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Args:
+            cache_dir: Root cache directory (default: data/cache)
+            max_entries: Maximum number of headlines kept (LRU eviction)
+        """
+        self.path = Path(cache_dir) / "sentiment" / "polarity.json"
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, float]" = self._read()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def score(self, headlines: Iterable[str]) -> List[float]:
+        """
+        Return the polarity of every headline, scoring only uncached ones.
+
+        Args:
+            headlines: Headline strings
+
+        Returns:
+            List of polarity scores (-1 to +1) in input order; headlines that
+            fail to score are left out
+        """
+        keys = [(headline_key(headline), headline) for headline in headlines]
+        polarities = self.lookup(dict(keys))
+        return [polarities[key] for key, _ in keys if key in polarities]
+
+    def lookup(self, headlines: Dict[str, str]) -> Dict[str, float]:
+        """
+        Return polarities by cache key, scoring only uncached headlines.
+
+        New headlines are scored in one pass with a single analyzer and
+        persisted with one write.
+
+        Args:
+            headlines: Dictionary of {headline_key: headline}
+
+        Returns:
+            Dictionary of {headline_key: polarity}; headlines that fail to
+            score are left out
+        """
+        with self._lock:
+            new = {key: headline for key, headline in headlines.items() if key not in self._entries}
+            self.stats["hits"] += len(headlines) - len(new)
+            self.stats["misses"] += len(new)
+
+        if new:
+            scored = score_headlines(new)
+            with self._lock:
+                self._entries.update(scored)
+                self._evict()
+                self._write()
+
+        with self._lock:
+            polarities = {}
+            for key in headlines:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    polarities[key] = self._entries[key]
+            return polarities
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        Return cache counters plus hit rate.
+
+        Returns:
+            Dictionary with hits, misses, requests, entries and hit_rate (0-1)
+        """
+        with self._lock:
+            stats = dict(self.stats)
+            stats["entries"] = len(self._entries)
+        requests = stats["hits"] + stats["misses"]
+        stats["requests"] = requests
+        stats["hit_rate"] = stats["hits"] / requests if requests else 0.0
+        return stats
+
+    def _evict(self) -> None:
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _read(self) -> "OrderedDict[str, float]":
+        """Load the persisted entries (oldest first); a missing or corrupt file starts empty."""
+        if not self.path.exists():
+            return OrderedDict()
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return OrderedDict((key, float(polarity)) for key, polarity in json.load(f))
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable sentiment cache {self.path}: {e}")
+            return OrderedDict()
+
+    def _write(self) -> None:
+        """Persist entries in LRU order (atomic replace)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(list(self._entries.items()), f, separators=(',', ':'))
+        tmp_path.replace(self.path)
+
+
+def score_headlines(headlines: Dict[str, str]) -> Dict[str, float]:
+    """
+    Score headlines with TextBlob's default (pattern) analyzer.
+
+    Args:
+        headlines: Dictionary of {cache_key: headline}
+
+    Returns:
+        Dictionary of {cache_key: polarity}; headlines that fail are skipped
+    """
+    analyzer = PatternAnalyzer()
+    scored = {}
+    for key, headline in headlines.items():
+        try:
+            scored[key] = float(analyzer.analyze(headline).polarity)
+        except Exception as e:
+            logger.warning(f"Error analyzing headline '{headline[:50]}...': {e}")
+    return scored
+
+
+_caches: Dict[str, SentimentCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_sentiment_cache(cache_dir: str = DEFAULT_CACHE_DIR) -> SentimentCache:
+    """
+    Return the shared SentimentCache for a cache directory (one per process).
+
+    Args:
+        cache_dir: Root cache directory (default: data/cache)
+
+    Returns:
+        SentimentCache instance
+    """
+    key = str(Path(cache_dir).resolve())
+    with _caches_lock:
+        if key not in _caches:
+            _caches[key] = SentimentCache(cache_dir)
+        return _caches[key]
+
+
+def get_sentiment_stats(cache_dir: str = DEFAULT_CACHE_DIR) -> Dict[str, float]:
+    """Return hit/miss counters for the shared sentiment cache of a cache directory."""
+    return get_sentiment_cache(cache_dir).get_stats()
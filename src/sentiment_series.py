@@ -0,0 +1,177 @@
+"""
+Time-series news sentiment for Market Scanner Core System.
+
+Headlines from the HeadlineStore log are scored (through the SentimentCache)
+and aggregated into hourly buckets of (polarity sum, headline count) keyed by
+publish hour. Buckets are updated incrementally: each update only reads the
+log lines appended since the previous one, so new headlines never trigger a
+rescan of the history.
+
+Rolling windows (e.g. sentiment_24h = mean polarity of the headlines published
+in the last 24 hours) are derived from the buckets and merged onto a crypto
+frame with the same as-of join as merge_macro_data. A bar sees the headlines
+published up to its close, so conditions like `sentiment_24h > 0.3` can be
+backtested without lookahead. Windows without headlines are NaN.
+
+Layout:
+    <cache_dir>/sentiment/hourly.json   # {offset, buckets: [[hour_ms, sum, count], ...]}
+"""
+
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+from .candle_store import DEFAULT_CACHE_DIR
+from .data_loader import timeframe_to_timedelta
+from .headline_store import HeadlineStore
+from .sentiment_cache import SentimentCache
+
+logger = logging.getLogger(__name__)
+
+# Rolling windows merged onto the price frame as sentiment_{window}
+DEFAULT_SENTIMENT_WINDOWS = ('24h', '7d')
+
+BUCKET_MS = 60 * 60 * 1000
+
+
+def sentiment_column_name(window: str) -> str:
+    """Return the merged column name of a rolling window (e.g. sentiment_24h)."""
+    return f"sentiment_{window}"
+
+
+class SentimentSeries:
+    """
+    Persistent hourly sentiment buckets, updated incrementally from the headline log.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR):
+        """
+        Args:
+            cache_dir: Root cache directory (default: data/cache)
+        """
+        self.path = Path(cache_dir) / "sentiment" / "hourly.json"
+        self._lock = threading.Lock()
+        self._offset, self._buckets = self._read()
+
+    def update(self, store: HeadlineStore, cache: SentimentCache) -> int:
+        """
+        Fold headlines appended to the log since the last update into the buckets.
+
+        Args:
+            store: HeadlineStore whose log is followed
+            cache: SentimentCache used to score the new headlines
+
+        Returns:
+            Number of headlines added
+        """
+        with self._lock:
+            rows, offset = store.read_log(self._offset)
+            if offset == self._offset:
+                return 0
+
+            polarities = cache.lookup(dict(zip(rows['key'], rows['title'])))
+            added = 0
+            for published, key in zip(rows['published'], rows['key']):
+                if key not in polarities:
+                    continue
+                bucket = self._buckets.setdefault(int(published) // BUCKET_MS * BUCKET_MS, [0.0, 0])
+                bucket[0] += polarities[key]
+                bucket[1] += 1
+                added += 1
+
+            self._offset = offset
+            self._write()
+
+        logger.info(f"✓ Sentiment series: +{added} headlines ({len(self._buckets)} hourly buckets)")
+        return added
+
+    def hourly(self, until: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        """
+        Return the buckets on a continuous hourly index.
+
+        Args:
+            until: Extend the index to this time (default: last bucket)
+
+        Returns:
+            DataFrame with polarity_sum and headlines per publish hour (zeros
+            for hours without headlines); empty DataFrame if nothing stored
+        """
+        with self._lock:
+            items = sorted(self._buckets.items())
+        if not items:
+            return pd.DataFrame(columns=['polarity_sum', 'headlines'])
+
+        hours = np.array([hour for hour, _ in items], dtype=np.int64)
+        values = np.array([bucket for _, bucket in items], dtype=np.float64)
+        frame = pd.DataFrame(values, index=pd.to_datetime(hours, unit='ms'), columns=['polarity_sum', 'headlines'])
+
+        end = frame.index[-1]
+        if until is not None:
+            end = max(end, pd.Timestamp(until).floor('h'))
+        return frame.reindex(pd.date_range(frame.index[0], end, freq='h'), fill_value=0.0)
+
+    def rolling(
+        self,
+        windows: Sequence[str] = DEFAULT_SENTIMENT_WINDOWS,
+        until: Optional[pd.Timestamp] = None
+    ) -> pd.DataFrame:
+        """
+        Mean headline polarity over trailing time windows, per hour.
+
+        Args:
+            windows: Window lengths (e.g. '24h', '7d')
+            until: Extend the series to this time (default: last bucket)
+
+        Returns:
+            DataFrame with sentiment_{window} columns on an hourly index
+            (NaN when a window holds no headline)
+        """
+        hourly = self.hourly(until)
+        result = pd.DataFrame(index=hourly.index)
+        for window in windows:
+            totals = hourly.rolling(timeframe_to_timedelta(window)).sum()
+            result[sentiment_column_name(window)] = totals['polarity_sum'] / totals['headlines'].replace(0, np.nan)
+        return result
+
+    def _read(self) -> Tuple[int, Dict[int, list]]:
+        if not self.path.exists():
+            return 0, {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            return int(state['offset']), {int(hour): [float(total), int(count)] for hour, total, count in state['buckets']}
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Rebuilding unreadable sentiment series {self.path}: {e}")
+            return 0, {}
+
+    def _write(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        state = {"offset": self._offset, "buckets": [[hour, b[0], b[1]] for hour, b in sorted(self._buckets.items())]}
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, separators=(',', ':'))
+        tmp_path.replace(self.path)
+
+
+_series: Dict[str, SentimentSeries] = {}
+_series_lock = threading.Lock()
+
+
+def get_sentiment_series(cache_dir: str = DEFAULT_CACHE_DIR) -> SentimentSeries:
+    """
+    Return the shared SentimentSeries for a cache directory (one per process).
+
+    Args:
+        cache_dir: Root cache directory (default: data/cache)
+
+    Returns:
+        SentimentSeries instance
+    """
+    key = str(Path(cache_dir).resolve())
+    with _series_lock:
+        if key not in _series:
+            _series[key] = SentimentSeries(cache_dir)
+        return _series[key]
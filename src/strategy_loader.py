@@ -3,16 +3,313 @@ Strategy loader module for Market Scanner Core System.
 
 This module reads and parses trading strategies from specs/04_strategies.md.
 Strategies are defined in Markdown format with structured sections.
+
+Condition strings are compiled once (see compile_condition) into vectorized
+evaluators that work directly on NumPy column arrays, so the same compiled
+form is reused for every symbol, for the live-bar check and for the
+historical signal scan.
+
+Derived series such as `volume.rolling(20).mean()` are recognised inside
+conditions and replaced by named feature columns (e.g. volume_rolling_20_mean).
+They are computed once per frame by add_condition_features() and shared by
+every strategy that references the same (column, window, function).
 """
 
+import ast
 import logging
 import re
-from typing import List, Dict, Any
+from functools import lru_cache
+from typing import List, Dict, Any, Iterable, Mapping, Optional, Tuple, Union
 from pathlib import Path
+import numpy as np
 import pandas as pd
+from .exit_engine import DIRECTION_LONG, DIRECTION_SHORT
+from .multi_timeframe import HIGHER_TIMEFRAMES, DEFAULT_MTF_COLUMNS, mtf_column_name
+from .sentiment_series import DEFAULT_SENTIMENT_WINDOWS, sentiment_column_name
 
 logger = logging.getLogger(__name__)
 
+# Operators allowed in strategy conditions (pandas query subset)
+_ALLOWED_BINOPS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow)
+_ALLOWED_UNARYOPS = (ast.USub, ast.UAdd, ast.Not, ast.Invert)
+_ALLOWED_CMPOPS = (ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.Eq, ast.NotEq)
+
+# Rolling aggregations allowed in conditions (`col.rolling(N).<func>()`)
+ROLLING_FUNCS = ('mean', 'std', 'min', 'max', 'sum', 'median')
+
+
+def feature_column_name(column: str, window: int, func: str) -> str:
+    """Return the feature column name for a rolling expression (e.g. volume_rolling_20_mean)."""
+    return f"{column}_rolling_{window}_{func}"
+
+
+def rolling_feature(values: np.ndarray, window: int, func: str) -> np.ndarray:
+    """
+    Compute a rolling aggregation with pandas semantics (NaN until the window is full).
+    
+    Args:
+        values: Source column values
+        window: Rolling window length in bars
+        func: One of ROLLING_FUNCS
+        
+    Returns:
+        Float64 array of the same length as values
+    """
+    rolling = pd.Series(np.asarray(values, dtype=np.float64)).rolling(window)
+    return getattr(rolling, func)().to_numpy()
+
+
+def _as_array(values) -> np.ndarray:
+    return values.to_numpy() if isinstance(values, pd.Series) else np.asarray(values)
+
+
+class CompiledCondition:
+    """
+    A strategy condition compiled to a vectorized boolean mask function.
+    
+    The condition is parsed once into a Python AST where `and` / `or` / `not`
+    and chained comparisons are rewritten to element-wise `&` / `|` / `~`,
+    then compiled to a code object. Evaluation only binds the referenced
+    columns as NumPy arrays; nothing is re-parsed per call.
+    """
+    
+    def __init__(
+        self,
+        source: str,
+        code,
+        columns: Tuple[str, ...],
+        features: Optional[Dict[str, Tuple[str, int, str]]] = None
+    ):
+        """
+        Args:
+            source: Original condition string
+            code: Compiled code object of the rewritten expression
+            columns: Column names referenced by the condition
+            features: Rolling features as {feature_name: (column, window, func)}
+        """
+        self.source = source
+        self.code = code
+        self.columns = columns
+        self.features = dict(features or {})
+    
+    def __repr__(self) -> str:
+        return f"CompiledCondition({self.source!r})"
+    
+    def evaluate(self, data: Union[pd.DataFrame, Mapping[str, np.ndarray]]) -> np.ndarray:
+        """
+        Evaluate the condition on every row.
+        
+        Args:
+            data: DataFrame or mapping of {column: NumPy array}
+            
+        Returns:
+            Boolean NumPy array (NaN comparisons evaluate to False)
+            
+        Raises:
+            KeyError: If a referenced column is missing
+        """
+        namespace = self._bind(data, last_only=False)
+        return self._run(namespace, self._length(data))
+    
+    def evaluate_last(self, data: Union[pd.DataFrame, Mapping[str, np.ndarray]]) -> bool:
+        """
+        Evaluate the condition on the last row only (live-bar check).
+        
+        Args:
+            data: DataFrame or mapping of {column: NumPy array}
+            
+        Returns:
+            True if the condition holds on the last row
+        """
+        if self._length(data) == 0:
+            return False
+        namespace = self._bind(data, last_only=True)
+        return bool(self._run(namespace, 1)[0])
+    
+    def _bind(self, data, last_only: bool) -> Dict[str, np.ndarray]:
+        namespace = {}
+        for col in self.columns:
+            values = _as_array(self._lookup(data, col))
+            namespace[col] = values[-1:] if last_only else values
+        
+        for name, (col, window, func) in self.features.items():
+            if name in data:
+                # Precomputed by add_condition_features()
+                values = _as_array(data[name])
+            else:
+                values = _as_array(self._lookup(data, col))
+                if last_only:
+                    # The last rolling value only depends on the trailing window
+                    values = values[-window:]
+                values = rolling_feature(values, window, func)
+            namespace[name] = values[-1:] if last_only else values
+        return namespace
+    
+    def _lookup(self, data, col: str):
+        if col not in data:
+            raise KeyError(f"Unknown column '{col}' in condition: {self.source}")
+        return data[col]
+    
+    def _run(self, namespace: Dict[str, np.ndarray], length: int) -> np.ndarray:
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result = eval(self.code, {'__builtins__': {}}, namespace)
+        return np.broadcast_to(np.asarray(result, dtype=bool), (length,))
+    
+    @staticmethod
+    def _length(data) -> int:
+        if isinstance(data, pd.DataFrame):
+            return len(data)
+        for values in data.values():
+            return len(values)
+        return 0
+
+
+class _VectorizeCondition(ast.NodeTransformer):
+    """Rewrite a pandas-query style expression into element-wise NumPy operations."""
+    
+    def __init__(self):
+        self.columns = []
+        self.features = {}
+    
+    def visit_BoolOp(self, node: ast.BoolOp) -> ast.AST:
+        op = ast.BitAnd() if isinstance(node.op, ast.And) else ast.BitOr()
+        values = [self.visit(value) for value in node.values]
+        result = values[0]
+        for value in values[1:]:
+            result = ast.BinOp(left=result, op=op, right=value)
+        return result
+    
+    def visit_Compare(self, node: ast.Compare) -> ast.AST:
+        for op in node.ops:
+            if not isinstance(op, _ALLOWED_CMPOPS):
+                raise ValueError(f"Unsupported comparison: {type(op).__name__}")
+        
+        operands = [self.visit(node.left)] + [self.visit(c) for c in node.comparators]
+        parts = [
+            ast.Compare(left=operands[i], ops=[op], comparators=[operands[i + 1]])
+            for i, op in enumerate(node.ops)
+        ]
+        result = parts[0]
+        for part in parts[1:]:
+            result = ast.BinOp(left=result, op=ast.BitAnd(), right=part)
+        return result
+    
+    def visit_UnaryOp(self, node: ast.UnaryOp) -> ast.AST:
+        if not isinstance(node.op, _ALLOWED_UNARYOPS):
+            raise ValueError(f"Unsupported operator: {type(node.op).__name__}")
+        operand = self.visit(node.operand)
+        op = ast.Invert() if isinstance(node.op, ast.Not) else node.op
+        return ast.UnaryOp(op=op, operand=operand)
+    
+    def visit_BinOp(self, node: ast.BinOp) -> ast.AST:
+        if not isinstance(node.op, _ALLOWED_BINOPS + (ast.BitAnd, ast.BitOr)):
+            raise ValueError(f"Unsupported operator: {type(node.op).__name__}")
+        return ast.BinOp(left=self.visit(node.left), op=node.op, right=self.visit(node.right))
+    
+    def visit_Name(self, node: ast.Name) -> ast.AST:
+        if node.id not in self.columns:
+            self.columns.append(node.id)
+        return node
+    
+    def visit_Call(self, node: ast.Call) -> ast.AST:
+        feature = _match_rolling(node)
+        if feature is None:
+            raise ValueError(f"Unsupported call in condition: {ast.unparse(node)}")
+        name = feature_column_name(*feature)
+        self.features[name] = feature
+        return ast.Name(id=name, ctx=ast.Load())
+    
+    def visit_Constant(self, node: ast.Constant) -> ast.AST:
+        if not isinstance(node.value, (int, float, bool)):
+            raise ValueError(f"Unsupported constant: {node.value!r}")
+        return node
+    
+    def generic_visit(self, node: ast.AST) -> ast.AST:
+        if isinstance(node, ast.Expression):
+            return super().generic_visit(node)
+        raise ValueError(f"Unsupported syntax in condition: {type(node).__name__}")
+
+
+def _match_rolling(node: ast.Call) -> Optional[Tuple[str, int, str]]:
+    """Match `col.rolling(N).func()` (or rolling(window=N)) and return (col, N, func)."""
+    func = node.func
+    if not (isinstance(func, ast.Attribute) and func.attr in ROLLING_FUNCS):
+        return None
+    if node.args or node.keywords:
+        return None
+    
+    rolling = func.value
+    if not (isinstance(rolling, ast.Call) and isinstance(rolling.func, ast.Attribute)
+            and rolling.func.attr == 'rolling' and isinstance(rolling.func.value, ast.Name)):
+        return None
+    
+    window_args = list(rolling.args) + [kw.value for kw in rolling.keywords if kw.arg == 'window']
+    if len(window_args) != 1 or len(rolling.args) + len(rolling.keywords) != 1:
+        return None
+    window = window_args[0]
+    if not (isinstance(window, ast.Constant) and type(window.value) is int and window.value > 0):
+        return None
+    
+    return rolling.func.value.id, window.value, func.attr
+
+
+def add_condition_features(df: pd.DataFrame, strategies: Iterable[Any]) -> List[str]:
+    """
+    Precompute the rolling features referenced by strategy conditions.
+    
+    Each (column, window, function) is computed once and stored on the frame as
+    a named column, so every strategy referencing it (and the last-bar check)
+    reads the same values. Columns that already exist are left untouched.
+    
+    Args:
+        df: DataFrame with technical indicators (modified in place)
+        strategies: Strategy dicts from load_strategies(), CompiledConditions or condition strings
+        
+    Returns:
+        List of feature columns added to df
+    """
+    features = {}
+    for strategy in strategies:
+        if isinstance(strategy, dict):
+            compiled = strategy['compiled']
+        elif isinstance(strategy, CompiledCondition):
+            compiled = strategy
+        else:
+            compiled = compile_condition(strategy)
+        features.update(compiled.features)
+    
+    added = []
+    for name, (col, window, func) in features.items():
+        if name in df.columns or col not in df.columns:
+            continue
+        df[name] = rolling_feature(df[col].to_numpy(), window, func)
+        added.append(name)
+    return added
+
+
+@lru_cache(maxsize=None)
+def compile_condition(condition_str: str) -> CompiledCondition:
+    """
+    Compile a strategy condition string once into a reusable evaluator.
+    
+    Results are cached by condition string, so every caller (scanner,
+    backtester, replay) shares the same compiled object.
+    
+    Args:
+        condition_str: Pandas query style condition (e.g., "rsi < 30 and close > ema_200")
+        
+    Returns:
+        CompiledCondition
+        
+    Raises:
+        ValueError / SyntaxError: If the condition uses unsupported syntax
+    """
+    tree = ast.parse(condition_str.strip(), mode='eval')
+    transformer = _VectorizeCondition()
+    tree = ast.fix_missing_locations(transformer.visit(tree))
+    code = compile(tree, '<condition>', 'eval')
+    return CompiledCondition(condition_str, code, tuple(transformer.columns), transformer.features)
+
 
 def load_strategies(specs_dir: str = "specs") -> List[Dict[str, Any]]:
     """
@@ -31,7 +328,9 @@ def load_strategies(specs_dir: str = "specs") -> List[Dict[str, Any]]:
         List of strategy dictionaries with keys:
         - name: str
         - type: str
+        - direction: str ("long", or "short" for the SHORT Strategies section)
         - condition: str (Pandas query)
+        - compiled: CompiledCondition (vectorized evaluator of condition)
         - params: dict (stop_loss_pct, take_profit_pct, position_size_pct)
     """
     try:
@@ -51,37 +350,20 @@ def load_strategies(specs_dir: str = "specs") -> List[Dict[str, Any]]:
         # Parse strategies
         strategies = []
         
-        # Extract each strategy section (starts with "### " followed by a number)
-        strategy_pattern = r'### \d+\.\s+(.+?)\n\n\*\*Type\*\*:\s*(.+?)\n.*?\n\n\*\*Entry Condition\*\*:\s*\n```python\n"(.+?)"\n```.*?\n\*\*Parameters\*\*:\s*\n-\s+Stop Loss:\s*(\d+)%.*?\n-\s+Take Profit:\s*(\d+\.?\d*)%.*?\n-\s+Position Size:\s*([\d.]+)%'
-        
-        matches = re.finditer(strategy_pattern, content, re.DOTALL)
+        # Strategies under the "## SHORT Strategies" heading are shorts
+        long_content, _, short_content = content.partition('## SHORT Strategies')
         
-        for match in matches:
-            name = match.group(1).strip()
-            strategy_type = match.group(2).strip()
-            condition = match.group(3).strip()
-            stop_loss = float(match.group(4)) / 100  # Convert to decimal
-            take_profit = float(match.group(5)) / 100
-            position_size = float(match.group(6)) / 100
-            
-            # Validate condition string
-            if not _validate_condition(condition):
-                logger.warning(f"Invalid condition for strategy '{name}': {condition}")
-                continue
+        for direction, part in ((DIRECTION_LONG, long_content), (DIRECTION_SHORT, short_content)):
+            # Split into one section per strategy (starts with "### " followed by a number)
+            sections = re.split(r'^### \d+\.\s+', part, flags=re.MULTILINE)[1:]
             
-            strategy = {
-                "name": name,
-                "type": strategy_type,
-                "condition": condition,
-                "params": {
-                    "stop_loss_pct": stop_loss,
-                    "take_profit_pct": take_profit,
-                    "position_size_pct": position_size
-                }
-            }
-            
-            strategies.append(strategy)
-            logger.info(f"  ✓ Loaded strategy: {name} ({strategy_type})")
+            for section in sections:
+                strategy = _parse_strategy_section(section, direction)
+                if strategy is None:
+                    continue
+                
+                strategies.append(strategy)
+                logger.info(f"  ✓ Loaded strategy: {strategy['name']} ({strategy['type']}, {direction})")
         
         if not strategies:
             logger.warning("No strategies parsed from file")
@@ -95,9 +377,62 @@ def load_strategies(specs_dir: str = "specs") -> List[Dict[str, Any]]:
         return []
 
 
+def _parse_strategy_section(section: str, direction: str = DIRECTION_LONG) -> Optional[Dict[str, Any]]:
+    """
+    Parse one "### N. Name" section of the strategies file.
+    
+    Stop loss, take profit and position size must be percentages. Exits
+    described in words (e.g., "Below BB upper band") cannot be backtested
+    as fixed levels, so such strategies are skipped with a warning.
+    
+    Args:
+        section: Section text without the "### N. " prefix
+        direction: "long" or "short" (from the section of the file it is in)
+        
+    Returns:
+        Strategy dictionary, or None if the section cannot be loaded
+    """
+    name = section.split('\n', 1)[0].strip()
+    
+    type_match = re.search(r'\*\*Type\*\*:\s*(.+)', section)
+    strategy_type = type_match.group(1).strip() if type_match else "Unknown"
+    
+    condition_match = re.search(r'\*\*Entry Condition\*\*:\s*\n```python\n"(.+?)"\n```', section, re.DOTALL)
+    if not condition_match:
+        logger.warning(f"No entry condition found for strategy '{name}'")
+        return None
+    condition = condition_match.group(1).strip()
+    
+    params = {}
+    for key, label in (("stop_loss_pct", "Stop Loss"),
+                       ("take_profit_pct", "Take Profit"),
+                       ("position_size_pct", "Position Size")):
+        match = re.search(rf'^-\s+{label}:\s*(.*)$', section, re.MULTILINE)
+        value = re.match(r'(\d+\.?\d*)%', match.group(1)) if match else None
+        if value is None:
+            described = f"'{match.group(1).strip()}'" if match else "missing"
+            logger.warning(f"⚠ Skipping strategy '{name}': {label} is not a percentage ({described})")
+            return None
+        params[key] = float(value.group(1)) / 100  # Convert to decimal
+    
+    # Validate condition string
+    if not _validate_condition(condition):
+        logger.warning(f"Invalid condition for strategy '{name}': {condition}")
+        return None
+    
+    return {
+        "name": name,
+        "type": strategy_type,
+        "direction": direction,
+        "condition": condition,
+        "compiled": compile_condition(condition),
+        "params": params
+    }
+
+
 def _validate_condition(condition_str: str) -> bool:
     """
-    Validate that a condition string is valid Pandas query syntax.
+    Validate that a condition compiles and only references known columns.
     
     Args:
         condition_str: Pandas query string to validate
@@ -131,8 +466,15 @@ def _validate_condition(condition_str: str) -> bool:
             'stoch_rsi_bearish': [False]
         })
         
-        # Attempt to query - if it doesn't raise an exception, it's valid
-        test_df.query(condition_str)
+        # Columns merged by the scanner: higher timeframes (rsi_4h, ...) and news sentiment
+        for timeframe in HIGHER_TIMEFRAMES:
+            for column in DEFAULT_MTF_COLUMNS:
+                test_df[mtf_column_name(column, timeframe)] = test_df[column]
+        for window in DEFAULT_SENTIMENT_WINDOWS:
+            test_df[sentiment_column_name(window)] = [0.0]
+        
+        # Attempt to compile and evaluate - if it doesn't raise an exception, it's valid
+        compile_condition(condition_str).evaluate(test_df)
         return True
         
     except Exception as e:
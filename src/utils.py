@@ -27,7 +27,8 @@ def standardize_columns(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         DataFrame with standardized column names
     """
-    df = df.copy()
+    # Shallow copy: only the column labels change, the data is shared
+    df = df.copy(deep=False)
     df.columns = [col.lower().replace(' ', '_').replace('-', '_') for col in df.columns]
     return df
 
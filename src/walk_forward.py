@@ -0,0 +1,302 @@
+"""
+Walk-forward validation for Market Scanner Core System.
+
+The proof engine checks the last 3 signals over one window. This module slides
+train/test windows across the whole (cached) history and scores each test
+window with the batched backtest over ALL of its signals.
+
+Indicators are causal, so they are computed once over the full history and
+every window is a positional slice of that frame: overlapping windows share
+one calculate_indicators() run, one signal mask and one PathIndex. Trades are
+confined to their test window (exits after the window end count as Open).
+
+Optionally each window first picks its SL/TP on the train part with the grid
+sweep, then scores that choice out-of-sample on the test part.
+"""
+
+import logging
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+from .backtester import (
+    find_all_signal_indices, simulate_trades, summarize_trades, sweep_exit_grid, parse_grid
+)
+from .exit_engine import PathIndex
+from .utils import setup_logging
+
+logger = logging.getLogger(__name__)
+
+# Window lengths in bars of the frame's timeframe (1h by default)
+DEFAULT_TRAIN_BARS = 60 * 24
+DEFAULT_TEST_BARS = 30 * 24
+
+# Frame, signals and settings are sent once per worker process (see _init_worker)
+_worker_state: Dict[str, Any] = {}
+
+
+def make_windows(
+    n_bars: int,
+    train_bars: int,
+    test_bars: int,
+    step_bars: Optional[int] = None
+) -> List[Tuple[int, int, int, int]]:
+    """
+    Generate sliding train/test windows over a history.
+
+    Args:
+        n_bars: Number of bars in the history
+        train_bars: Train window length (0 = plain rolling test windows)
+        test_bars: Test window length
+        step_bars: Slide between windows (default: test_bars, non-overlapping tests)
+
+    Returns:
+        List of (train_start, train_end, test_start, test_end) positions,
+        end positions exclusive
+    """
+    step_bars = step_bars or test_bars
+    if test_bars <= 0 or step_bars <= 0:
+        raise ValueError("test_bars and step_bars must be positive")
+
+    windows = []
+    train_start = 0
+    while train_start + train_bars + test_bars <= n_bars:
+        test_start = train_start + train_bars
+        windows.append((train_start, test_start, test_start, test_start + test_bars))
+        train_start += step_bars
+    return windows
+
+
+def score_window(
+    df: pd.DataFrame,
+    signals: np.ndarray,
+    window: Tuple[int, int, int, int],
+    condition_str: str,
+    stop_loss_pct: float = 0.02,
+    take_profit_pct: float = 0.04,
+    stop_grid: Optional[Sequence[float]] = None,
+    take_grid: Optional[Sequence[float]] = None,
+    path: Optional[PathIndex] = None
+) -> Dict[str, Any]:
+    """
+    Score one walk-forward window.
+
+    Args:
+        df: Full-history DataFrame with indicators
+        signals: Signal bar positions over the full history (find_all_signal_indices)
+        window: (train_start, train_end, test_start, test_end) positions
+        condition_str: Strategy condition (used for the train-window sweep)
+        stop_loss_pct: Stop loss used when no grid is given
+        take_profit_pct: Take profit used when no grid is given
+        stop_grid: Optional stop loss grid optimized on the train window
+        take_grid: Optional take profit grid optimized on the train window
+        path: Optional prebuilt PathIndex for df
+
+    Returns:
+        Dictionary with window bounds (timestamps), the SL/TP used, the
+        summarize_trades() stats of the test window and, when optimizing,
+        the train-window expectancy / win rate of the chosen SL/TP
+    """
+    train_start, train_end, test_start, test_end = window
+    result = {
+        "train_start": df.index[train_start] if train_end > train_start else pd.NaT,
+        "test_start": df.index[test_start],
+        "test_end": df.index[test_end - 1],
+    }
+
+    if stop_grid is not None and train_end > train_start:
+        grid = sweep_exit_grid(
+            df.iloc[train_start:train_end], condition_str,
+            stop_grid, take_grid if take_grid is not None else [take_profit_pct]
+        )
+        if not grid.empty:
+            best = grid.iloc[0]
+            stop_loss_pct, take_profit_pct = float(best["stop_loss"]), float(best["take_profit"])
+            result["train_win_rate"] = float(best["win_rate"])
+            result["train_expectancy"] = float(best["expectancy"])
+
+    result["stop_loss"] = stop_loss_pct
+    result["take_profit"] = take_profit_pct
+
+    entries = signals[(signals >= test_start) & (signals < test_end)]
+    trades = simulate_trades(df, entries, stop_loss_pct, take_profit_pct, path=path, end=test_end)
+    result.update(summarize_trades(trades))
+    return result
+
+
+def walk_forward(
+    df: pd.DataFrame,
+    condition_str: str,
+    train_bars: int = DEFAULT_TRAIN_BARS,
+    test_bars: int = DEFAULT_TEST_BARS,
+    step_bars: Optional[int] = None,
+    stop_loss_pct: float = 0.02,
+    take_profit_pct: float = 0.04,
+    stop_grid: Optional[Sequence[float]] = None,
+    take_grid: Optional[Sequence[float]] = None,
+    workers: int = 1
+) -> pd.DataFrame:
+    """
+    Run walk-forward validation of a condition over a full history.
+
+    Args:
+        df: Full-history DataFrame with indicators (calculate_indicators run once)
+        condition_str: Strategy condition (Pandas query string)
+        train_bars: Train window length in bars (0 = rolling test windows only)
+        test_bars: Test window length in bars
+        step_bars: Slide between windows (default: test_bars)
+        stop_loss_pct: Fixed stop loss (used when stop_grid is None)
+        take_profit_pct: Fixed take profit (or the only TP when take_grid is None)
+        stop_grid: Optional SL grid to optimize on each train window
+        take_grid: Optional TP grid to optimize on each train window
+        workers: Number of worker processes (1 = run in this process)
+
+    Returns:
+        DataFrame with one row per window (in window order); empty if the
+        history is shorter than one window
+    """
+    windows = make_windows(len(df), train_bars, test_bars, step_bars)
+    if not windows:
+        logger.warning(f"History too short for walk-forward ({len(df)} bars)")
+        return pd.DataFrame()
+
+    # Shared across every window: one signal mask, one PathIndex
+    signals = find_all_signal_indices(df, condition_str)
+    settings = {
+        "condition_str": condition_str,
+        "stop_loss_pct": stop_loss_pct,
+        "take_profit_pct": take_profit_pct,
+        "stop_grid": stop_grid,
+        "take_grid": take_grid,
+    }
+
+    logger.info(f"Walk-forward: {len(windows)} windows, {len(signals)} signals, {workers} worker(s)")
+
+    if workers <= 1 or len(windows) <= 1:
+        path = PathIndex.from_frame(df)
+        rows = [score_window(df, signals, window, path=path, **settings) for window in windows]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(windows)),
+            initializer=_init_worker,
+            initargs=(df, signals, settings, logging.getLogger().getEffectiveLevel())
+        ) as pool:
+            rows = list(pool.map(_score_window_task, windows))
+
+    results = pd.DataFrame(rows)
+    results.insert(0, "window", np.arange(len(results)))
+    return results
+
+
+def summarize_walk_forward(results: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Aggregate per-window stats.
+
+    Args:
+        results: Output of walk_forward
+
+    Returns:
+        Dictionary with windows, total signals, pooled win rate, mean
+        expectancy across windows with closed trades and the share of
+        those windows with positive expectancy
+    """
+    if results.empty:
+        return {"windows": 0, "signals": 0, "win_rate": 0.0, "mean_expectancy": 0.0, "positive_windows": 0.0}
+
+    traded = results[(results["wins"] + results["losses"]) > 0]
+    signals = int(results["total"].sum())
+    return {
+        "windows": len(results),
+        "signals": signals,
+        "win_rate": float(results["wins"].sum() / signals * 100) if signals else 0.0,
+        "mean_expectancy": float(traded["expectancy"].mean()) if len(traded) else 0.0,
+        "positive_windows": float((traded["expectancy"] > 0).mean() * 100) if len(traded) else 0.0
+    }
+
+
+def _init_worker(df: pd.DataFrame, signals: np.ndarray, settings: Dict[str, Any], log_level: int) -> None:
+    """Process pool initializer: receive the frame once and build its PathIndex."""
+    global _worker_state
+    _worker_state = {"df": df, "signals": signals, "settings": settings, "path": PathIndex.from_frame(df)}
+    setup_logging(log_level)
+
+
+def _score_window_task(window: Tuple[int, int, int, int]) -> Dict[str, Any]:
+    """Worker entry point: score one window against the per-process state."""
+    state = _worker_state
+    return score_window(state["df"], state["signals"], window, path=state["path"], **state["settings"])
+
+
+def main():
+    """
+    Standalone walk-forward mode.
+
+    Usage:
+        python -m src.walk_forward --symbol BTC/USDT --condition "rsi < 30" --days 365
+    """
+    parser = argparse.ArgumentParser(description='Walk-forward validation of a strategy condition')
+    parser.add_argument('--symbol', type=str, default='BTC/USDT', help='Trading symbol')
+    parser.add_argument('--condition', type=str, required=True, help='Strategy condition (Pandas query)')
+    parser.add_argument('--days', type=int, default=365, help='Days of historical data')
+    parser.add_argument('--train-days', type=int, default=60, help='Train window (days, 0 = rolling test windows)')
+    parser.add_argument('--test-days', type=int, default=30, help='Test window (days)')
+    parser.add_argument('--step-days', type=int, help='Slide between windows (days, default: test window)')
+    parser.add_argument('--stop-loss', type=float, default=0.02, help='Stop loss percentage (e.g., 0.02 = 2%)')
+    parser.add_argument('--take-profit', type=float, default=0.04, help='Take profit percentage (e.g., 0.04 = 4%)')
+    parser.add_argument('--sweep-stop-loss', type=str, help='Optimize SL on each train window, "start:stop:num" or list')
+    parser.add_argument('--sweep-take-profit', type=str, help='Optimize TP on each train window, same format')
+    parser.add_argument('--workers', type=int, default=1, help='Worker processes for window evaluation')
+
+    args = parser.parse_args()
+
+    setup_logging()
+
+    from .data_loader import fetch_crypto_data
+    from .analysis import calculate_indicators
+
+    logger.info(f"Fetching {args.symbol} data for {args.days} days...")
+    df = fetch_crypto_data(args.symbol, days=args.days)
+
+    if df.empty:
+        logger.error("Failed to fetch data")
+        return
+
+    # One indicator pass shared by every window
+    df = calculate_indicators(df)
+
+    bars_per_day = 24  # fetch_crypto_data returns 1h candles
+    results = walk_forward(
+        df,
+        args.condition,
+        train_bars=args.train_days * bars_per_day,
+        test_bars=args.test_days * bars_per_day,
+        step_bars=args.step_days * bars_per_day if args.step_days else None,
+        stop_loss_pct=args.stop_loss,
+        take_profit_pct=args.take_profit,
+        stop_grid=parse_grid(args.sweep_stop_loss) if args.sweep_stop_loss else None,
+        take_grid=parse_grid(args.sweep_take_profit) if args.sweep_take_profit else None,
+        workers=args.workers
+    )
+
+    print("\n" + "=" * 60)
+    print("WALK-FORWARD RESULTS:")
+    print("=" * 60)
+    if results.empty:
+        print("No complete windows in this history")
+        return
+
+    for row in results.itertuples(index=False):
+        print(f"#{row.window:<3} {row.test_start:%Y-%m-%d} → {row.test_end:%Y-%m-%d} | "
+              f"SL {row.stop_loss:.2%} TP {row.take_profit:.2%} | "
+              f"Signals {row.total:4d} | Win {row.win_rate:5.1f}% | Exp {row.expectancy:+.2%}")
+
+    stats = summarize_walk_forward(results)
+    print("-" * 60)
+    print(f"Windows: {stats['windows']} | Signals: {stats['signals']} | Win rate: {stats['win_rate']:.1f}%")
+    print(f"Mean expectancy: {stats['mean_expectancy']:+.2%} | Positive windows: {stats['positive_windows']:.0f}%")
+    print("=" * 60)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,205 @@
+"""
+Backtester Benchmark - Exit Engine Performance
+
+Compares the original bar-by-bar `df.iloc[i]` trade simulation against the
+NumPy first-touch exit engine on synthetic 1h OHLCV data (no network needed).
+Both implementations must produce identical results for the benchmark to pass.
+
+Also times the batched full-history mode (every signal simulated in one pass)
+against the classic last-3 proof, and a 20x20 SL/TP sweep against a single
+full-history backtest.
+
+Usage:
+    python tools/benchmark_backtester.py
+    python tools/benchmark_backtester.py --days 180 --trades 50 --stop-loss 0.10 --take-profit 0.20
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Callable
+
+import numpy as np
+import pandas as pd
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.backtester import simulate_trade, simulate_trades, backtest_all_signals, sweep_exit_grid
+from src.exit_engine import PathIndex
+
+
+def make_synthetic_ohlcv(days: int = 180, seed: int = 42) -> pd.DataFrame:
+    """
+    Build a random-walk 1h OHLCV DataFrame.
+
+    Args:
+        days: Number of days of hourly candles
+        seed: Random seed (results are reproducible)
+
+    Returns:
+        DataFrame with open, high, low, close, volume and a datetime index
+    """
+    rng = np.random.default_rng(seed)
+    n = days * 24
+
+    returns = rng.normal(0.0, 0.006, n)
+    close = 40000.0 * np.exp(np.cumsum(returns))
+    open_ = np.concatenate(([close[0]], close[:-1]))
+    wick = np.abs(rng.normal(0.0, 0.003, n)) * close
+    high = np.maximum(open_, close) + wick
+    low = np.minimum(open_, close) - wick
+    volume = rng.lognormal(6.0, 0.5, n)
+
+    index = pd.date_range('2025-01-01', periods=n, freq='h')
+    return pd.DataFrame(
+        {'open': open_, 'high': high, 'low': low, 'close': close, 'volume': volume},
+        index=index
+    )
+
+
+def legacy_simulate_trade(
+    df: pd.DataFrame,
+    entry_idx: int,
+    stop_loss_pct: float = 0.02,
+    take_profit_pct: float = 0.04
+) -> Dict[str, Any]:
+    """Reference copy of the original bar-by-bar simulation (for comparison only)."""
+    entry_price = df.iloc[entry_idx]['close']
+    stop_loss_price = entry_price * (1 - stop_loss_pct)
+    take_profit_price = entry_price * (1 + take_profit_pct)
+
+    for i in range(entry_idx + 1, len(df)):
+        bar = df.iloc[i]
+        if bar['low'] <= stop_loss_price:
+            return {"result": "SL", "pnl_percent": -stop_loss_pct, "duration_bars": i - entry_idx}
+        if bar['high'] >= take_profit_price:
+            return {"result": "TP", "pnl_percent": take_profit_pct, "duration_bars": i - entry_idx}
+
+    return {"result": "Open", "pnl_percent": 0.0, "duration_bars": len(df) - entry_idx - 1}
+
+
+def time_simulations(
+    func: Callable[..., Dict[str, Any]],
+    df: pd.DataFrame,
+    entries: List[int],
+    stop_loss_pct: float,
+    take_profit_pct: float
+) -> tuple:
+    """Run `func` for every entry and return (elapsed_seconds, results)."""
+    start = time.perf_counter()
+    results = [func(df, idx, stop_loss_pct, take_profit_pct) for idx in entries]
+    return time.perf_counter() - start, results
+
+
+def grid_matches_backtests(df: pd.DataFrame, condition: str, grid: pd.DataFrame, path: PathIndex) -> bool:
+    """Check every sweep row against its own backtest_all_signals run."""
+    for row in grid.itertuples(index=False):
+        trades = backtest_all_signals(df, condition, row.stop_loss, row.take_profit, path=path)
+        closed = trades[trades['result'] != 'Open']
+        expected = (
+            len(trades), int((trades['result'] == 'TP').sum()), int((trades['result'] == 'SL').sum()),
+            closed['pnl_percent'].mean() if len(closed) else 0.0, trades['duration_bars'].mean()
+        )
+        actual = (row.total, row.wins, row.losses, row.expectancy, row.avg_duration_bars)
+        if expected[:3] != actual[:3] or not np.allclose(expected[3:], actual[3:], rtol=1e-9, atol=1e-12):
+            return False
+    return True
+
+
+def main():
+    """Run the exit engine benchmark and print a comparison table."""
+    parser = argparse.ArgumentParser(description='Benchmark the backtester exit engine')
+    parser.add_argument('--days', type=int, default=180, help='Days of synthetic 1h data')
+    parser.add_argument('--trades', type=int, default=20, help='Number of simulated entries')
+    parser.add_argument('--stop-loss', type=float, default=0.10, help='Stop loss percentage (wide = long trades)')
+    parser.add_argument('--take-profit', type=float, default=0.20, help='Take profit percentage')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed')
+    parser.add_argument('--signal-every', type=int, default=6, help='Bar spacing of signals in batched mode')
+
+    args = parser.parse_args()
+
+    df = make_synthetic_ohlcv(args.days, args.seed)
+
+    # Spread entries over the first half so trades have room to run
+    entries = np.linspace(0, len(df) // 2, args.trades, dtype=int).tolist()
+
+    print("=" * 60)
+    print("EXIT ENGINE BENCHMARK")
+    print("=" * 60)
+    print(f"Bars: {len(df)} ({args.days} days of 1h candles)")
+    print(f"Trades: {len(entries)} | SL: {args.stop_loss:.1%} | TP: {args.take_profit:.1%}")
+
+    legacy_time, legacy_results = time_simulations(
+        legacy_simulate_trade, df, entries, args.stop_loss, args.take_profit
+    )
+    engine_time, engine_results = time_simulations(
+        simulate_trade, df, entries, args.stop_loss, args.take_profit
+    )
+
+    avg_duration = np.mean([r['duration_bars'] for r in engine_results])
+    matches = legacy_results == engine_results
+
+    print(f"Average trade duration: {avg_duration:.0f} bars")
+    print("-" * 60)
+    print(f"Bar-by-bar loop (iloc): {legacy_time * 1000:10.2f} ms")
+    print(f"NumPy exit engine:      {engine_time * 1000:10.2f} ms")
+    print(f"Speedup:                {legacy_time / max(engine_time, 1e-9):10.1f}x")
+    print(f"Results identical:      {'✅ YES' if matches else '❌ NO'}")
+    print("=" * 60)
+
+    # Batched mode: every N-th bar is a "signal", compared with the last-3 proof
+    all_entries = np.arange(0, len(df), args.signal_every)
+
+    start = time.perf_counter()
+    batched = simulate_trades(df, all_entries, args.stop_loss, args.take_profit)
+    batched_time = time.perf_counter() - start
+
+    last_3_time, last_3 = time_simulations(
+        simulate_trade, df, all_entries[-3:].tolist(), args.stop_loss, args.take_profit
+    )
+    sliced = [
+        {"result": row.result, "pnl_percent": row.pnl_percent, "duration_bars": int(row.duration_bars)}
+        for row in batched.tail(3).itertuples(index=False)
+    ]
+    batched_matches = sliced == last_3
+
+    print("BATCHED FULL-HISTORY BACKTEST")
+    print("-" * 60)
+    print(f"Last 3 signals (per-trade):   {last_3_time * 1000:10.2f} ms")
+    print(f"All {len(all_entries):>5} signals (batched): {batched_time * 1000:10.2f} ms")
+    print(f"Last 3 slice identical:       {'✅ YES' if batched_matches else '❌ NO'}")
+    print("=" * 60)
+
+    # Sweep mode: 20x20 SL/TP grid vs one backtest over the same signals
+    df['signal'] = False
+    df.iloc[all_entries, df.columns.get_loc('signal')] = True
+    path = PathIndex.from_frame(df)
+    stop_grid = np.linspace(0.01, 0.10, 20)
+    take_grid = np.linspace(0.01, 0.20, 20)
+
+    start = time.perf_counter()
+    backtest_all_signals(df, 'signal', args.stop_loss, args.take_profit, path=path)
+    single_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    grid = sweep_exit_grid(df, 'signal', stop_grid, take_grid, path=path)
+    sweep_time = time.perf_counter() - start
+
+    sweep_matches = grid_matches_backtests(df, 'signal', grid, path)
+
+    print("SL/TP SWEEP")
+    print("-" * 60)
+    print(f"Single backtest:              {single_time * 1000:10.2f} ms")
+    print(f"{len(grid)}-point grid sweep:         {sweep_time * 1000:10.2f} ms "
+          f"({sweep_time / max(single_time, 1e-9):.1f}x one backtest)")
+    print(f"Grid = per-point backtests:   {'✅ YES' if sweep_matches else '❌ NO'}")
+    print("=" * 60)
+
+    if not (matches and batched_matches and sweep_matches):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
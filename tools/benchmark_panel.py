@@ -0,0 +1,82 @@
+"""
+Panel Memory Benchmark - Per-symbol DataFrames vs Columnar float32 Panel
+
+Analyzes a synthetic universe twice: as the usual {symbol: float64 DataFrame}
+dictionary (analyze_symbols) and as one float32 OHLCVPanel (analyze_panel).
+Reports the memory each representation holds, the analysis time, and checks
+that every strategy matches on the same bars in both (the benchmark fails
+otherwise). The result is extrapolated to a 500-symbol, 3-year 1h universe.
+
+Usage:
+    python tools/benchmark_panel.py
+    python tools/benchmark_panel.py --symbols 50 --days 365
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.analysis import analyze_symbols
+from src.panel import OHLCVPanel, analyze_panel
+from src.strategy_loader import load_strategies
+from tools.benchmark_backtester import make_synthetic_ohlcv
+
+
+def frames_nbytes(frames) -> int:
+    return int(sum(df.memory_usage(index=False).sum() for df in frames.values()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the columnar float32 panel against per-symbol DataFrames')
+    parser.add_argument('--symbols', type=int, default=20, help='Number of synthetic symbols')
+    parser.add_argument('--days', type=int, default=365, help='Days of 1h history per symbol')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+
+    frames = {f"SYN{i}/USDT": make_synthetic_ohlcv(args.days, seed=i) for i in range(args.symbols)}
+    strategies = load_strategies()
+
+    print("=" * 60)
+    print(f"PANEL BENCHMARK: {args.symbols} symbols x {args.days * 24} hourly bars")
+    print("=" * 60)
+
+    start = time.perf_counter()
+    analyzed = analyze_symbols(dict(frames))
+    frames_time = time.perf_counter() - start
+    frames_bytes = frames_nbytes(analyzed)
+
+    start = time.perf_counter()
+    panel = analyze_panel(OHLCVPanel.from_frames(dict(frames), dtype=np.float32))
+    panel_time = time.perf_counter() - start
+
+    mismatches = 0
+    for symbol, df in analyzed.items():
+        columns = panel.columns_of(symbol)
+        for strategy in strategies:
+            expected = np.asarray(strategy['compiled'].evaluate(df))
+            mismatches += int((expected != np.asarray(strategy['compiled'].evaluate(columns))).sum())
+
+    per_bar_frames = frames_bytes / (args.symbols * args.days * 24)
+    per_bar_panel = panel.nbytes / (args.symbols * args.days * 24)
+    universe_bars = 500 * 3 * 365 * 24
+
+    print(f"\nDataFrames (float64): {frames_bytes / 1024**2:8.1f} MB, analyzed in {frames_time:.2f}s")
+    print(f"Panel (float32)     : {panel.nbytes / 1024**2:8.1f} MB, analyzed in {panel_time:.2f}s "
+          f"({frames_bytes / panel.nbytes:.1f}x smaller)")
+    print(f"\n500 symbols x 3 years: {per_bar_frames * universe_bars / 1024**3:.1f} GB as DataFrames, "
+          f"{per_bar_panel * universe_bars / 1024**3:.1f} GB as a float32 panel")
+    print(f"Condition mismatches (float32 vs float64): {mismatches} {'✓' if mismatches == 0 else '✗'}")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""
+Streaming Ingestion Benchmark - Kline Replay vs REST Polling
+
+Replays synthetic 1h candles as Binance kline events through KlineStream into
+the scanner daemon (no network needed) and compares it with the polling
+daemon driven by a simulated clock over the same candles. Both must end with
+identical frames (and, without dropped events, identical signal events) for
+the benchmark to pass.
+
+Reports replay throughput (events/s and multiple of real time) and the REST
+requests each path needed. With --drop N every Nth event is discarded to
+exercise the REST backfill of missed candles (the final hour is never dropped;
+signals living only on a dropped candle are then legitimately missed).
+
+Usage:
+    python tools/benchmark_stream.py
+    python tools/benchmark_stream.py --symbols 20 --days 120 --replay-days 30 --drop 50
+"""
+
+import argparse
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.fake_exchange import FakeExchange, SimulatedClock
+from src.kline_stream import KlineStream, ReplaySource, write_replay_file
+from src.scanner_daemon import ScannerDaemon
+from src.strategy_loader import load_strategies
+from tools.benchmark_backtester import make_synthetic_ohlcv
+
+
+def build_daemon(frames, strategies, clock, days, events):
+    exchange = FakeExchange(frames, clock)
+    daemon = ScannerDaemon(
+        list(frames), strategies, exchange=exchange, clock=clock, days=days, use_cache=False,
+        on_change=lambda signals, changes: events.extend(changes), grace_seconds=0
+    )
+    return daemon, exchange
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark kline stream ingestion against REST polling')
+    parser.add_argument('--symbols', type=int, default=5, help='Number of synthetic symbols')
+    parser.add_argument('--days', type=int, default=90, help='Days of synthetic history per symbol')
+    parser.add_argument('--replay-days', type=int, default=30, help='Trailing days replayed as events')
+    parser.add_argument('--drop', type=int, default=0, help='Drop every Nth event (0 = none)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+
+    frames = {f"SYN{i}/USDT": make_synthetic_ohlcv(args.days, seed=i) for i in range(args.symbols)}
+    index = next(iter(frames.values())).index
+    split = len(index) - args.replay_days * 24
+    boot_time = index[split]  # the candle opening here is the first one replayed
+    end_time = index[-1] + pd.Timedelta('1h')
+    strategies = load_strategies()
+    history_days = split // 24
+
+    print("=" * 60)
+    print(f"STREAM BENCHMARK: {args.symbols} symbols, {args.replay_days} days replayed "
+          f"({args.symbols * args.replay_days * 24} closed klines)")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        replay_path = str(Path(tmp) / "klines.jsonl")
+        write_replay_file(replay_path, {s: df.iloc[split:] for s, df in frames.items()})
+
+        # Streaming path (clock only bounds the REST backfill; events carry the time)
+        stream_events = []
+        clock = SimulatedClock(boot_time)
+        daemon, exchange = build_daemon(frames, strategies, clock, history_days, stream_events)
+        daemon.bootstrap()
+        clock.advance_to(end_time.value // 10**6)
+
+        source = ReplaySource(replay_path)
+        if args.drop:
+            last_hour = end_time.value // 10**6
+            source = [event for i, event in enumerate(source, 1) if i % args.drop or event['E'] == last_hour]
+        stream = KlineStream(list(frames))
+        boot_calls = exchange.calls
+        start = time.perf_counter()
+        daemon.run_stream(stream, source)
+        stream_time = time.perf_counter() - start
+        stream_calls = exchange.calls - boot_calls
+        stream_stats = stream.get_stats()
+
+        # Polling path over the same hours
+        poll_events = []
+        clock = SimulatedClock(boot_time)
+        daemon_poll, exchange = build_daemon(frames, strategies, clock, history_days, poll_events)
+        daemon_poll.bootstrap()
+        boot_calls = exchange.calls
+        start = time.perf_counter()
+        daemon_poll.run(max_cycles=args.replay_days * 24)
+        poll_time = time.perf_counter() - start
+        poll_calls = exchange.calls - boot_calls
+
+    replayed_hours = args.replay_days * 24
+    print(f"\nStream : {stream_stats['stored']} candles in {stream_time:.2f}s "
+          f"({stream_stats['events'] / stream_time:,.0f} events/s, "
+          f"{replayed_hours * 3600 / stream_time:,.0f}x real time), {stream_calls} REST requests")
+    print(f"Polling: {replayed_hours} cycles in {poll_time:.2f}s, {poll_calls} REST requests")
+
+    same_bars = all(
+        daemon.states[s].frame().equals(daemon_poll.states[s].frame()) for s in frames
+    )
+    same_events = stream_events == poll_events or bool(args.drop)
+    print(f"\nSignal events: {len(stream_events)} (stream) vs {len(poll_events)} (polling)")
+    print(f"Identical frames: {'✓' if same_bars else '✗'} | identical events: "
+          f"{'✓' if stream_events == poll_events else '✗'}{' (not required with --drop)' if args.drop else ''}")
+    if not (same_bars and same_events):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -5,6 +5,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.data_loader import fetch_crypto_data
 from src.analysis import calculate_indicators
+from src.backtester import backtest_all_signals, atr_exit_distances
 
 df = fetch_crypto_data('BTC/USDT', days=180)
 df = calculate_indicators(df)
@@ -13,45 +14,39 @@ df = calculate_indicators(df)
 print("RSI < 35 VE ADX > 25 OLAN SON DURUMLAR:")
 print("="*70)
 
+condition = "rsi < 35 and adx > 25"
 signals = df[(df['rsi'] < 35) & (df['adx'] > 25)]
 print(f"Toplam {len(signals)} sinyal bulundu (4h candle)")
 print()
 
 if len(signals) > 0:
-    for idx, row in signals.tail(15).iterrows():
-        entry = row['close']
-        atr = row['atr']
-        sl = entry - (atr * 2)  # 2 ATR stop
-        tp = entry + (atr * 4)  # 4 ATR target (2:1 R:R)
+    # 2 ATR stop / 4 ATR target (2:1 R:R), outcome checked over the next 20 candles
+    trades = backtest_all_signals(df, condition, atr_stop=2.0, atr_take=4.0, max_bars=20).tail(15)
+    close = df['close'].to_numpy()
+    entries = trades['entry_idx'].to_numpy()
+    
+    # Same levels the backtester used (ATR stop is clamped to 1-5% of entry)
+    stop_distance, take_distance = atr_exit_distances(
+        close[entries], df['atr'].to_numpy()[entries], atr_stop=2.0, atr_take=4.0
+    )
+    
+    for k, trade in enumerate(trades.itertuples(index=False)):
+        entry = close[trade.entry_idx]
+        sl = entry - stop_distance[k]
+        tp = entry + take_distance[k]
         
-        # Check next candles for outcome
-        future_df = df[df.index > idx].head(20)  # Next 20 candles (80 hours)
-        
-        hit_tp = False
-        hit_sl = False
-        result = "AÇIK"
-        pnl = 0
-        
-        for f_idx, f_row in future_df.iterrows():
-            if f_row['low'] <= sl:
-                hit_sl = True
-                result = "SL ❌"
-                pnl = ((sl - entry) / entry) * 100
-                break
-            if f_row['high'] >= tp:
-                hit_tp = True
-                result = "TP ✅"
-                pnl = ((tp - entry) / entry) * 100
-                break
-        
-        if not hit_tp and not hit_sl:
+        if trade.result == "TP":
+            result = "TP ✅"
+        elif trade.result == "SL":
+            result = "SL ❌"
+        elif trade.duration_bars > 0:
             # Still open or no clear outcome
-            if len(future_df) > 0:
-                last_close = future_df['close'].iloc[-1]
-                pnl = ((last_close - entry) / entry) * 100
-                result = f"BEKLEMEDE ({pnl:+.2f}%)"
+            pnl = ((close[trade.entry_idx + trade.duration_bars] - entry) / entry) * 100
+            result = f"BEKLEMEDE ({pnl:+.2f}%)"
+        else:
+            result = "AÇIK"
         
-        print(f"{idx.strftime('%Y-%m-%d %H:%M')}: Entry=${entry:,.0f}, SL=${sl:,.0f}, TP=${tp:,.0f} -> {result}")
+        print(f"{trade.signal_date.strftime('%Y-%m-%d %H:%M')}: Entry=${entry:,.0f}, SL=${sl:,.0f}, TP=${tp:,.0f} -> {result}")
 
 print()
 print("="*70)
@@ -11,6 +11,8 @@ This orchestrates the entire market scanning workflow:
 Usage:
     python tools/market_scanner.py
     python tools/market_scanner.py --symbols BTC/USDT ETH/USDT --output custom_report.md
+    python tools/market_scanner.py --daemon   # stay resident, rescan on every 1h candle close
+    python tools/market_scanner.py --daemon --stream   # closed candles pushed over the kline websocket
 """
 
 import logging
@@ -20,18 +22,39 @@ from pathlib import Path
 from typing import List, Dict, Any
 import sys
 import pandas as pd
+import numpy as np
 
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.utils import setup_logging, get_timestamp
-from src.data_loader import fetch_crypto_data, fetch_macro_data, fetch_rss_headlines, calculate_sentiment
-from src.analysis import calculate_indicators, merge_macro_data
-from src.backtester import backtest_strategy
-from src.strategy_loader import load_strategies
+from src.data_loader import collect_market_data, calculate_sentiment, fetch_macro_batch, fetch_rss_headlines
+from src.analysis import analyze_symbols, merge_sentiment_data, MacroPanel
+from src.multi_timeframe import add_timeframe_features
+from src.strategy_loader import load_strategies, add_condition_features
+from src.candle_store import get_cache_stats
+from src.sentiment_cache import get_sentiment_cache, get_sentiment_stats
+from src.sentiment_series import DEFAULT_SENTIMENT_WINDOWS, get_sentiment_series, sentiment_column_name
+from src.headline_store import get_headline_store
+from src.macro_store import get_macro_store
+from src.scanner_daemon import ScannerDaemon, build_signal, verify_signal
+from src.kline_stream import KlineStream, BinanceKlineSource
+from src.panel import OHLCVPanel, analyze_panel
 
 logger = logging.getLogger(__name__)
 
+# Macro and sentiment sources
+MACRO_SYMBOLS = {
+    'gold': 'GC=F',
+    'dxy': 'DX-Y.NYB',
+    'sp500': '^GSPC'
+}
+
+RSS_FEEDS = [
+    'https://cointelegraph.com/rss',
+    'https://www.coindesk.com/arc/outboundfeeds/rss/',
+]
+
 
 def main():
     """
@@ -52,12 +75,37 @@ def main():
     parser.add_argument('--days', type=int, default=180, help='Days of historical data')
     parser.add_argument('--output-path', type=str, default='output/market_snapshot.md',
                         help='Output report file path')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Bypass the local caches and download full history; strategies using '
+                             'sentiment_24h / sentiment_7d are skipped (they need the stored headline log)')
+    parser.add_argument('--fetch-workers', type=int, default=16,
+                        help='Max concurrent crypto downloads')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Worker processes for indicator computation (1 = serial)')
+    parser.add_argument('--daemon', action='store_true',
+                        help='Keep running: rescan on every 1h candle close, rewrite the report on changes')
+    parser.add_argument('--events-path', type=str, default='output/signal_events.jsonl',
+                        help='Signal event log appended in daemon mode')
+    parser.add_argument('--max-cycles', type=int, default=None,
+                        help='Stop the polling daemon after this many candle closes (default: run forever; not with --stream)')
+    parser.add_argument('--stream', action='store_true',
+                        help='Daemon mode: receive closed candles from the Binance kline websocket instead of polling')
+    parser.add_argument('--compact', action='store_true',
+                        help='Hold all symbols in one float32 columnar panel (large universes; serial analysis)')
     
     args = parser.parse_args()
     
+    # Stream events are raw kline updates, not candle closes: no cycle count to stop on
+    if args.stream and args.max_cycles is not None:
+        parser.error('--max-cycles is not supported with --stream')
+    
     # Setup logging
     setup_logging()
     
+    if args.daemon:
+        run_daemon(args)
+        return
+    
     # Track execution time
     start_time = time.time()
     
@@ -74,50 +122,23 @@ def main():
         logger.info("STEP 1: DATA COLLECTION")
         logger.info("-" * 70)
         
-        # Fetch crypto data
-        crypto_data = {}
-        for symbol in args.symbols:
-            try:
-                df = fetch_crypto_data(symbol, days=args.days)
-                if not df.empty:
-                    crypto_data[symbol] = df
-                else:
-                    logger.warning(f"⚠ Skipping {symbol} (no data)")
-            except Exception as e:
-                logger.error(f"✗ Error fetching {symbol}: {e}")
-                continue  # Continue with other symbols
+        # Fetch crypto, macro and RSS data concurrently (per-source limits and timeouts)
+        crypto_data, macro_data, headlines = collect_market_data(
+            args.symbols,
+            MACRO_SYMBOLS,
+            RSS_FEEDS,
+            days=args.days,
+            use_cache=not args.no_cache,
+            concurrency={'crypto': args.fetch_workers}
+        )
         
         if not crypto_data:
             logger.error("No crypto data fetched. Aborting.")
             return
         
-        # Fetch macro data
-        macro_symbols = {
-            'gold': 'GC=F',
-            'dxy': 'DX-Y.NYB',
-            'sp500': '^GSPC'
-        }
-        
-        macro_data = {}
-        for name, symbol in macro_symbols.items():
-            try:
-                df = fetch_macro_data(symbol, days=args.days)
-                if not df.empty:
-                    macro_data[name] = df
-            except Exception as e:
-                logger.error(f"✗ Error fetching {name}: {e}")
-                continue
-        
-        # Fetch sentiment data
-        rss_feeds = [
-            'https://cointelegraph.com/rss',
-            'https://www.coindesk.com/arc/outboundfeeds/rss/',
-        ]
-        
         sentiment_score = 0.0
         try:
-            headlines = fetch_rss_headlines(rss_feeds)
-            sentiment_score = calculate_sentiment(headlines)
+            sentiment_score = calculate_sentiment(headlines, use_cache=not args.no_cache)
         except Exception as e:
             logger.error(f"✗ Error fetching sentiment: {e}")
         
@@ -129,32 +150,33 @@ def main():
         logger.info("STEP 2: TECHNICAL ANALYSIS")
         logger.info("-" * 70)
         
-        # Calculate indicators for each crypto asset
+        if args.compact:
+            # One float32 (time x symbol) array per column; frames below are views into it
+            panel = OHLCVPanel.from_frames(crypto_data, dtype=np.float32, release=True)
+            crypto_data = analyze_panel(panel, macro_data).to_frames()
+        else:
+            # Calculate indicators and merge macro data (optionally across a process pool)
+            crypto_data = analyze_symbols(crypto_data, macro_data, workers=args.workers)
+        
+        # 4H / 1D indicators resampled from the same 1h candles (no extra fetch, no lookahead)
+        crypto_data = {symbol: add_timeframe_features(df) for symbol, df in crypto_data.items()}
+        
+        # Rolling news sentiment (sentiment_24h, sentiment_7d) from the stored headline log
+        if not args.no_cache:
+            sentiment_series = get_sentiment_series()
+            sentiment_series.update(get_headline_store(), get_sentiment_cache())
+            last_bar = max(df.index[-1] for df in crypto_data.values())
+            sentiment_windows = sentiment_series.rolling(until=last_bar)
+            crypto_data = {symbol: merge_sentiment_data(df, sentiment_windows) for symbol, df in crypto_data.items()}
+        
         for symbol, df in crypto_data.items():
-            try:
-                logger.info(f"Analyzing {symbol}...")
-                
-                # Calculate indicators
-                df = calculate_indicators(df)
-                
-                # Merge macro data
-                if macro_data:
-                    df = merge_macro_data(df, macro_data)
-                
-                # Update in dictionary
-                crypto_data[symbol] = df
-                
-                # Validate critical columns
-                critical_cols = ['rsi', 'ema_200', 'close']
-                missing = [col for col in critical_cols if col not in df.columns]
-                if missing:
-                    logger.warning(f"⚠ {symbol} missing columns: {missing}")
-                else:
-                    logger.info(f"✓ {symbol} analysis complete")
-                
-            except Exception as e:
-                logger.error(f"✗ Error analyzing {symbol}: {e}")
-                continue
+            # Validate critical columns
+            critical_cols = ['rsi', 'ema_200', 'close']
+            missing = [col for col in critical_cols if col not in df.columns]
+            if missing:
+                logger.warning(f"⚠ {symbol} missing columns: {missing}")
+            else:
+                logger.info(f"✓ {symbol} analysis complete")
         
         logger.info("")
         
@@ -166,11 +188,17 @@ def main():
         
         # Load strategies
         strategies = load_strategies()
+        if args.no_cache:
+            strategies = drop_sentiment_strategies(strategies)
         
         if not strategies:
             logger.error("No strategies loaded. Aborting.")
             return
         
+        # Precompute rolling features used by the conditions (once per symbol, shared by all strategies)
+        for df in crypto_data.values():
+            add_condition_features(df, strategies)
+        
         # Scan for signals
         found_signals = []
         
@@ -180,29 +208,10 @@ def main():
                     logger.info(f"↻ Scanning {strategy['name']} on {symbol}...")
                     
                     # Check if current (last) candle matches strategy condition
-                    # Use last 1 row to check current signal
-                    current_row = df.tail(1)
-                    
-                    # Check condition
-                    matches = current_row.query(strategy['condition'])
-                    
-                    if not matches.empty:
+                    # (compiled once by the loader, evaluated on the last row only)
+                    if strategy['compiled'].evaluate_last(df):
                         # Signal found!
-                        signal = {
-                            "asset": symbol,
-                            "strategy": strategy['name'],
-                            "strategy_type": strategy['type'],
-                            "timestamp": df.index[-1].strftime('%Y-%m-%d %H:%M:%S'),
-                            "entry_price": float(df['close'].iloc[-1]),
-                            "condition": strategy['condition'],
-                            "params": strategy['params'],
-                            # Add new indicator values
-                            "macd": float(df['macd'].iloc[-1]) if 'macd' in df.columns and not pd.isna(df['macd'].iloc[-1]) else None,
-                            "macd_signal": float(df['macd_signal'].iloc[-1]) if 'macd_signal' in df.columns and not pd.isna(df['macd_signal'].iloc[-1]) else None,
-                            "macd_histogram": float(df['macd_histogram'].iloc[-1]) if 'macd_histogram' in df.columns and not pd.isna(df['macd_histogram'].iloc[-1]) else None,
-                            "stoch_rsi_k": float(df['stoch_rsi_k'].iloc[-1]) if 'stoch_rsi_k' in df.columns and not pd.isna(df['stoch_rsi_k'].iloc[-1]) else None,
-                            "stoch_rsi_d": float(df['stoch_rsi_d'].iloc[-1]) if 'stoch_rsi_d' in df.columns and not pd.isna(df['stoch_rsi_d'].iloc[-1]) else None,
-                        }
+                        signal = build_signal(symbol, strategy, df.index[-1], df)
                         
                         found_signals.append(signal)
                         logger.info(f"  ✓ SIGNAL FOUND: {symbol} @ ${signal['entry_price']:.2f}")
@@ -227,28 +236,17 @@ def main():
                 
                 logger.info(f"Verifying {symbol} {signal['strategy']}...")
                 
-                # Run backtest for this strategy
-                backtest_results = backtest_strategy(
-                    df,
-                    signal['condition'],
-                    stop_loss_pct=signal['params']['stop_loss_pct'],
-                    take_profit_pct=signal['params']['take_profit_pct']
-                )
+                # Backtest every historical occurrence in one batched pass and
+                # attach proof (last 3 signals) and full-history stats to signal
+                verify_signal(signal, df)
+                backtest_results = signal['proof']
                 
-                # Attach proof to signal
-                signal['proof'] = backtest_results
-                
-                # Calculate win rate
                 if backtest_results:
                     wins = sum(1 for r in backtest_results if r['result'] == 'TP')
-                    total = len(backtest_results)
-                    win_rate = (wins / total * 100) if total > 0 else 0
-                    signal['win_rate'] = win_rate
-                    
-                    logger.info(f"  ✓ Proof: {wins}/{total} wins ({win_rate:.0f}%)")
+                    logger.info(f"  ✓ Proof: {wins}/{len(backtest_results)} wins ({signal['win_rate']:.0f}%)")
+                    logger.info(f"  ✓ History: {signal['history']['wins']}/{signal['history']['total']} wins "
+                                f"({signal['history']['win_rate']:.0f}%)")
                 else:
-                    signal['proof'] = []
-                    signal['win_rate'] = 0
                     logger.warning(f"  ⚠ No backtest proof available")
                 
             except Exception as e:
@@ -290,6 +288,16 @@ def main():
         logger.info(f"✓ Market scan complete in {elapsed_time:.1f}s")
         logger.info(f"✓ Report: {output_path}")
         logger.info(f"✓ Signals Found: {len(found_signals)}")
+        if not args.no_cache:
+            cache_stats = get_cache_stats()
+            logger.info(f"✓ Candle cache: {cache_stats['hits']} hits, {cache_stats['topups']} top-ups, "
+                        f"{cache_stats['misses']} misses ({cache_stats['hit_rate']:.0%} hit rate)")
+            macro_stats = get_macro_store().get_stats()
+            logger.info(f"✓ Macro store: {macro_stats['hits']} served locally, "
+                        f"{macro_stats['refreshes']} refreshed in {macro_stats['downloads']} download(s)")
+            sentiment_stats = get_sentiment_stats()
+            logger.info(f"✓ Sentiment cache: {sentiment_stats['hits']} hits, {sentiment_stats['misses']} misses "
+                        f"({sentiment_stats['hit_rate']:.0%} hit rate, {sentiment_stats['entries']} headlines stored)")
         logger.info("=" * 70)
         
     except Exception as e:
@@ -297,6 +305,102 @@ def main():
         sys.exit(1)
 
 
+def drop_sentiment_strategies(strategies: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Remove strategies whose condition reads rolling sentiment columns.
+    
+    sentiment_24h / sentiment_7d are built from the stored headline log, which
+    --no-cache bypasses; without them those conditions would fail on every symbol.
+    
+    Args:
+        strategies: Strategy dicts from load_strategies()
+        
+    Returns:
+        Strategies that do not reference a sentiment column
+    """
+    sentiment_columns = {sentiment_column_name(window) for window in DEFAULT_SENTIMENT_WINDOWS}
+    kept, skipped = [], []
+    for strategy in strategies:
+        compiled = strategy['compiled']
+        columns = set(compiled.columns) | {col for col, _, _ in compiled.features.values()}
+        (skipped if columns & sentiment_columns else kept).append(strategy)
+    if skipped:
+        logger.warning(f"⚠ --no-cache: skipping strategies that use sentiment columns: "
+                       f"{', '.join(s['name'] for s in skipped)}")
+    return kept
+
+
+def run_daemon(args) -> None:
+    """
+    Long-running mode: load history once, then rescan on every candle close.
+    
+    Frames and indicator state stay in memory (see src/scanner_daemon.py);
+    each cycle fetches only the newly closed candles. The report is rewritten
+    and signal events are appended only when the active signal set changes.
+    """
+    use_cache = not args.no_cache
+    strategies = load_strategies()
+    if not use_cache:
+        strategies = drop_sentiment_strategies(strategies)
+    if not strategies:
+        logger.error("No strategies loaded. Aborting.")
+        return
+    
+    output_path = Path(args.output_path)
+    context = {'sentiment_score': 0.0}
+    
+    def refresh_context(daemon: ScannerDaemon) -> None:
+        # Macro store and conditional RSS GETs keep this to (almost) no network per cycle
+        macro_data = fetch_macro_batch(MACRO_SYMBOLS, days=args.days, use_cache=use_cache)
+        headlines = fetch_rss_headlines(RSS_FEEDS, use_cache=use_cache)
+        context['sentiment_score'] = calculate_sentiment(headlines, use_cache=use_cache)
+        
+        sentiment_windows = None
+        if use_cache:
+            sentiment_series = get_sentiment_series()
+            sentiment_series.update(get_headline_store(), get_sentiment_cache())
+            sentiment_windows = sentiment_series.rolling(until=pd.Timestamp.now(tz='UTC').tz_localize(None))
+        daemon.set_context(MacroPanel(macro_data) if macro_data else None, sentiment_windows)
+    
+    def write_report(signals: List[Dict[str, Any]], events: List[Dict[str, Any]]) -> None:
+        report_content = generate_markdown_report(signals, context['sentiment_score'], get_timestamp(), args.symbols)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(report_content)
+        logger.info(f"✓ {len(events)} signal change(s), report updated: {output_path}")
+    
+    daemon = ScannerDaemon(
+        args.symbols,
+        strategies,
+        days=args.days,
+        on_change=write_report,
+        events_path=args.events_path,
+        use_cache=use_cache
+    )
+    
+    logger.info("=" * 70)
+    logger.info(f"MARKET SCANNER DAEMON - {len(args.symbols)} assets, rescanning on every 1h candle close"
+                f"{' (kline stream)' if args.stream else ''}")
+    logger.info("=" * 70)
+    
+    try:
+        refresh_context(daemon)
+        if not daemon.bootstrap():
+            # Nothing active at startup: still write an (empty) report once
+            write_report([], [])
+        if args.stream:
+            stream = KlineStream(args.symbols, daemon.timeframe)
+            daemon.run_stream(stream, BinanceKlineSource(args.symbols, daemon.timeframe), before_step=refresh_context)
+        else:
+            daemon.run(max_cycles=args.max_cycles, before_step=refresh_context)
+    except KeyboardInterrupt:
+        logger.info("Daemon stopped")
+    
+    stats = daemon.get_stats()
+    logger.info(f"✓ {stats['cycles']} cycles, {stats['bars']} new bars, {stats['fetches']} REST pulls, "
+                f"{stats['changes']} signal changes")
+
+
 def generate_markdown_report(
     signals: List[Dict[str, Any]],
     sentiment_score: float,
@@ -338,18 +442,24 @@ def generate_markdown_report(
             
             report += f"### Signal {i}: {signal['asset']} - {signal['strategy']}\n\n"
             report += f"- **Type**: {signal['strategy_type']}\n"
+            report += f"- **Direction**: {signal['direction'].upper()}\n"
             report += f"- **Entry Price**: ${signal['entry_price']:.2f}\n"
             report += f"- **Timestamp**: {signal['timestamp']}\n"
             report += f"- **Stop Loss**: {signal['params']['stop_loss_pct'] * 100:.1f}%\n"
             report += f"- **Take Profit**: {signal['params']['take_profit_pct'] * 100:.1f}%\n"
             report += f"- **R:R Ratio**: {rr_check} {rr_ratio:.1f}:1\n"
             report += f"- **Win Rate (Last 3)**: {signal['win_rate']:.0f}%\n"
+            if signal.get('history', {}).get('total'):
+                history = signal['history']
+                report += f"- **Win Rate (All {history['total']} Signals)**: {history['win_rate']:.0f}% | Expectancy: {history['expectancy'] * 100:+.2f}%\n"
             
             # Add new indicator values
             if signal.get('macd') is not None:
                 report += f"- **MACD**: {signal['macd']:.4f} | Signal: {signal['macd_signal']:.4f} | Histogram: {signal['macd_histogram']:.4f}\n"
             if signal.get('stoch_rsi_k') is not None:
                 report += f"- **Stochastic RSI**: K: {signal['stoch_rsi_k']:.4f} | D: {signal['stoch_rsi_d']:.4f}\n"
+            if signal.get('rsi_4h') is not None and signal.get('rsi_1d') is not None:
+                report += f"- **RSI 4H / 1D**: {signal['rsi_4h']:.1f} / {signal['rsi_1d']:.1f}\n"
             
             report += "\n"
             